@@ -1,9 +1,12 @@
 """Alumni Disaster Monitor Streamlit application."""
+import time
+RUN_START = time.perf_counter()
+
 import streamlit as st
 import os
 import logging
+from contextlib import nullcontext
 from utils.helpers import get_db_url, create_db_engine, mask_url, init_session_state, show_debug_info, run_database_diagnosis
-from utils.data_loader import load_alumni_data
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -66,75 +69,81 @@ if not st.session_state.app_loaded:
         st.session_state.show_debugging = False
         st.rerun()
 
+    # Time to first paint of the safe-mode page (heavy modules are not loaded yet)
+    render_ms = (time.perf_counter() - RUN_START) * 1000
+    st.sidebar.caption(f"Page rendered in {render_ms:.0f} ms")
+    logger.info(f"Safe-mode page rendered in {render_ms:.0f} ms")
+
 # FULL APPLICATION MODE
 else:
-    try:
-        # Import modules
-        import pandas as pd
-        from utils.disaster_monitor import fetch_eonet_data, filter_disasters_by_type
-        from utils.map_handler import create_map, calculate_proximity_alerts
-        from streamlit_folium import st_folium
+    # Profiling is opt-in (debug panel or PROFILE_RERUNS); when off nothing is imported or traced
+    profile = st.session_state.profile_requested or bool(os.environ.get("PROFILE_RERUNS"))
+    if profile:
+        from utils.profiling import profile_run
+        st.session_state.profile_requested = False
+
+    with profile_run() if profile else nullcontext() as captured:
+        try:
+            # Import modules
+            from utils.data_loader import load_alumni_data
+            from utils.disaster_monitor import fetch_eonet_data, filter_disasters_by_type
+            from utils.events import DISASTER_TYPES
+            from utils.concurrent_load import load_page_data
+            from utils.panels import map_panel, alert_panel, status_panel, metrics_panel, prepare_rollup_index
+            from utils.metrics import start_metrics_server
+
+            # Prometheus scrape endpoint, started once per process
+            if os.environ.get("METRICS_PORT"):
+                start_metrics_server(os.environ["METRICS_PORT"])
         
-        # Sidebar
-        with st.sidebar:
-            st.markdown("### Disaster Filters")
-            
-            disaster_types = ["Wildfires", "Severe Storms", "Volcanoes", "Earthquakes"]
-            selected_types = st.multiselect("Select Types", disaster_types, default=disaster_types)
-            
-            proximity_threshold = st.slider("Alert Threshold (km)", 50, 1000, 200, 50)
+            # Sidebar
+            with st.sidebar:
+                st.markdown("### Disaster Filters")
             
-            if st.button("◀️ Simple Mode", key="simple_btn"):
-                st.session_state.app_loaded = False
-                st.rerun()
-        
-        # Main content
-        col1, col2 = st.columns([3, 1])
+                selected_types = st.multiselect("Select Types", DISASTER_TYPES, default=DISASTER_TYPES)
         
-        # Map column
-        with col1:
-            st.subheader("🗺️ Disaster Monitoring Map")
-            
-            # Load data
+            # Load data (roster and events concurrently; rollup groups are indexed while events load)
             with st.spinner("Loading data..."):
-                alumni_df, metadata = load_alumni_data()
-                disaster_data = fetch_eonet_data()
+                alumni_df, metadata, disaster_data, derived, load_timings = load_page_data(
+                    load_alumni_data, fetch_eonet_data, roster_hooks={"rollups": prepare_rollup_index}
+                )
                 filtered_disasters = filter_disasters_by_type(disaster_data, selected_types) if disaster_data else []
-            
+        
             # Show data info  
             if metadata:
                 st.success(f"Loaded {metadata.get('total_records', 0)} records from {metadata.get('source')}")
-            
-            # Create map if data is available
-            if alumni_df is not None and not alumni_df.empty and filtered_disasters:
-                map_obj = create_map(alumni_df, filtered_disasters)
-                st_folium(map_obj, width=800, height=600)
-            else:
-                st.warning("Insufficient data to display map")
         
-        # Alert column  
-        with col2:
-            st.subheader("⚠️ Proximity Alerts")
-            
-            if alumni_df is not None and not alumni_df.empty and filtered_disasters:
-                alerts = calculate_proximity_alerts(alumni_df, filtered_disasters, proximity_threshold)
-                
-                if alerts:
-                    st.warning(f"{len(alerts)} alerts within {proximity_threshold}km")
-                    for alert in alerts:
-                        with st.expander(f"🚨 {alert['alumni_name']} - {alert['disaster_type']}"):
-                            st.write(f"Distance: {alert['distance']} km")
-                            st.write(f"Location: {alert['location']}")
-                            st.write(f"Disaster: {alert['disaster_description']}")
-                else:
-                    st.success("No alerts within the threshold")
+            # Each panel is a fragment with explicit inputs, so its widgets rerun only that panel
+            with st.sidebar:
+                status_panel(metadata, len(filtered_disasters), load_timings)
+        
+            # Main content
+            col1, col2 = st.columns([3, 1])
+        
+            # Map column
+            with col1:
+                map_panel(alumni_df, filtered_disasters, (metadata or {}).get("loaded_at"))
+        
+            # Alert column  
+            with col2:
+                alert_panel(alumni_df, filtered_disasters, (metadata or {}).get("loaded_at"), derived.get("rollups"))
+
+            # Rendered last so it includes this run's map and alert timings
+            with st.sidebar:
+                metrics_panel()
             
-    except Exception as e:
-        st.error(f"Application error: {str(e)}")
-        with st.expander("Error Details"):
-            import traceback
-            st.code(traceback.format_exc())
+        except Exception as e:
+            st.error(f"Application error: {str(e)}")
+            with st.expander("Error Details"):
+                import traceback
+                st.code(traceback.format_exc())
         
-        if st.button("Return to Simple Mode", key="error_return"):
-            st.session_state.app_loaded = False
-            st.rerun()
\ No newline at end of file
+            if st.button("Return to Simple Mode", key="error_return"):
+                st.session_state.app_loaded = False
+                st.rerun()
+
+    if captured:
+        st.session_state.last_profile = captured["result"]
+    if st.session_state.get("last_profile"):
+        from utils.panels import profile_panel
+        profile_panel(st.session_state.last_profile)
@@ -0,0 +1,182 @@
+"""Time and memory-profile the app's hot paths on synthetic data.
+
+Examples:
+    python benchmarks/run_benchmarks.py --sizes 1000 100000 --output benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --sizes 1000 100000 --compare benchmarks/baseline.json
+
+Each hot path has a default size cap (see BENCHMARKS) because some are
+quadratic or render one marker per row; --no-limits lifts the caps.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+# Add the project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+# Events used by benchmarks that pair the roster with disasters
+EVENT_COUNT = 20
+
+# Timings below this are mostly noise and never count as regressions
+MIN_SECONDS = 0.01
+
+def _setup_roster(ctx, size):
+    from utils.synthetic import generate_alumni
+    return generate_alumni(size, seed=size)
+
+def _setup_csv(ctx, size):
+    from utils.synthetic import write_combo_csv
+    path = os.path.join(ctx["tmpdir"], f"combo_{size}.csv")
+    write_combo_csv(_setup_roster(ctx, size), path)
+    return path
+
+def _setup_database(ctx, size):
+    from utils.bulk_loader import bulk_load_alumni
+    from utils.synthetic import alumni_rows
+    bulk_load_alumni(alumni_rows(_setup_roster(ctx, size)), engine=ctx["engine"])
+    return ctx["engine"]
+
+def _setup_frame_and_events(ctx, size):
+    from utils.roster import load_from_csv
+    from utils.synthetic import generate_events
+    alumni_df, _ = load_from_csv([_setup_csv(ctx, size)])
+    return alumni_df, generate_events(EVENT_COUNT, seed=size)
+
+def _setup_events(ctx, size):
+    from utils.synthetic import generate_events
+    return generate_events(size, seed=size, max_points=1)
+
+def _run_load_from_csv(path):
+    from utils.roster import load_from_csv
+    return load_from_csv([path])
+
+def _run_load_from_database(engine):
+    from utils.roster import load_from_database
+    return load_from_database(engine)
+
+def _run_filter(events):
+    from utils.events import filter_disasters_by_type
+    return filter_disasters_by_type(events, ["Wildfires", "Volcanoes"])
+
+def _run_proximity(data):
+    from utils.proximity import compute_proximity_alerts
+    alumni_df, events = data
+    return compute_proximity_alerts(alumni_df, events, 200)
+
+def _run_create_map(data):
+    from utils.map_handler import create_map
+    alumni_df, events = data
+    return create_map(alumni_df, events)
+
+# name -> (setup, run, default maximum roster/event size)
+BENCHMARKS = {
+    "load_from_csv": (_setup_csv, _run_load_from_csv, 1_000_000),
+    "load_from_database": (_setup_database, _run_load_from_database, 1_000_000),
+    "filter_disasters_by_type": (_setup_events, _run_filter, 1_000_000),
+    "calculate_proximity_alerts": (_setup_frame_and_events, _run_proximity, 100_000),
+    "create_map": (_setup_frame_and_events, _run_create_map, 10_000),
+}
+
+def measure(run, data, memory=True):
+    """Return ``(seconds, peak_mb)`` for one call; memory uses a separate traced call.
+
+    An untimed warm-up call runs first so lazy imports and first-use caches
+    do not land in the timing.
+    """
+    run(data)
+    start = time.perf_counter()
+    run(data)
+    seconds = time.perf_counter() - start
+
+    peak_mb = None
+    if memory:
+        tracemalloc.start()
+        try:
+            run(data)
+            peak_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        finally:
+            tracemalloc.stop()
+    return seconds, peak_mb
+
+def run_benchmarks(sizes, names=None, memory=True, limits=True):
+    """Run the selected benchmarks at each size and return result dicts."""
+    results = []
+    from utils.database import get_engine
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # An explicit scratch engine; the configured database is never touched
+        ctx = {"tmpdir": tmpdir, "engine": get_engine(f"sqlite:///{os.path.join(tmpdir, 'bench.db')}")}
+
+        for name in names or BENCHMARKS:
+            setup, run, max_size = BENCHMARKS[name]
+            for size in sizes:
+                if limits and size > max_size:
+                    print(f"{name:<28} {size:>9}  skipped (cap {max_size}, use --no-limits)")
+                    continue
+                data = setup(ctx, size)
+                seconds, peak_mb = measure(run, data, memory=memory)
+                results.append({"name": name, "size": size, "seconds": round(seconds, 4),
+                                 "peak_mb": round(peak_mb, 2) if peak_mb is not None else None})
+                memory_text = f"{peak_mb:9.1f} MB" if peak_mb is not None else ""
+                print(f"{name:<28} {size:>9} {seconds:9.3f} s {memory_text}")
+    return results
+
+def compare(results, baseline, tolerance):
+    """Print ratios against a baseline and return the regressed entries."""
+    previous = {(r["name"], r["size"]): r for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        before = previous.get((result["name"], result["size"]))
+        if not before or not before["seconds"]:
+            continue
+        ratio = result["seconds"] / before["seconds"]
+        regressed = ratio > 1 + tolerance and result["seconds"] >= MIN_SECONDS
+        flag = "REGRESSION" if regressed else ""
+        print(f"{result['name']:<28} {result['size']:>9} x{ratio:6.2f} {flag}")
+        if flag:
+            regressions.append(result)
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the app's hot paths.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="Benchmarks to run")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--no-limits", action="store_true", help="Ignore per-benchmark size caps")
+    parser.add_argument("--output", help="Write results as a JSON baseline")
+    parser.add_argument("--compare", help="Baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown before flagging a regression (default: 0.25)")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.only, memory=not args.no_memory, limits=not args.no_limits)
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        print(f"Wrote {len(results)} results to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        if compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
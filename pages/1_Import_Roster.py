@@ -0,0 +1,103 @@
+"""Upload a roster export and import it into the database on a background thread."""
+import hmac
+import os
+import time
+
+import streamlit as st
+
+from utils.secrets_handler import read_secret
+
+# Seconds between progress refreshes while an import runs
+PROGRESS_REFRESH = 1
+
+st.set_page_config(page_title="Import Roster", page_icon="📥", layout="wide")
+st.title("📥 Import Alumni Roster")
+
+# Replacing the roster is destructive, so the page stays closed until a password is configured
+password = os.environ.get("IMPORT_PASSWORD") or read_secret("import", "password")
+if not password:
+    st.info("Roster uploads are disabled. Set IMPORT_PASSWORD (or [import] password in secrets) to enable them.")
+    st.stop()
+if not st.session_state.get("import_unlocked"):
+    entered = st.text_input("Import password", type="password", key="import_password")
+    if not entered:
+        st.stop()
+    if not hmac.compare_digest(entered.encode("utf-8"), str(password).encode("utf-8")):
+        st.error("Wrong password")
+        st.stop()
+    st.session_state.import_unlocked = True
+
+from utils.data_loader import clear_roster_caches
+from utils.database import get_engine
+from utils.roster_import import get_job, nominatim_geocoder, running_job, save_upload, start_import
+
+def format_seconds(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes}m {seconds:02d}s" if minutes else f"{seconds}s"
+
+@st.fragment(run_every=PROGRESS_REFRESH)
+def import_progress(job_id):
+    """Poll the background job; reruns the page once it has finished."""
+    job = get_job(job_id)
+    if job is None or not job.running:
+        st.rerun()
+
+    fraction = job.fraction()
+    label = {"queued": "Queued", "parsing": f"Parsing: {job.rows:,} rows read",
+             "geocoding": f"Geocoding: {job.done:,} of {job.total or 0:,} rows",
+             "writing": "Writing to the database"}.get(job.phase, job.phase)
+    eta = job.eta()
+    if eta is not None:
+        label += f" (about {format_seconds(eta)} left)"
+    st.progress(fraction if fraction is not None else 0.0, text=label)
+    st.caption(f"Import {job.id}, running for {format_seconds(time.time() - job.started)}")
+    for issue in job.issues:
+        st.warning(issue)
+
+def show_result(job):
+    if job.error:
+        st.error(f"Import {job.id} failed: {job.error}")
+    else:
+        result = job.result or {}
+        st.success(f"Import {job.id} committed in {format_seconds(job.finished - job.started)}: "
+                   f"{result.get('inserted', 0)} inserted, {result.get('updated', 0)} updated, "
+                   f"{result.get('deleted', 0)} deleted, {result.get('geocoded', 0)} geocoded")
+    for issue in job.issues:
+        st.warning(issue)
+
+if get_engine() is None:
+    st.error("No database is configured; uploads are imported into the alumni table.")
+    st.stop()
+
+job = running_job()
+if job is not None:
+    # Any session may watch an import; a second one cannot start until it finishes
+    st.session_state.import_job = job.id
+    import_progress(job.id)
+    st.stop()
+
+finished = get_job(st.session_state.get("import_job"))
+if finished is not None:
+    show_result(finished)
+
+st.write("Upload a geocoded combo file or a raw registry export (CSV). "
+         "The app keeps serving the current roster until the import commits.")
+with st.form("roster_upload_form"):
+    uploaded = st.file_uploader("Roster CSV", type=["csv"], key="roster_upload")
+    geocode = st.checkbox("Geocode rows without coordinates (about one row per second)", key="import_geocode")
+    submitted = st.form_submit_button("Start import")
+
+if submitted:
+    if uploaded is None:
+        st.error("Choose a CSV file first")
+    else:
+        path = save_upload(uploaded)
+        try:
+            job = start_import(path, geocoder=nominatim_geocoder() if geocode else None,
+                               on_commit=clear_roster_caches)
+        except RuntimeError as e:
+            os.remove(path)
+            st.error(str(e))
+        else:
+            st.session_state.import_job = job.id
+            st.rerun()
@@ -0,0 +1,59 @@
+"""Backtest alert thresholds against archived (closed) EONET events.
+
+Example:
+    python scripts/backtest_alerts.py --start 2020-01-01 --end 2024-12-31 --output backtest.csv
+    python scripts/backtest_alerts.py --events-file archive.json --thresholds 100 200 500 --output backtest.csv
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.backtest import (DEFAULT_THRESHOLDS, parse_date, replay_events_file, run_backtest,
+                            stream_archived_events, summarize_backtest)
+from utils.events import save_events_file
+from utils.roster import load_roster
+from utils.secrets_handler import get_nasa_api_key
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Count historical alerts per month, category and threshold.")
+    parser.add_argument("--output", required=True, help="Results CSV")
+    parser.add_argument("--start", type=parse_date, help="First day (YYYY-MM-DD) to fetch from EONET")
+    parser.add_argument("--end", type=parse_date, help="Last day (YYYY-MM-DD) to fetch from EONET")
+    parser.add_argument("--events-file", help="Replay archived events from a saved JSON file instead of EONET")
+    parser.add_argument("--record-events", help="Save the fetched archive to this JSON file for later replay")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=list(DEFAULT_THRESHOLDS),
+                        help=f"Alert radii in km (default: {' '.join(map(str, DEFAULT_THRESHOLDS))})")
+    parser.add_argument("--roster", help="Roster CSV to use instead of the database")
+    args = parser.parse_args(argv)
+    if not args.events_file and not (args.start and args.end):
+        parser.error("either --events-file or both --start and --end are required")
+    return args
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args(argv)
+
+    alumni_df, metadata = load_roster(csv_path=args.roster)
+    if args.events_file:
+        events = replay_events_file(args.events_file)
+    else:
+        events = stream_archived_events(args.start, args.end, api_key=get_nasa_api_key())
+        if args.record_events:
+            events = list(events)
+            save_events_file(events, args.record_events)
+
+    results = run_backtest(alumni_df, events, args.thresholds)
+    results.to_csv(args.output, index=False)
+
+    print(f"Backtested {len(alumni_df)} alumni ({(metadata or {}).get('source')}); "
+          f"wrote {len(results)} rows to {args.output}")
+    if not results.empty:
+        print(summarize_backtest(results).to_string())
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+"""Load a roster CSV and saved EONET events into the embedded DuckDB file.
+
+Example:
+    python scripts/duckdb_ingest.py --roster assets/combo.csv --events-file events.json
+    ROSTER_SOURCE=duckdb streamlit run app.py
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.duckdb_store import get_path, ingest_roster_csv, save_events
+from utils.events import load_events_file
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Ingest roster and events into DuckDB.")
+    parser.add_argument("--roster", help="Roster CSV (replaces the alumni table)")
+    parser.add_argument("--events-file", nargs="+", default=[], help="Saved event JSON files to upsert")
+    parser.add_argument("--path", help=f"DuckDB file (default: DUCKDB_PATH or {get_path()})")
+    args = parser.parse_args(argv)
+
+    if not args.roster and not args.events_file:
+        parser.error("nothing to ingest: pass --roster and/or --events-file")
+
+    if args.roster:
+        print(f"Ingested {ingest_roster_csv(args.roster, path=args.path)} alumni")
+    for events_file in args.events_file:
+        print(f"Upserted {save_events(load_events_file(events_file), path=args.path)} events from {events_file}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""Generate a synthetic roster (combo.csv format) and EONET-shaped events.
+
+Example:
+    python scripts/generate_synthetic_data.py --alumni 100000 --events 200 --out-dir synthetic
+    python scripts/generate_synthetic_data.py --alumni 100000 --database-url sqlite:///synthetic.db
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.events import save_events_file
+from utils.synthetic import alumni_rows, generate_alumni, generate_events, write_combo_csv
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic alumni and disaster data.")
+    parser.add_argument("--alumni", type=int, default=1000, help="Number of alumni rows")
+    parser.add_argument("--events", type=int, default=50, help="Number of events")
+    parser.add_argument("--invalid-share", type=float, default=0.02,
+                        help="Share of alumni with missing or zero coordinates")
+    parser.add_argument("--max-points", type=int, default=5, help="Maximum track points per event")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out-dir", default="synthetic", help="Directory for combo.csv and events.json")
+    parser.add_argument("--database-url", help="Also bulk load the alumni into this database")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out_dir, exist_ok=True)
+
+    roster = generate_alumni(args.alumni, invalid_share=args.invalid_share, seed=args.seed)
+    roster_path = write_combo_csv(roster, os.path.join(args.out_dir, "combo.csv"))
+    print(f"Wrote {len(roster)} alumni to {roster_path}")
+
+    events = generate_events(args.events, seed=args.seed, max_points=args.max_points)
+    events_path = os.path.join(args.out_dir, "events.json")
+    save_events_file(events, events_path)
+    print(f"Wrote {len(events)} events to {events_path}")
+
+    if args.database_url:
+        from utils.bulk_loader import bulk_load_alumni
+        from utils.database import get_engine
+        count = bulk_load_alumni(alumni_rows(roster), engine=get_engine(args.database_url))
+        print(f"Loaded {count} alumni into the database")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
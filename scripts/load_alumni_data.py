@@ -1,8 +1,6 @@
 import pandas as pd
-import chardet
 from sqlalchemy import create_engine
 import os
-from datetime import datetime
 import sys
 from pathlib import Path
 from geopy.geocoders import Nominatim, GoogleV3
@@ -16,12 +14,17 @@ from ratelimit import limits, sleep_and_retry
 sys.path.append(str(Path(__file__).parent.parent))
 
 from utils.japan_locations import get_prefecture_coordinates
-from utils.database import init_db, Alumni, SessionLocal
+from utils.database import init_database
+from utils.roster_sync import sync_alumni
+from utils.roster_reader import read_roster_chunks
 
 # Configure rate limiting
 CALLS_PER_MINUTE = 60
 RATE_LIMIT_PERIOD = 60
 
+# Address components that trigger re-geocoding when they change
+ADDRESS_FIELDS = ['Address 1', 'Address 2', 'City', 'State', 'Postal', 'Country']
+
 @sleep_and_retry
 @limits(calls=CALLS_PER_MINUTE, period=RATE_LIMIT_PERIOD)
 def geocode_with_rate_limit(geolocator, address):
@@ -113,105 +116,74 @@ def get_coordinates(address_components):
     print(f"Could not find coordinates for address components: {address_components}")
     return (0, 0)
 
+def geocode_row(row):
+    """Geocode one roster row during a sync."""
+    coords = get_coordinates({field: row.get(field, '') for field in ADDRESS_FIELDS})
+    # Add small delay to avoid overwhelming geocoding services
+    time.sleep(0.5)
+    return coords
+
 def load_csv_to_database(file_path):
     """Load Sohokai alumni data from CSV to PostgreSQL database."""
     print("Initializing database...")
-    init_db()
+    init_database()
 
     print("Reading CSV file...")
-    # Detect file encoding
-    with open(file_path, 'rb') as file:
-        raw_data = file.read()
-        result = chardet.detect(raw_data)
-        print(f"Detected encoding: {result['encoding']}")
-
-    # Read CSV with detected encoding
-    df = pd.read_csv(file_path, encoding=result['encoding'])
-    print(f"Found {len(df)} records")
-
-    # Process each record
+    # Process each record, one chunk of the file at a time
     processed_data = []
-    total_records = len(df)
-    successful_geocodes = 0
+    total_records = 0
 
     print("\nProcessing records...")
-    for idx, row in df.iterrows():
-        try:
-            # Progress update
-            if idx % 10 == 0:
-                print(f"\nProcessing record {idx + 1}/{total_records}")
-                print(f"Successful geocodes so far: {successful_geocodes}")
-
-            # Combine name fields
-            first_name = clean_address_field(row.get('First Name', ''))
-            last_name = clean_address_field(row.get('Prim_Last', ''))
-            name = f"{first_name} {last_name}".strip()
-
-            if not name:
-                print(f"Skipping record {idx + 1}: Missing name")
+    for chunk in read_roster_chunks(file_path):
+        for idx, row in chunk.iterrows():
+            total_records += 1
+            try:
+                # Combine name fields
+                first_name = clean_address_field(row.get('First Name', ''))
+                last_name = clean_address_field(row.get('Prim_Last', ''))
+                name = f"{first_name} {last_name}".strip()
+
+                if not name:
+                    print(f"Skipping record {idx + 1}: Missing name")
+                    continue
+
+                # Collect address components
+                address_components = {
+                    field: clean_address_field(row.get(field, '')) for field in ADDRESS_FIELDS
+                }
+
+                # Format full address for storage
+                formatted_address = ', '.join(v for v in address_components.values() if v)
+
+                # Stable key from the roster; sync_alumni keys rows without one on their content
+                source_id = clean_address_field(row.get('ID', ''))
+
+                processed_data.append({
+                    'source_id': source_id,
+                    'name': name,
+                    'location': formatted_address,
+                    'country': address_components['Country'],
+                    'state': address_components['State'],
+                    'city': address_components['City'],
+                    'class_year': clean_address_field(row.get('Pref Class Yr', '')),
+                    **address_components
+                })
+
+            except Exception as e:
+                print(f"Error processing record {idx + 1}: {str(e)}")
                 continue
 
-            # Collect address components as a dictionary
-            address_components = {
-                'Address 1': row.get('Address 1', ''),
-                'Address 2': row.get('Address 2', ''),
-                'City': row.get('City', ''),
-                'State': row.get('State', ''),
-                'Postal': row.get('Postal', ''),
-                'Country': row.get('Country', '')
-            }
-
-            # Get coordinates using various methods
-            coords = get_coordinates(address_components)
-
-            if coords != (0, 0):
-                successful_geocodes += 1
-
-            # Format full address for storage
-            formatted_address = ', '.join(
-                clean_address_field(v) for v in address_components.values() if v
-            )
-
-            processed_data.append({
-                'name': name,
-                'location': formatted_address,
-                'latitude': coords[0],
-                'longitude': coords[1],
-                'last_updated': datetime.now()
-            })
-
-            # Add small delay to avoid overwhelming geocoding services
-            time.sleep(0.5)
-
-        except Exception as e:
-            print(f"Error processing record {idx + 1}: {str(e)}")
-            continue
-
     print(f"\nProcessing complete!")
-    print(f"Total records processed: {len(processed_data)}")
-    print(f"Successfully geocoded: {successful_geocodes}")
-
-    print("\nSaving records to database...")
-    # Create session and save to database
-    session = SessionLocal()
-    try:
-        # Clear existing records
-        session.query(Alumni).delete()
-
-        # Add new records
-        for record in processed_data:
-            alumni = Alumni(**record)
-            session.add(alumni)
-
-        session.commit()
-        print("Data successfully loaded to database!")
-
-    except Exception as e:
-        session.rollback()
-        print(f"Error saving to database: {str(e)}")
-        raise
-    finally:
-        session.close()
+    print(f"Total records processed: {len(processed_data)}/{total_records}")
+
+    print("\nSyncing records with database...")
+    # Only new rows and rows whose address changed are geocoded
+    result = sync_alumni(
+        pd.DataFrame(processed_data),
+        geocode=geocode_row,
+        address_columns=ADDRESS_FIELDS
+    )
+    print(f"Data successfully synced to database! {result}")
 
 if __name__ == "__main__":
     file_path = 'attached_assets/Sohokai_List_20240726(Graduated).csv'
@@ -0,0 +1,192 @@
+"""Simulate concurrent dashboard sessions with Streamlit's headless AppTest.
+
+Each session opens the app, clicks "Load Full Application" and then moves
+the alert threshold slider a few times. Data comes from replay files so the
+run is repeatable and never calls EONET.
+
+Example:
+    python scripts/load_test.py --sessions 20 --moves 5
+    python scripts/load_test.py --sessions 50 --roster synthetic/combo.csv --events-file synthetic/events.json
+
+Note: AppTest reruns the whole script on every widget change, so slider
+latencies are an upper bound for the fragment reruns a browser would see.
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root to Python path
+ROOT = Path(__file__).parent.parent
+sys.path.append(str(ROOT))
+
+PERCENTILES = (50, 95, 99)
+# Imported up front: a server process has these loaded before the rush, and
+# concurrent first imports from several script threads can see half-initialized modules
+APP_MODULES = ["utils.helpers", "utils.database", "utils.data_loader", "utils.disaster_monitor",
+               "utils.events", "utils.concurrent_load", "utils.panels", "streamlit_folium"]
+THRESHOLD_VALUES = list(range(50, 1001, 50))
+
+def rss_mb():
+    """Current resident set size of this process in MB."""
+    try:
+        with open("/proc/self/status") as file:
+            for line in file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # Peak RSS is the best portable fallback (KB on Linux, bytes on macOS)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 1024
+
+def _timed_run(element, latencies, action, errors, timeout):
+    start = time.perf_counter()
+    at = element.run(timeout=timeout)
+    latencies.append((action, time.perf_counter() - start))
+    if at.exception:
+        errors.append(f"{action}: {at.exception[0].value}")
+    # The app reports its own failures with st.error rather than raising
+    errors.extend(f"{action}: {element.value}" for element in at.error)
+    return at
+
+def share_test_runtime():
+    """Let several AppTest instances run at once in this process.
+
+    AppTest installs a mock Runtime singleton for each run and clears it when
+    the run ends, which breaks any other session still running. Falling back
+    to one shared mock keeps the singleton valid for all of them.
+    """
+    from unittest.mock import MagicMock
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+
+    shared = MagicMock(spec=Runtime)
+    shared.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    shared.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime.instance = classmethod(lambda cls: cls._instance or shared)
+    Runtime.exists = classmethod(lambda cls: True)
+
+def run_session(index, moves, timeout, latencies, errors, barrier):
+    """Drive one simulated user through the app."""
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(index)
+    at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=timeout)
+    barrier.wait()
+    try:
+        at = _timed_run(at, latencies, "open", errors, timeout)
+        at = _timed_run(at.button(key="load_app").click(), latencies, "load_full_app", errors, timeout)
+        for _ in range(moves):
+            slider = at.slider(key="proximity_threshold")
+            at = _timed_run(slider.set_value(rng.choice(THRESHOLD_VALUES)), latencies,
+                            "threshold_slider", errors, timeout)
+    except Exception as e:
+        errors.append(f"session {index}: {e}")
+
+def summarize(latencies):
+    """Return ``{action: {"count", "p50", "p95", "p99", "max"}}`` in seconds."""
+    summary = {}
+    for action in dict.fromkeys(action for action, _ in latencies):
+        values = np.array([seconds for name, seconds in latencies if name == action])
+        summary[action] = {"count": len(values), "max": round(float(values.max()), 4)}
+        for p in PERCENTILES:
+            summary[action][f"p{p}"] = round(float(np.percentile(values, p)), 4)
+    return summary
+
+def run_load_test(sessions, moves, timeout):
+    """Run ``sessions`` concurrent sessions and return the report dict."""
+    import importlib
+    from utils.cache_stats import cache_stats, reset_cache_stats
+
+    for module in APP_MODULES:
+        importlib.import_module(module)
+    share_test_runtime()
+    reset_cache_stats()
+    latencies, errors = [], []
+    barrier = threading.Barrier(sessions)
+    rss_start = rss_mb()
+    start = time.perf_counter()
+
+    threads = [
+        threading.Thread(target=run_session, args=(i, moves, timeout, latencies, errors, barrier))
+        for i in range(sessions)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    rss_end = rss_mb()
+    return {
+        "sessions": sessions,
+        "moves": moves,
+        "wall_seconds": round(time.perf_counter() - start, 2),
+        "latency_seconds": summarize(latencies),
+        "memory_mb": {"start": round(rss_start, 1), "end": round(rss_end, 1),
+                      "growth": round(rss_end - rss_start, 1)},
+        "caches": cache_stats(),
+        "errors": errors,
+    }
+
+def print_report(report):
+    print(f"{report['sessions']} sessions x {report['moves']} slider moves "
+          f"in {report['wall_seconds']:.1f}s")
+    print(f"{'action':<18} {'count':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for action, stats in report["latency_seconds"].items():
+        print(f"{action:<18} {stats['count']:>6} {stats['p50']:>8.3f} {stats['p95']:>8.3f} "
+              f"{stats['p99']:>8.3f} {stats['max']:>8.3f}")
+    memory = report["memory_mb"]
+    print(f"RSS {memory['start']:.0f} MB -> {memory['end']:.0f} MB (+{memory['growth']:.0f} MB)")
+    for name, stats in report["caches"].items():
+        ratio = f"{stats['hit_ratio']:.0%}" if stats["hit_ratio"] is not None else "n/a"
+        print(f"cache {name:<20} {stats['calls']:>5} calls {stats['misses']:>4} misses  hit ratio {ratio}")
+    for error in report["errors"][:10]:
+        print(f"error: {error}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the dashboard with concurrent headless sessions.")
+    parser.add_argument("--sessions", type=int, default=10, help="Concurrent sessions (default: 10)")
+    parser.add_argument("--moves", type=int, default=3, help="Threshold slider moves per session (default: 3)")
+    parser.add_argument("--roster", help="Roster CSV to replay (default: synthetic)")
+    parser.add_argument("--events-file", help="Events JSON to replay (default: synthetic)")
+    parser.add_argument("--alumni", type=int, default=2000, help="Synthetic roster size when --roster is not given")
+    parser.add_argument("--events", type=int, default=20, help="Synthetic event count when --events-file is not given")
+    parser.add_argument("--timeout", type=float, default=120, help="Per-rerun timeout in seconds")
+    parser.add_argument("--output", help="Write the report as JSON")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        if not args.roster or not args.events_file:
+            from utils.events import save_events_file
+            from utils.synthetic import generate_alumni, generate_events, write_combo_csv
+        if not args.roster:
+            args.roster = write_combo_csv(generate_alumni(args.alumni), os.path.join(tmpdir, "combo.csv"))
+        if not args.events_file:
+            args.events_file = save_events_file(generate_events(args.events), os.path.join(tmpdir, "events.json"))
+
+        # Read by the app's cached loaders, which all sessions share in this process
+        os.environ["ROSTER_CSV"] = args.roster
+        os.environ["EONET_EVENTS_FILE"] = args.events_file
+
+        report = run_load_test(args.sessions, args.moves, args.timeout)
+
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        print(f"Wrote report to {args.output}")
+    return 1 if report["errors"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
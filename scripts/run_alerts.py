@@ -0,0 +1,56 @@
+"""Command-line batch job that computes proximity alerts outside Streamlit.
+
+Example (cron):
+    python scripts/run_alerts.py --threshold 200 --output alerts.parquet --workers 4
+"""
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.events import DISASTER_TYPES
+from utils.pipeline import OUTPUT_FORMATS, run_alert_pipeline, write_alerts
+from utils.roster import ROSTER_SOURCES
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compute alumni proximity alerts for active disasters.")
+    parser.add_argument("--output", required=True, help="Alerts file (.csv, .json or .parquet)")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, help="Output format (default: from file suffix)")
+    parser.add_argument("--threshold", type=float, default=200, help="Alert radius in km (default: 200)")
+    parser.add_argument("--types", nargs="+", default=DISASTER_TYPES, choices=DISASTER_TYPES,
+                        metavar="TYPE", help=f"Disaster types to include (default: all of {DISASTER_TYPES})")
+    parser.add_argument("--roster", help="Roster CSV to use instead of the database")
+    parser.add_argument("--source", choices=ROSTER_SOURCES,
+                        help="Roster backend (default: ROSTER_SOURCE or auto: database, then CSV)")
+    parser.add_argument("--events-file", help="Replay events from a saved JSON file instead of calling EONET")
+    parser.add_argument("--record-events", help="Save the fetched events to this JSON file for later replay")
+    parser.add_argument("--workers", type=int, default=1, help="Processes for the proximity stage (default: 1)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args(argv)
+
+    alerts_df, summary = run_alert_pipeline(
+        threshold_km=args.threshold,
+        types=args.types,
+        roster_csv=args.roster,
+        events_file=args.events_file,
+        record_events=args.record_events,
+        workers=args.workers,
+        roster_source=args.source
+    )
+    write_alerts(alerts_df, args.output, args.format)
+
+    print(f"Wrote {summary['alerts']} alerts to {args.output}")
+    for stage, seconds in summary["timings"].items():
+        print(f"  {stage:<10} {seconds:8.3f}s")
+    print(json.dumps({k: v for k, v in summary.items() if k != "timings"}))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+"""Serve the read-only alerts/events HTTP API (see utils/api.py) with uvicorn.
+
+Example:
+    python scripts/serve_api.py --port 8000 --roster assets/combo.csv
+    curl 'http://localhost:8000/alerts?threshold=200&limit=50'
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.api import EVENTS_TTL, ROSTER_TTL, create_app
+from utils.roster import ROSTER_SOURCES
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Serve alerts, events and nearby alumni over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on (default: 8000)")
+    parser.add_argument("--roster", help="Roster CSV (default: ROSTER_CSV, else the roster backend)")
+    parser.add_argument("--source", choices=ROSTER_SOURCES,
+                        help="Roster backend (default: ROSTER_SOURCE or auto: database, then CSV)")
+    parser.add_argument("--events-file", help="Replay events from a saved JSON file instead of calling EONET")
+    parser.add_argument("--events-ttl", type=float, default=EVENTS_TTL,
+                        help=f"Seconds between event refreshes (default: {EVENTS_TTL})")
+    parser.add_argument("--roster-ttl", type=float, default=ROSTER_TTL,
+                        help=f"Seconds between roster reloads (default: {ROSTER_TTL})")
+    args = parser.parse_args(argv)
+
+    try:
+        import uvicorn
+    except ImportError:
+        parser.error("serving the API needs an ASGI server: pip install uvicorn")
+
+    app = create_app(roster_csv=args.roster, roster_source=args.source, events_file=args.events_file,
+                     events_ttl=args.events_ttl, roster_ttl=args.roster_ttl)
+    uvicorn.run(app, host=args.host, port=args.port)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""Tabular alert views: filtering, sorting, pagination and per-event summaries.
+
+All of these work on an ``AlertResult``'s arrays; text fields are only
+joined for the page being shown (or for a full export).
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+# Distance histogram bins (km) for the grouped summary
+DISTANCE_BINS = [0, 50, 100, 200, 500, math.inf]
+DISTANCE_LABELS = ["<50 km", "50-100 km", "100-200 km", "200-500 km", "500+ km"]
+
+ALERT_COLUMNS = {
+    "alumni_name": "Alumni",
+    "location": "Location",
+    "disaster_description": "Disaster",
+    "disaster_type": "Type",
+    "distance": "Distance (km)",
+}
+
+# Display column -> (roster column, None) or (None, event field)
+_SOURCES = {
+    "Alumni": ("Name", None),
+    "Location": ("Location", None),
+    "Disaster": (None, "disaster_description"),
+    "Type": (None, "disaster_type"),
+}
+
+def alerts_frame(alerts):
+    """Build the display DataFrame for an ``AlertResult`` (or a slice of one)."""
+    return alerts.frame()[list(ALERT_COLUMNS)].rename(columns=ALERT_COLUMNS)
+
+def alert_types(alerts):
+    """Sorted disaster types that occur among the alerts."""
+    return sorted(set(alerts.event_values("disaster_type")[np.unique(alerts.events)]))
+
+def alert_events(alerts):
+    """Sorted disaster titles that occur among the alerts."""
+    return sorted(set(alerts.event_values("disaster_description")[np.unique(alerts.events)]))
+
+def alerts_for_event(alerts, title):
+    """The alerts of the event(s) titled ``title``."""
+    return alerts[alerts.event_values("disaster_description")[alerts.events] == title]
+
+def _sort_codes(alerts, column):
+    """Integer sort keys per alert for a text column; equal texts share a code."""
+    roster_column, event_field = _SOURCES[column]
+    if event_field is not None:
+        codes, _ = pd.factorize(alerts.event_values(event_field), sort=True)
+        return codes[alerts.events]
+    # Only the roster rows that have alerts are looked at
+    rows, inverse = np.unique(alerts.rows, return_inverse=True)
+    codes, _ = pd.factorize(alerts.roster_values(roster_column)[rows], sort=True)
+    return codes[inverse]
+
+def filter_alerts(alerts, search="", types=None):
+    """Keep alerts matching a free-text search and the selected disaster types.
+
+    The search matches the alumni name, location or disaster title.
+    """
+    keep = np.ones(len(alerts), dtype=bool)
+    if types:
+        keep &= np.isin(alerts.event_values("disaster_type"), list(types))[alerts.events]
+    if search:
+        needle = search.strip().lower()
+        titles = pd.Series(alerts.event_values("disaster_description")).astype(str).str.lower()
+        matched = titles.str.contains(needle, regex=False).to_numpy()[alerts.events]
+
+        rows, inverse = np.unique(alerts.rows, return_inverse=True)
+        text = (pd.Series(alerts.roster_values("Name")[rows]).astype(str) + " "
+                + pd.Series(alerts.roster_values("Location")[rows]).astype(str)).str.lower()
+        matched |= text.str.contains(needle, regex=False).to_numpy()[inverse]
+        keep &= matched
+    return alerts[keep]
+
+def sort_alerts(alerts, column="Distance (km)", ascending=True):
+    """Sort alerts by one display column, keeping ties in their original order."""
+    keys = alerts.distances if column == "Distance (km)" else _sort_codes(alerts, column)
+    keys = keys if ascending else -keys.astype(np.float64)
+    return alerts[np.argsort(keys, kind="stable")]
+
+def paginate(alerts, page, page_size):
+    """Return ``(display_frame_for_page, page_count)`` with ``page`` starting at 1."""
+    page_count = max(1, math.ceil(len(alerts) / page_size))
+    page = min(max(1, page), page_count)
+    start = (page - 1) * page_size
+    return alerts_frame(alerts[start:start + page_size]), page_count
+
+def summarize_alerts(alerts):
+    """Group alerts per event: count, nearest alumni and a distance histogram."""
+    columns = ["Disaster", "Type", "Alerts", "Nearest Alumni", "Nearest (km)"] + DISTANCE_LABELS
+    if not len(alerts):
+        return pd.DataFrame(columns=columns)
+
+    # Events sharing a title are one group, ordered by title
+    group_of_event, titles = pd.factorize(alerts.event_values("disaster_description"), sort=True)
+    groups = group_of_event[alerts.events]
+    counts = np.bincount(groups, minlength=len(titles))
+
+    # Nearest alert per group: the first one after sorting by group, then distance
+    order = np.lexsort((np.arange(len(alerts)), alerts.distances, groups))
+    firsts = order[np.r_[True, groups[order][1:] != groups[order][:-1]]]
+    nearest = alerts[firsts]
+    present = groups[firsts]
+
+    bins = np.digitize(alerts.distances, DISTANCE_BINS[1:-1], right=False)
+    histogram = np.bincount(groups * len(DISTANCE_LABELS) + bins,
+                            minlength=len(titles) * len(DISTANCE_LABELS)).reshape(len(titles), -1)
+
+    summary = pd.DataFrame({
+        "Disaster": np.asarray(titles)[present],
+        "Type": nearest.event_values("disaster_type")[nearest.events],
+        "Alerts": counts[present],
+        "Nearest Alumni": pd.Series(nearest.roster_values("Name")[nearest.rows]).astype(str).to_numpy(),
+        "Nearest (km)": np.round(nearest.distances.astype(np.float64), 1),
+    })
+    summary = summary.join(pd.DataFrame(histogram[present], columns=DISTANCE_LABELS))
+    return summary[columns].sort_values("Alerts", ascending=False, kind="stable")
@@ -0,0 +1,456 @@
+"""Read-only ASGI API over the alert pipeline: events, alerts and nearby alumni.
+
+Any ASGI server can host ``app`` (``scripts/serve_api.py`` uses uvicorn).
+Lists are paged with opaque cursors. Responses are cached in process per
+roster/event version, carry ETags for conditional polling and are gzipped
+when the client accepts it. Contact exports are streamed instead. Nothing
+is loaded until the first request.
+"""
+import asyncio
+import base64
+import binascii
+import gzip
+import hashlib
+import hmac
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs
+
+from . import metrics
+from .cache_stats import record
+from .contact_export import (EXPORT_FORMATS, MIME_TYPES, contacts_path, export_chunks, export_filename,
+                             format_available)
+from .disk_cache import events_version, roster_version
+from .events import DISASTER_TYPES, filter_disasters_by_type, load_events_file
+from .feeds import fetch_hazard_events
+from .proximity import AlertResult, alumni_within, compute_proximity_alerts
+from .roster import load_roster
+from .secrets_handler import get_nasa_api_key
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Seconds before the roster and the events are reloaded
+ROSTER_TTL = 3600
+EVENTS_TTL = 300
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+DEFAULT_THRESHOLD_KM = 200
+DEFAULT_RADIUS_KM = 50
+# Same ceiling as the alert slider; larger radii mean geodesics for most of the roster
+MAX_DISTANCE_KM = 1000
+
+# Full result lists (one per query) and encoded pages kept per process
+RESULT_CACHE_SIZE = 32
+RESPONSE_CACHE_SIZE = 512
+
+# Smaller bodies are sent uncompressed
+GZIP_MIN_BYTES = 1024
+
+class ApiError(Exception):
+    """A request error reported to the client as ``{"error": message}``."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+class _LRU:
+    """Thread-safe least-recently-used mapping with hit/miss counts under ``name``."""
+
+    def __init__(self, name, size):
+        self.name = name
+        self.size = size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        record(self.name, "calls")
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                return self._items[key]
+        record(self.name, "misses")
+        return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.size:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+def _digest(data):
+    return hashlib.sha1(data).hexdigest()[:16]
+
+class ApiData:
+    """Roster and events shared by all requests, reloaded once their TTL has passed.
+
+    Events are replayed from ``events_file`` when given, otherwise fetched
+    from the hazard feeds (``HAZARD_FEEDS``). A failed event refresh keeps
+    serving the previous events.
+    """
+
+    def __init__(self, roster_csv=None, roster_source=None, events_file=None, api_key=None,
+                 roster_ttl=ROSTER_TTL, events_ttl=EVENTS_TTL):
+        self.roster_csv = roster_csv
+        self.roster_source = roster_source
+        self.events_file = events_file
+        self.api_key = api_key
+        self.roster_ttl = roster_ttl
+        self.events_ttl = events_ttl
+        self._lock = threading.Lock()
+        # (value, version, monotonic load time)
+        self._roster = None
+        self._events = None
+
+    def _stale(self, entry, ttl):
+        return entry is None or time.monotonic() - entry[2] >= ttl
+
+    def _load_roster(self):
+        alumni_df, _ = load_roster(csv_path=self.roster_csv, source=self.roster_source)
+        if alumni_df is None:
+            raise ApiError(503, "Alumni roster is unavailable")
+        return alumni_df, roster_version(alumni_df), time.monotonic()
+
+    def _load_events(self):
+        try:
+            if self.events_file:
+                events = load_events_file(self.events_file)
+            else:
+                events = fetch_hazard_events(api_key=self.api_key or get_nasa_api_key())
+        except Exception as e:
+            if self._events is None:
+                raise ApiError(503, "Disaster events are unavailable") from e
+            logger.warning(f"Event refresh failed, serving the previous events: {e}")
+            return self._events[0], self._events[1], time.monotonic()
+        return events, events_version(events), time.monotonic()
+
+    def snapshot(self):
+        """Return ``(alumni_df, events, versions)``, reloading whatever is stale (blocking)."""
+        with self._lock:
+            if self._stale(self._roster, self.roster_ttl):
+                self._roster = self._load_roster()
+            if self._stale(self._events, self.events_ttl):
+                self._events = self._load_events()
+            versions = {"roster": self._roster[1], "events": self._events[1]}
+            return self._roster[0], self._events[0], versions
+
+def encode_cursor(offset, version):
+    payload = json.dumps({"o": offset, "v": version}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor, version):
+    """Return the offset in ``cursor``; raises ApiError if it is malformed or from older data."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        offset, cursor_version = int(payload["o"]), payload["v"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise ApiError(400, "Invalid cursor")
+    if cursor_version != version or offset < 0:
+        raise ApiError(410, "Cursor expired: the data changed, restart from the first page")
+    return offset
+
+def _single(params, name):
+    values = params.get(name)
+    return values[-1] if values else None
+
+def _number(params, name, default, low, high, cast=float):
+    value = _single(params, name)
+    if value is None:
+        if default is None:
+            raise ApiError(400, f"'{name}' is required")
+        return cast(default)
+    try:
+        number = cast(value)
+    except ValueError:
+        raise ApiError(400, f"'{name}' must be a number")
+    if not low <= number <= high:
+        raise ApiError(400, f"'{name}' must be between {low} and {high}")
+    return number
+
+def _types(params):
+    value = _single(params, "types")
+    if not value:
+        return tuple(DISASTER_TYPES)
+    types = tuple(sorted({t.strip() for t in value.split(",") if t.strip()}))
+    unknown = [t for t in types if t not in DISASTER_TYPES]
+    if unknown:
+        raise ApiError(400, f"Unknown disaster types {unknown}, expected some of {DISASTER_TYPES}")
+    return types
+
+def _event_items(alumni_df, events, types):
+    items = []
+    for event in filter_disasters_by_type(events, list(types)):
+        try:
+            geometry = event['geometry'][0]
+            items.append({
+                "id": str(event['id']),
+                "title": str(event['title']),
+                "type": str(event['categories'][0]['title']),
+                "date": str(geometry.get('date') or ""),
+                "latitude": float(geometry['coordinates'][1]),
+                "longitude": float(geometry['coordinates'][0]),
+            })
+        except (KeyError, IndexError, ValueError, TypeError):
+            continue
+    # Newest first; the id keeps the order stable across pages
+    return sorted(items, key=lambda item: (item["date"], item["id"]), reverse=True)
+
+def _alert_items(alumni_df, events, types, threshold):
+    # Kept columnar; each page is joined to names when it is encoded
+    return compute_proximity_alerts(alumni_df, filter_disasters_by_type(events, list(types)), threshold)
+
+def _near_items(alumni_df, events, lat, lon, radius):
+    nearby = alumni_within(alumni_df, lat, lon, radius)
+    nearby.columns = ['name', 'location', 'latitude', 'longitude', 'distance_km']
+    return nearby.to_dict(orient="records")
+
+def _export_format(params):
+    fmt = (_single(params, "format") or "csv").lower()
+    if fmt not in EXPORT_FORMATS:
+        raise ApiError(400, f"'format' must be one of {list(EXPORT_FORMATS)}")
+    if not format_available(fmt):
+        raise ApiError(501, "XLSX exports need the 'openpyxl' package on the server")
+    return fmt
+
+class _Stream:
+    """Response body chunks whose first chunk was produced before the response started."""
+
+    def __init__(self, first, rest):
+        self.first = first
+        self.rest = rest
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.first is not None:
+            chunk, self.first = self.first, None
+            return chunk
+        return next(self.rest)
+
+    def close(self):
+        self.rest.close()
+
+# path -> (builder, parser returning the builder's query arguments)
+ROUTES = {
+    "/events": (_event_items, lambda params: (_types(params),)),
+    "/alerts": (_alert_items, lambda params: (
+        _types(params),
+        _number(params, "threshold", DEFAULT_THRESHOLD_KM, 0, MAX_DISTANCE_KM),
+    )),
+    "/alumni/near": (_near_items, lambda params: (
+        _number(params, "lat", None, -90, 90),
+        _number(params, "lon", None, -180, 180),
+        _number(params, "radius", DEFAULT_RADIUS_KM, 0, MAX_DISTANCE_KM),
+    )),
+}
+
+EXPORT_PATH = "/export/contacts"
+
+class ApiApp:
+    """ASGI application serving ``ROUTES`` plus ``/health``, ``/metrics`` and ``EXPORT_PATH``.
+
+    Set ``token`` (``API_TOKEN``) to require ``Authorization: Bearer <token>``;
+    the alert and alumni routes return names and locations, the export
+    emails and phone numbers.
+    """
+
+    def __init__(self, data=None, token=None):
+        self.data = data or ApiData()
+        self.token = token
+        self.results = _LRU("api_results", RESULT_CACHE_SIZE)
+        self.responses = _LRU("api_responses", RESPONSE_CACHE_SIZE)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        path = scope["path"].rstrip("/") or "/"
+        headers = {name.decode("latin-1").lower(): value.decode("latin-1")
+                   for name, value in scope.get("headers", [])}
+        start = time.perf_counter()
+        try:
+            status, body, extra = await self._handle(scope, path, headers)
+        except ApiError as e:
+            status, body, extra = e.status, json.dumps({"error": e.message}).encode("utf-8"), {}
+        except Exception:
+            logger.exception(f"API request to {path} failed")
+            status, body, extra = 500, b'{"error": "Internal server error"}', {}
+        route = path if path in ROUTES or path in ("/health", "/metrics", EXPORT_PATH) else "other"
+        metrics.observe("api_request", time.perf_counter() - start, route=route)
+        metrics.increment("api_responses", route=route, status=status)
+        await self._send(send, scope, status, body, extra)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _handle(self, scope, path, headers):
+        """Return ``(status, body, extra_headers)`` for one request."""
+        if scope["method"] not in ("GET", "HEAD"):
+            raise ApiError(405, "Only GET and HEAD are supported")
+        if self.token and not hmac.compare_digest(headers.get("authorization", ""), f"Bearer {self.token}"):
+            raise ApiError(401, "Missing or invalid bearer token")
+
+        if path == "/metrics":
+            body = metrics.render_prometheus().encode("utf-8")
+            return 200, body, {"content-type": "text/plain; version=0.0.4; charset=utf-8"}
+        if path == "/health":
+            _, _, versions = await asyncio.to_thread(self.data.snapshot)
+            return 200, json.dumps({"status": "ok", "versions": versions}).encode("utf-8"), {}
+        if path == EXPORT_PATH:
+            return await self._export(scope)
+        if path not in ROUTES:
+            raise ApiError(404, f"No route {path}")
+
+        builder, parse = ROUTES[path]
+        params = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        query = parse(params)
+        limit = _number(params, "limit", DEFAULT_LIMIT, 1, MAX_LIMIT, cast=int)
+
+        alumni_df, events, versions = await asyncio.to_thread(self.data.snapshot)
+        version = f"{versions['roster']}.{versions['events']}"
+        cursor = _single(params, "cursor")
+        offset = decode_cursor(cursor, version) if cursor else 0
+
+        key = (path, query, version, offset, limit)
+        etag = f'W/"{_digest(repr(key).encode("utf-8"))}"'
+        extra = {"etag": etag, "cache-control": "no-cache"}
+        if etag in [tag.strip() for tag in headers.get("if-none-match", "").split(",")]:
+            return 304, b"", extra
+
+        entry = self.responses.get(key)
+        if entry is None:
+            result_key = (path, query, version)
+            items = self.results.get(result_key)
+            if items is None:
+                with metrics.span("api_build", route=path):
+                    items = await asyncio.to_thread(builder, alumni_df, events, *query)
+                self.results.put(result_key, items)
+            page = items[offset:offset + limit]
+            if isinstance(page, AlertResult):
+                page = page.records()
+            following = offset + len(page)
+            body = json.dumps({
+                "items": page,
+                "count": len(page),
+                "total": len(items),
+                "next_cursor": encode_cursor(following, version) if following < len(items) else None,
+                "versions": versions,
+            }, separators=(",", ":")).encode("utf-8")
+            entry = {"identity": body}
+            self.responses.put(key, entry)
+
+        body = entry["identity"]
+        if len(body) >= GZIP_MIN_BYTES and "gzip" in headers.get("accept-encoding", "").lower():
+            # Compressed once per cached page
+            if "gzip" not in entry:
+                entry["gzip"] = gzip.compress(body, compresslevel=5)
+            body = entry["gzip"]
+            extra["content-encoding"] = "gzip"
+        return 200, body, extra
+
+    async def _alerts(self, alumni_df, events, types, threshold, version):
+        """The ``/alerts`` result list, shared with that route's cache."""
+        result_key = ("/alerts", (types, threshold), version)
+        alerts = self.results.get(result_key)
+        if alerts is None:
+            with metrics.span("api_build", route="/alerts"):
+                alerts = await asyncio.to_thread(_alert_items, alumni_df, events, types, threshold)
+            self.results.put(result_key, alerts)
+        return alerts
+
+    async def _export(self, scope):
+        """Stream the contacts of alumni near one event (``event=<id>``) or all events."""
+        params = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        fmt = _export_format(params)
+        types = _types(params)
+        threshold = _number(params, "threshold", DEFAULT_THRESHOLD_KM, 0, MAX_DISTANCE_KM)
+        event_id = _single(params, "event")
+
+        alumni_df, events, versions = await asyncio.to_thread(self.data.snapshot)
+        title = None
+        if event_id:
+            selected = [event for event in events if str(event.get('id')) == event_id]
+            if not selected:
+                raise ApiError(404, f"No event {event_id}")
+            title = str(selected[0].get('title') or event_id)
+            # One event: cheaper to compute than to filter the full result
+            alerts = await asyncio.to_thread(_alert_items, alumni_df, selected, types, threshold)
+        else:
+            version = f"{versions['roster']}.{versions['events']}"
+            alerts = await self._alerts(alumni_df, events, types, threshold, version)
+
+        extra = {
+            "content-type": MIME_TYPES[fmt],
+            "content-disposition": f'attachment; filename="{export_filename(fmt, title)}"',
+            "cache-control": "no-store",
+        }
+        chunks = export_chunks(alerts, fmt, contacts_path(self.data.roster_csv))
+        # A failing contact join or workbook surfaces here as an error status, not a truncated 200
+        try:
+            first = await asyncio.to_thread(next, chunks, None)
+        except BaseException:
+            chunks.close()
+            raise
+        return 200, _Stream(first, chunks), extra
+
+    async def _send(self, send, scope, status, body, extra):
+        response_headers = {"content-type": "application/json", "vary": "accept-encoding", **extra}
+        streamed = not isinstance(body, bytes)
+        if status == 304:
+            body = b""
+        elif not streamed:
+            response_headers["content-length"] = str(len(body))
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(name.encode("latin-1"), value.encode("latin-1"))
+                        for name, value in response_headers.items()],
+        })
+        if not streamed or scope["method"] == "HEAD":
+            if streamed:
+                body.close()
+            await send({"type": "http.response.body", "body": b"" if scope["method"] == "HEAD" else body})
+            return
+
+        # Chunks come from blocking file reads, so each is produced off the event loop
+        try:
+            while True:
+                chunk = await asyncio.to_thread(next, body, None)
+                if chunk is None:
+                    break
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        finally:
+            body.close()
+        await send({"type": "http.response.body", "body": b""})
+
+def create_app(roster_csv=None, roster_source=None, events_file=None, token=None, **data_options):
+    """Build the API, defaulting to the app's ``ROSTER_CSV``/``EONET_EVENTS_FILE``/``API_TOKEN``."""
+    data = ApiData(roster_csv=roster_csv or os.environ.get("ROSTER_CSV"),
+                   roster_source=roster_source,
+                   events_file=events_file or os.environ.get("EONET_EVENTS_FILE"),
+                   **data_options)
+    return ApiApp(data, token=token or os.environ.get("API_TOKEN"))
+
+app = create_app()
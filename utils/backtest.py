@@ -0,0 +1,199 @@
+"""Replay archived EONET events against the roster to count historical alerts."""
+import logging
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from .events import fetch_eonet_events, load_events_file
+from .proximity import roster_coordinates, roster_vectors
+from .spatial import EARTH_RADIUS_KM, unit_vectors
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_THRESHOLDS = (50, 100, 200, 500, 1000)
+
+# Alumni rows per matrix product
+BLOCK_ROWS = 65_536
+# Track points per batch and per matrix product (events are never split across batches)
+BATCH_POINTS = 256
+
+RESULT_COLUMNS = ["month", "category", "threshold_km", "events", "alerts", "affected_alumni"]
+
+def event_time(event):
+    """Return the ISO timestamp of an event's first observation ('' if unknown)."""
+    try:
+        return str(event["geometry"][0]["date"])
+    except (KeyError, IndexError, TypeError):
+        return ""
+
+def track_points(event):
+    """Return ``(lat, lon)`` for every observation of an event.
+
+    Points are used as-is; polygons are reduced to the mean of their outer ring.
+    """
+    points = []
+    for geometry in event.get("geometry") or []:
+        try:
+            coordinates = geometry["coordinates"]
+            if geometry.get("type") == "Polygon":
+                ring = np.asarray(coordinates[0], dtype=float)
+                points.append((float(ring[:, 1].mean()), float(ring[:, 0].mean())))
+            else:
+                points.append((float(coordinates[1]), float(coordinates[0])))
+        except (KeyError, IndexError, ValueError, TypeError):
+            continue
+    return points
+
+def _month_windows(start, end):
+    """Yield ``(first_day, last_day)`` for each calendar month in ``[start, end]``."""
+    current = start.replace(day=1)
+    while current <= end:
+        following = (current + timedelta(days=32)).replace(day=1)
+        yield max(current, start), min(following - timedelta(days=1), end)
+        current = following
+
+def stream_archived_events(start, end, api_key=None, status="closed", **extra_params):
+    """Yield EONET events between ``start`` and ``end`` in time order.
+
+    Fetches one calendar month per request; events spanning several months
+    are yielded once, in the month they are first returned.
+    """
+    seen = set()
+    for window_start, window_end in _month_windows(start, end):
+        events = fetch_eonet_events(api_key=api_key, status=status, days=None, limit=None,
+                                    start=window_start.isoformat(), end=window_end.isoformat(),
+                                    **extra_params)
+        fresh = [event for event in events if event.get("id") not in seen]
+        seen.update(event.get("id") for event in fresh)
+        logger.info(f"Fetched {len(fresh)} archived events for {window_start:%Y-%m}")
+        yield from sorted(fresh, key=event_time)
+
+def replay_events_file(path):
+    """Yield events from a saved file in time order."""
+    yield from sorted(load_events_file(path), key=event_time)
+
+class _MonthAccumulator:
+    """Alert counts and affected-alumni masks for one month."""
+
+    def __init__(self, month, alumni_count, threshold_count):
+        self.month = month
+        self.alumni_count = alumni_count
+        self.threshold_count = threshold_count
+        # category -> [events, alerts per threshold, mask per threshold]
+        self.categories = {}
+
+    def category(self, name):
+        if name not in self.categories:
+            self.categories[name] = [
+                0,
+                np.zeros(self.threshold_count, dtype=np.int64),
+                np.zeros((self.threshold_count, self.alumni_count), dtype=bool),
+            ]
+        return self.categories[name]
+
+    def rows(self, thresholds):
+        for name, (events, alerts, masks) in sorted(self.categories.items()):
+            for j, threshold in enumerate(thresholds):
+                yield {
+                    "month": self.month,
+                    "category": name,
+                    "threshold_km": threshold,
+                    "events": events,
+                    "alerts": int(alerts[j]),
+                    "affected_alumni": int(masks[j].sum()),
+                }
+
+def _process_batch(vectors, batch, cos_limits, accumulator):
+    """Add one batch of events (with their track points) to the month's counts.
+
+    Only real track points are stacked, and products take at most
+    ``BATCH_POINTS`` of them, so one long track does not inflate the others.
+    """
+    points = [point for _, track in batch for point in track]
+    point_vectors = unit_vectors([p[0] for p in points], [p[1] for p in points])
+    # Batch position of the event each stacked point belongs to
+    owners = np.repeat(np.arange(len(batch)), [len(track) for _, track in batch])
+    categories = [accumulator.category(name) for name, _ in batch]
+    for stats in categories:
+        stats[0] += 1
+
+    for start in range(0, len(vectors), BLOCK_ROWS):
+        block = slice(start, start + BLOCK_ROWS)
+        block_vectors = vectors[block]
+        # Events x alumni: cosine of the smallest angle to any track point (cosines are >= -1)
+        closest = np.full((len(batch), len(block_vectors)), -2.0, dtype=np.float32)
+        for first in range(0, len(points), BATCH_POINTS):
+            dots = point_vectors[first:first + BATCH_POINTS] @ block_vectors.T
+            chunk_owners = owners[first:first + BATCH_POINTS]
+            # Each event's points are contiguous; reduce every run to its maximum
+            starts = np.flatnonzero(np.r_[True, chunk_owners[1:] != chunk_owners[:-1]])
+            events = chunk_owners[starts]
+            closest[events] = np.maximum(closest[events], np.maximum.reduceat(dots, starts, axis=0))
+        for j, cos_limit in enumerate(cos_limits):
+            hits = closest >= cos_limit
+            counts = hits.sum(axis=1)
+            for e, stats in enumerate(categories):
+                if counts[e]:
+                    stats[1][j] += counts[e]
+                    stats[2][j, block] |= hits[e]
+
+def run_backtest(alumni_df, events, thresholds=DEFAULT_THRESHOLDS):
+    """Count alerts and affected alumni per month, category and threshold.
+
+    ``events`` is an iterable in time order (see ``stream_archived_events``);
+    only the current month's alumni masks are held in memory. Distances are
+    great-circle, compared as unit-vector dot products against
+    ``cos(threshold / R)``. Returns a DataFrame with ``RESULT_COLUMNS``.
+    """
+    thresholds = sorted(float(t) for t in thresholds)
+    cos_limits = np.cos(np.minimum(np.array(thresholds) / EARTH_RADIUS_KM, np.pi)).astype(np.float32)
+
+    lat, lon, valid = roster_coordinates(alumni_df)
+    vectors = np.ascontiguousarray(roster_vectors(alumni_df, lat, lon)[valid])
+
+    rows = []
+    accumulator = None
+    batch, batch_points = [], 0
+    for event in events:
+        track = track_points(event)
+        if not track:
+            continue
+        month = event_time(event)[:7] or "unknown"
+        # Late arrivals from an already finished month count towards the current one
+        if accumulator is not None and month < accumulator.month:
+            month = accumulator.month
+
+        if accumulator is None or month != accumulator.month:
+            if batch:
+                _process_batch(vectors, batch, cos_limits, accumulator)
+                batch, batch_points = [], 0
+            if accumulator is not None:
+                rows.extend(accumulator.rows(thresholds))
+            accumulator = _MonthAccumulator(month, len(vectors), len(thresholds))
+
+        try:
+            category = str(event["categories"][0]["title"])
+        except (KeyError, IndexError, TypeError):
+            category = "Unknown"
+        batch.append((category, track))
+        batch_points += len(track)
+        if batch_points >= BATCH_POINTS:
+            _process_batch(vectors, batch, cos_limits, accumulator)
+            batch, batch_points = [], 0
+
+    if batch:
+        _process_batch(vectors, batch, cos_limits, accumulator)
+    if accumulator is not None:
+        rows.extend(accumulator.rows(thresholds))
+    return pd.DataFrame(rows, columns=RESULT_COLUMNS)
+
+def summarize_backtest(results):
+    """Return alerts per month and threshold, summed over categories."""
+    return results.pivot_table(index="month", columns="threshold_km", values="alerts",
+                               aggfunc="sum", fill_value=0)
+
+def parse_date(value):
+    """Parse a ``YYYY-MM-DD`` string (argparse type)."""
+    return date.fromisoformat(value)
@@ -0,0 +1,146 @@
+"""Bulk loading of alumni rosters through a staging table and atomic swap."""
+import csv
+import io
+import logging
+
+import pandas as pd
+from sqlalchemy import MetaData, inspect, text
+
+from .database import Alumni, get_engine
+from .spatial import add_spatial_keys
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Rows per executemany batch on databases without COPY support
+BATCH_SIZE = 5000
+
+# NULL marker used in the COPY stream
+COPY_NULL = "\\N"
+
+def _iter_frames(data):
+    """Yield DataFrames from a single frame or an iterable of chunks."""
+    if isinstance(data, pd.DataFrame):
+        yield data
+        return
+    for frame in data:
+        yield frame
+
+def _prepare_frame(frame, columns):
+    """Restrict a frame to the table columns and turn NaN into None."""
+    if "lat_bucket" in columns and "lat_bucket" not in frame.columns and "latitude" in frame.columns:
+        frame = add_spatial_keys(frame)
+    present = [c for c in columns if c in frame.columns]
+    frame = frame[present]
+    return present, frame.astype(object).where(frame.notna(), None)
+
+def _copy_frame(conn, table_name, columns, frame):
+    """Stream one frame into a PostgreSQL table with COPY."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in frame.itertuples(index=False, name=None):
+        writer.writerow(COPY_NULL if value is None else value for value in row)
+    buffer.seek(0)
+
+    column_list = ", ".join(columns)
+    cursor = conn.connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table_name} ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+            buffer
+        )
+    finally:
+        cursor.close()
+
+def _insert_frame(conn, table, frame, batch_size):
+    """Insert one frame with batched executemany calls."""
+    records = frame.to_dict("records")
+    for start in range(0, len(records), batch_size):
+        conn.execute(table.insert(), records[start:start + batch_size])
+
+def _rename_indexes(conn, target, staging):
+    """Give indexes created on the staging table their final names."""
+    insp = inspect(conn)
+    for index in insp.get_indexes(target):
+        name = index["name"]
+        if not name or staging not in name:
+            continue
+        new_name = name.replace(staging, target, 1)
+        if conn.dialect.name == "postgresql":
+            conn.execute(text(f"ALTER INDEX {name} RENAME TO {new_name}"))
+        else:
+            # SQLite has no ALTER INDEX, so rebuild it under the new name
+            unique = "UNIQUE " if index.get("unique") else ""
+            column_list = ", ".join(index["column_names"])
+            conn.execute(text(f"DROP INDEX {name}"))
+            conn.execute(text(f"CREATE {unique}INDEX {new_name} ON {target} ({column_list})"))
+
+    if conn.dialect.name == "postgresql":
+        pk_name = insp.get_pk_constraint(target).get("name")
+        if pk_name and staging in pk_name:
+            new_name = pk_name.replace(staging, target, 1)
+            conn.execute(text(f"ALTER TABLE {target} RENAME CONSTRAINT {pk_name} TO {new_name}"))
+
+def _swap_tables(conn, target, staging):
+    """Replace the live table with the staging table in one transaction."""
+    old = f"{target}_old"
+    if conn.dialect.name == "sqlite":
+        # pysqlite does not open a transaction for DDL on its own
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+    has_target = inspect(conn).has_table(target)
+    if has_target:
+        conn.execute(text(f"ALTER TABLE {target} RENAME TO {old}"))
+    conn.execute(text(f"ALTER TABLE {staging} RENAME TO {target}"))
+    if has_target:
+        conn.execute(text(f"DROP TABLE {old}"))
+    _rename_indexes(conn, target, staging)
+
+def bulk_load_table(table, data, engine=None, batch_size=BATCH_SIZE):
+    """Load rows into a fresh copy of ``table`` and swap it into place.
+
+    ``data`` is a DataFrame or an iterable of DataFrame chunks. Readers keep
+    seeing the previous contents until the swap commits.
+    """
+    engine = engine or get_engine()
+    if engine is None:
+        raise RuntimeError("No database engine available for bulk load")
+
+    staging_name = f"{table.name}_staging"
+    staging = table.to_metadata(MetaData(), name=staging_name)
+    # Explicitly named indexes must not clash with the live table's indexes
+    for index in staging.indexes:
+        if staging_name not in index.name:
+            index.name = index.name.replace(table.name, staging_name, 1)
+    table_columns = [column.name for column in table.columns]
+    use_copy = engine.dialect.name == "postgresql"
+
+    staging.drop(engine, checkfirst=True)
+    staging.create(engine)
+
+    total = 0
+    try:
+        with engine.begin() as conn:
+            for chunk in _iter_frames(data):
+                if chunk.empty:
+                    continue
+                columns, frame = _prepare_frame(chunk, table_columns)
+                if use_copy:
+                    _copy_frame(conn, staging_name, columns, frame)
+                else:
+                    _insert_frame(conn, staging, frame, batch_size)
+                total += len(frame)
+                logger.info(f"Staged {total} rows into {staging_name}")
+
+        with engine.begin() as conn:
+            _swap_tables(conn, table.name, staging_name)
+    except Exception:
+        staging.drop(engine, checkfirst=True)
+        raise
+
+    logger.info(f"Swapped {total} rows into {table.name}")
+    return total
+
+def bulk_load_alumni(data, engine=None, batch_size=BATCH_SIZE):
+    """Replace the alumni roster with ``data`` using a staged bulk load."""
+    return bulk_load_table(Alumni.__table__, data, engine=engine, batch_size=batch_size)
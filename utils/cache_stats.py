@@ -0,0 +1,49 @@
+"""Hit/miss counters for Streamlit-cached loaders."""
+import functools
+import threading
+
+_lock = threading.Lock()
+_counts = {}
+
+def record(name, field):
+    """Increment ``field`` ("calls" or "misses") for the cache ``name``."""
+    with _lock:
+        counts = _counts.setdefault(name, {"calls": 0, "misses": 0})
+        counts[field] += 1
+
+def counted(name, cache):
+    """Wrap ``cache`` (e.g. ``st.cache_data(ttl=3600)``) so calls and misses are counted.
+
+    The function body only runs on a cache miss, so counting there and
+    around the cached wrapper gives the hit ratio.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def body(*args, **kwargs):
+            record(name, "misses")
+            return func(*args, **kwargs)
+
+        cached_body = cache(body)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            record(name, "calls")
+            return cached_body(*args, **kwargs)
+
+        wrapper.clear = cached_body.clear
+        return wrapper
+    return decorate
+
+def cache_stats():
+    """Return ``{name: {"calls", "misses", "hits", "hit_ratio"}}`` for every counted cache."""
+    with _lock:
+        snapshot = {name: dict(counts) for name, counts in _counts.items()}
+    for counts in snapshot.values():
+        counts["hits"] = counts["calls"] - counts["misses"]
+        counts["hit_ratio"] = counts["hits"] / counts["calls"] if counts["calls"] else None
+    return snapshot
+
+def reset_cache_stats():
+    """Clear all counters."""
+    with _lock:
+        _counts.clear()
@@ -0,0 +1,67 @@
+"""Concurrent loading of the roster and event data for a page build."""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+def _script_run_ctx():
+    """Return the current Streamlit script context, if running inside one."""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return None
+    return get_script_run_ctx(suppress_warning=True)
+
+def _timed(ctx, func, *args):
+    """Run ``func`` in a worker thread and return ``(result, seconds)``."""
+    if ctx is not None:
+        # Lets st.* calls made by the loaders render into the calling session
+        import threading
+        from streamlit.runtime.scriptrunner import add_script_run_ctx
+        add_script_run_ctx(threading.current_thread(), ctx)
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def load_page_data(roster_loader, events_loader, roster_hooks=None):
+    """Load the roster and the events concurrently.
+
+    ``roster_loader`` returns ``(alumni_df, metadata)`` and ``events_loader``
+    returns the event list; both keep their own fallbacks. ``roster_hooks``
+    maps names to callables that take ``(alumni_df, metadata)`` and start as
+    soon as the roster arrives, overlapping with a still-running event fetch.
+
+    Returns ``(alumni_df, metadata, events, derived, timings)`` where
+    ``derived`` holds the hook results and ``timings`` the seconds per source.
+    """
+    roster_hooks = roster_hooks or {}
+    ctx = _script_run_ctx()
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=2 + len(roster_hooks)) as pool:
+        roster_future = pool.submit(_timed, ctx, roster_loader)
+        events_future = pool.submit(_timed, ctx, events_loader)
+
+        (alumni_df, metadata), roster_seconds = roster_future.result()
+        hook_futures = {}
+        if alumni_df is not None and not alumni_df.empty:
+            hook_futures = {
+                name: pool.submit(_timed, ctx, hook, alumni_df, metadata)
+                for name, hook in roster_hooks.items()
+            }
+
+        events, events_seconds = events_future.result()
+        timings = {"roster": roster_seconds, "events": events_seconds}
+
+        derived = {}
+        for name, future in hook_futures.items():
+            try:
+                derived[name], timings[name] = future.result()
+            except Exception as e:
+                logger.error(f"Precomputation {name} failed: {e}")
+
+    timings["total"] = time.perf_counter() - start
+    logger.info("Page data loaded: " + ", ".join(f"{k}={v:.2f}s" for k, v in timings.items()))
+    return alumni_df, metadata, events, derived, timings
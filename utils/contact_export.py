@@ -0,0 +1,159 @@
+"""Contact lists of alumni affected by alerts, streamed as CSV or XLSX.
+
+Emails and phone numbers live only in the roster CSV (``original_Email``
+and ``original_Phone`` in combo.csv); the loaded roster keeps just each
+alumnus's ``ID``. An export looks up the IDs it needs in one chunked pass
+over that file, then yields rows in batches, so the roster is never held
+twice and a CSV download starts with the first batch.
+"""
+import csv
+import importlib.util
+import io
+import logging
+import os
+import re
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from .alert_view import sort_alerts
+from .roster import CSV_PATHS
+from .roster_reader import read_roster_chunks
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+ID_COLUMN = 'original_ID'
+# Roster CSV column -> export column
+CONTACT_COLUMNS = {'original_Email': 'Email', 'original_Phone': 'Phone'}
+
+EXPORT_COLUMNS = ['Disaster', 'Type', 'Distance (km)', 'Alumni', 'Location', 'ID', 'Email', 'Phone']
+EXPORT_FORMATS = ("csv", "xlsx")
+MIME_TYPES = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+# Alerts joined to names and contacts at a time
+BATCH_ROWS = 2000
+
+# Bytes per block when streaming a finished XLSX file
+FILE_BLOCK_SIZE = 256 * 1024
+
+def format_available(fmt):
+    """Check that the optional package ``fmt`` needs (openpyxl for XLSX) is installed."""
+    return fmt != "xlsx" or importlib.util.find_spec("openpyxl") is not None
+
+def _id_strings(values):
+    """IDs as strings, with missing ones as ''."""
+    return pd.Series(values, dtype=object).fillna('').astype(str).tolist()
+
+def contacts_path(roster_csv=None):
+    """The CSV holding contact columns.
+
+    ``CONTACTS_CSV`` wins, then the roster's own file (``roster_csv`` or
+    ``ROSTER_CSV``), then the first default roster CSV that exists.
+    """
+    for path in [os.environ.get("CONTACTS_CSV"), roster_csv, os.environ.get("ROSTER_CSV")] + CSV_PATHS:
+        if path and os.path.exists(path):
+            return path
+    return None
+
+def lookup_contacts(ids, path=None):
+    """Return ``{id: (email, phone)}`` for the wanted IDs, reading only the ID and contact columns."""
+    path = path or contacts_path()
+    wanted = set(ids) - {''}
+    if path is None or not wanted:
+        return {}
+
+    columns = {ID_COLUMN, *CONTACT_COLUMNS}
+    contacts = {}
+    for chunk in read_roster_chunks(path, usecols=lambda column: column in columns):
+        if ID_COLUMN not in chunk.columns:
+            logger.warning(f"{path} has no {ID_COLUMN} column; exporting without contacts")
+            return {}
+        chunk = chunk[chunk[ID_COLUMN].isin(wanted)]
+        values = [chunk[column].fillna('').astype(str) if column in chunk.columns else [''] * len(chunk)
+                  for column in CONTACT_COLUMNS]
+        contacts.update(zip(chunk[ID_COLUMN], zip(*values)))
+    return contacts
+
+def contact_rows(alerts, path=None, batch_rows=BATCH_ROWS):
+    """Yield one tuple per alert in ``EXPORT_COLUMNS`` order, joined a batch at a time.
+
+    ``alerts`` is an ``AlertResult``; rosters without an ``ID`` column
+    export blank contact fields.
+    """
+    alumni_df = alerts.alumni_df
+    if alumni_df is not None and 'ID' in alumni_df.columns:
+        ids = alumni_df['ID'].to_numpy()
+    else:
+        ids = np.full(0 if alumni_df is None else len(alumni_df), None, dtype=object)
+    contacts = lookup_contacts(_id_strings(ids[alerts.rows]), path)
+    blank = ('',) * len(CONTACT_COLUMNS)
+
+    for start in range(0, len(alerts), batch_rows):
+        batch = alerts[start:start + batch_rows]
+        frame = batch.frame()
+        for alert, alumni_id in zip(frame.itertuples(index=False), _id_strings(ids[batch.rows])):
+            yield (alert.disaster_description, alert.disaster_type, alert.distance, alert.alumni_name,
+                   alert.location, alumni_id, *contacts.get(alumni_id, blank))
+
+def csv_chunks(rows, batch_rows=BATCH_ROWS):
+    """Encode rows (with a header) as UTF-8 CSV, yielding one bytes chunk per batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for count, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if count % batch_rows == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+def write_xlsx(rows, file):
+    """Write rows (with a header) to ``file`` as an XLSX workbook in openpyxl's write-only mode."""
+    try:
+        from openpyxl import Workbook
+    except ImportError as e:
+        raise ImportError("XLSX exports need the 'openpyxl' package (pip install openpyxl)") from e
+
+    # Write-only sheets spool rows to disk instead of keeping cell objects
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Contacts")
+    sheet.append(EXPORT_COLUMNS)
+    for row in rows:
+        sheet.append(row)
+    workbook.save(file)
+
+def xlsx_chunks(rows, block_size=FILE_BLOCK_SIZE):
+    """Build the workbook in a temporary file, then yield it in blocks.
+
+    An XLSX is a zip whose index is written last, so unlike CSV nothing
+    can be sent before the final row has been written.
+    """
+    with tempfile.TemporaryFile() as file:
+        write_xlsx(rows, file)
+        file.seek(0)
+        while True:
+            block = file.read(block_size)
+            if not block:
+                return
+            yield block
+
+def export_chunks(alerts, fmt="csv", path=None):
+    """Stream the contact export of ``alerts`` as bytes chunks in ``fmt`` ("csv" or "xlsx").
+
+    Rows are grouped by disaster, nearest alumni first within each.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format '{fmt}', expected one of {EXPORT_FORMATS}")
+    rows = contact_rows(sort_alerts(alerts, "Disaster"), path)
+    return csv_chunks(rows) if fmt == "csv" else xlsx_chunks(rows)
+
+def export_filename(fmt, event_title=None):
+    """A download name such as ``alumni-contacts-wildfire-xyz.csv``."""
+    label = re.sub(r'[^a-z0-9]+', '-', (event_title or "all-events").lower()).strip('-')[:60]
+    return f"alumni-contacts-{label or 'event'}.{fmt}"
@@ -1,14 +1,16 @@
 """Database connection and model definitions for the Alumni Disaster Monitor app."""
 import os
+import threading
+import time
 from contextlib import contextmanager
 import logging
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime
+from sqlalchemy import (create_engine, bindparam, inspect, make_url, select, text, Column, Integer, String, Float,
+                        DateTime, Index)
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-import streamlit as st
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Create Base class
@@ -24,6 +26,26 @@ class Alumni(Base):
     latitude = Column(Float, nullable=False)
     longitude = Column(Float, nullable=False)
     last_updated = Column(DateTime)
+    # Stable key from the source roster and content hashes for diff imports
+    source_id = Column(String, unique=True, index=True, nullable=True)
+    row_hash = Column(String(40), nullable=True)
+    address_hash = Column(String(40), nullable=True)
+    # Coarse grid cell used to prefilter proximity queries
+    lat_bucket = Column(Integer, nullable=True)
+    lon_bucket = Column(Integer, nullable=True)
+    # Region and cohort attributes for rollups
+    country = Column(String, nullable=True)
+    state = Column(String, nullable=True)
+    city = Column(String, nullable=True)
+    class_year = Column(String, nullable=True)
+
+    __table_args__ = (Index("ix_alumni_lat_lon_bucket", "lat_bucket", "lon_bucket"),)
+
+# Region and cohort columns, returned by the roster loaders for rollups
+ATTRIBUTE_COLUMNS = ("country", "state", "city", "class_year")
+
+# Nullable alumni columns added after tables were first deployed; see upgrade_alumni_table
+UPGRADE_COLUMNS = ("source_id", "row_hash", "address_hash", "lat_bucket", "lon_bucket") + ATTRIBUTE_COLUMNS
 
 class DisasterEvent(Base):
     """Disaster event database model."""
@@ -36,40 +58,132 @@ class DisasterEvent(Base):
     longitude = Column(Float, nullable=False)
     start_date = Column(DateTime)
     end_date = Column(DateTime, nullable=True)
+    lat_bucket = Column(Integer, nullable=True)
+    lon_bucket = Column(Integer, nullable=True)
+
+    __table_args__ = (Index("ix_disaster_events_lat_lon_bucket", "lat_bucket", "lon_bucket"),)
+
+# Pool sizing, overridable per deployment
+POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 5))
+MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", 10))
+POOL_TIMEOUT = int(os.environ.get("DB_POOL_TIMEOUT", 30))
+POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", 1800))
+CONNECT_TIMEOUT = int(os.environ.get("DB_CONNECT_TIMEOUT", 10))
 
 # Global variables
 engine = None
 SessionLocal = None
 
+# Process-wide engine registry keyed by connection string
+_engines = {}
+_engines_lock = threading.Lock()
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Checkouts run on many threads at once
+        self._wait_lock = threading.Lock()
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - start
+            with self._wait_lock:
+                self.wait_count += 1
+                self.wait_total += waited
+                self.wait_max = max(self.wait_max, waited)
+
+    def wait_stats(self):
+        """Return ``(count, total_seconds, max_seconds)`` of checkout waits."""
+        with self._wait_lock:
+            return self.wait_count, self.wait_total, self.wait_max
+
 # Database connection
 def get_connection_string():
     """Get database connection string with proper fallbacks."""
-    # Try Streamlit secrets first
-    try:
-        return st.secrets["postgres"]["url"]
-    except Exception as e:
-        logger.info(f"Streamlit secrets not available: {e}")
-    
-    # Try environment variable fallback
-    return os.environ.get("DATABASE_URL")
+    # Imported here so that importing this module has no side effects
+    from .secrets_handler import read_secret
+
+    # Try Streamlit secrets first, then environment variable fallbacks
+    return (read_secret("postgres", "url") or read_secret("DATABASE_URL")
+            or os.environ.get("DATABASE_URL") or os.environ.get("POSTGRES_URL"))
+
+def _create_pooled_engine(url):
+    """Create an engine with the shared pool settings for ``url``."""
+    if make_url(url).get_backend_name() == "sqlite":
+        return create_engine(url)
+    return create_engine(
+        url,
+        poolclass=TimedQueuePool,
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_timeout=POOL_TIMEOUT,
+        pool_pre_ping=True,
+        pool_recycle=POOL_RECYCLE,
+        connect_args={"connect_timeout": CONNECT_TIMEOUT}
+    )
 
-def get_engine():
-    """Lazy initialize database engine only when needed"""
+def get_engine(url=None):
+    """Return the process-wide engine for ``url`` (default: configured database).
+
+    Engines are created once per connection string and shared by every
+    caller, so connections come from one pool instead of a new TCP/TLS
+    handshake per action.
+    """
     global engine
-    if engine is None:
-        connection_string = get_connection_string()
-        if connection_string:
+    if url is None and engine is not None:
+        return engine
+
+    connection_string = url or get_connection_string()
+    if not connection_string:
+        return None
+
+    with _engines_lock:
+        shared = _engines.get(connection_string)
+        if shared is None:
             try:
-                engine = create_engine(
-                    connection_string,
-                    pool_pre_ping=True,
-                    pool_recycle=1800,
-                    connect_args={"connect_timeout": 10}
-                )
+                shared = _create_pooled_engine(connection_string)
+                _engines[connection_string] = shared
                 logger.info("Database engine initialized")
             except Exception as e:
                 logger.error(f"Database engine initialization error: {e}")
-    return engine
+                return None
+        if url is None:
+            engine = shared
+    return shared
+
+def pool_stats():
+    """Return connection pool statistics for every registered engine."""
+    stats = {}
+    for shared in list(_engines.values()):
+        pool = shared.pool
+        entry = {"pool": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            entry.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                # Negative until every pooled connection has been opened
+                "overflow": max(pool.overflow(), 0),
+                # Each pool's own limit; SQLite engines keep SQLAlchemy's default, not MAX_OVERFLOW
+                "max_overflow": getattr(pool, "_max_overflow", None),
+            })
+        if isinstance(pool, TimedQueuePool):
+            wait_count, wait_total, wait_max = pool.wait_stats()
+            entry.update({
+                "checkouts": wait_count,
+                "avg_wait_ms": round(1000 * wait_total / wait_count, 2) if wait_count else 0.0,
+                "max_wait_ms": round(1000 * wait_max, 2)
+            })
+        stats[shared.url.render_as_string(hide_password=True)] = entry
+    return stats
 
 def get_session_maker():
     """Get session maker with lazy initialization"""
@@ -81,9 +195,10 @@ def get_session_maker():
     return SessionLocal
 
 @contextmanager
-def get_db_session():
-    """Context manager for database sessions."""
-    session_maker = get_session_maker()
+def get_db_session(engine=None):
+    """Context manager for database sessions, on ``engine`` or the configured database."""
+    session_maker = sessionmaker(autocommit=False, autoflush=False, bind=engine) if engine is not None \
+        else get_session_maker()
     if session_maker is None:
         logger.warning("No session maker available")
         yield None
@@ -100,11 +215,64 @@ def get_db_session():
     finally:
         session.close()
 
+def _backfill_buckets(conn, table):
+    """Fill ``lat_bucket``/``lon_bucket`` of rows stored before the bucket columns existed."""
+    from .spatial import spatial_keys
+
+    rows = conn.execute(
+        select(table.c.id, table.c.latitude, table.c.longitude).where(table.c.lat_bucket.is_(None))
+    ).all()
+    if not rows:
+        return
+    lat_bucket, lon_bucket = spatial_keys([row.latitude for row in rows], [row.longitude for row in rows])
+    update = table.update().where(table.c.id == bindparam("b_id"))
+    conn.execute(update, [
+        {"b_id": row.id, "lat_bucket": int(lat), "lon_bucket": int(lon)}
+        for row, lat, lon in zip(rows, lat_bucket, lon_bucket)
+    ])
+
+def upgrade_alumni_table(engine=None):
+    """Bring an existing alumni table up to the model; returns the names of added columns.
+
+    Adds the missing ``UPGRADE_COLUMNS`` and indexes and fills the bucket
+    columns of existing rows. Hashes stay empty until the next import,
+    which then runs as a full load (see ``roster_sync``).
+    """
+    engine = engine or get_engine()
+    if engine is None:
+        return []
+    insp = inspect(engine)
+    if not insp.has_table(Alumni.__tablename__):
+        return []
+    table = Alumni.__table__
+    existing = {column["name"] for column in insp.get_columns(table.name)}
+    indexes = {index["name"] for index in insp.get_indexes(table.name)}
+    added = [name for name in UPGRADE_COLUMNS if name not in existing]
+    missing_indexes = [index for index in table.indexes if index.name not in indexes]
+    if not added and not missing_indexes:
+        return []
+
+    with engine.begin() as conn:
+        for name in added:
+            column_type = table.c[name].type.compile(dialect=engine.dialect)
+            conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {name} {column_type}"))
+        if "lat_bucket" in added:
+            _backfill_buckets(conn, table)
+        for index in missing_indexes:
+            index.create(conn, checkfirst=True)
+    logger.info(f"Upgraded {table.name}: added columns {added}, "
+                f"indexes {[index.name for index in missing_indexes]}")
+    return added
+
 def init_database():
     """Initialize database tables."""
     engine = get_engine()
     if engine is not None:
         Base.metadata.create_all(bind=engine)
+        upgrade_alumni_table(engine)
+        # PostGIS servers also get a geography index for alumni_within_radius
+        from .spatial import ensure_spatial_index
+        ensure_spatial_index(engine)
         return True
     return False
 
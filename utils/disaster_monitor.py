@@ -1,60 +1,36 @@
-import requests
-from datetime import datetime, timedelta
-import time
-from sqlalchemy.orm import Session
 from . import database as db
-from .database import DisasterEvent
+from .cache_stats import counted
+from .disk_cache import cached_call, file_version
+from .events import filter_disasters_by_type, load_events_file
+from .feeds import configured_feeds, fetch_hazard_events
+from .secrets_handler import get_nasa_api_key
 import streamlit as st
-from sqlalchemy import create_engine
 import logging
+import os
 
 # Set up logging at the top of your file
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Access secrets
-if "DATABASE_URL" in st.secrets:
-    db_url = st.secrets["DATABASE_URL"]
-else:
-    db_url = None  # Fallback for local development
+# Seconds an event snapshot stays cached, in memory and on disk
+EVENTS_TTL = 3600
 
 # Optimize caching for better performance
-@st.cache_data(ttl=3600, show_spinner=False)  # Cache for 1 hour
+@counted("fetch_eonet_data", st.cache_data(ttl=EVENTS_TTL, show_spinner=False))
 def fetch_eonet_data():
-    """Fetch natural disaster data from NASA's EONET API with optimized caching."""
+    """Fetch natural disaster data from the hazard feeds with optimized caching.
+
+    The feeds are EONET unless ``HAZARD_FEEDS`` adds more (see ``feeds``).
+    ``EONET_EVENTS_FILE`` replays a saved event file instead of calling them.
+    With ``DISK_CACHE_DIR`` set, one process per host calls the feeds per hour.
+    """
     try:
-        # Correctly access secrets
-        api_key = None
-        
-        # Try to get from secrets in different ways
-        if "nasa" in st.secrets:
-            # If you have a nested structure like [nasa] api_key = "value"
-            api_key = st.secrets["nasa"]["api_key"] 
-        elif "NASA_API_KEY" in st.secrets:
-            # If you have a flat structure like NASA_API_KEY = "value"
-            api_key = st.secrets["NASA_API_KEY"]
-            
-        base_url = "https://eonet.gsfc.nasa.gov/api/v3/events"
-        
-        # Optimize query parameters
-        params = {
-            "status": "open",
-            "days": 3,
-            "limit": 25,
-            "api_key": api_key
-        }
-        
-        # Send request
-        response = requests.get(base_url, params=params)
-        
-        # Check status and parse JSON properly
-        response.raise_for_status()  # Raise exception for bad status codes
-        data = response.json()  # Parse JSON
-        
-        # Access events (ensure it's a list)
-        events = data.get("events", []) if isinstance(data, dict) else []
-        
-        return events
+        events_file = os.environ.get("EONET_EVENTS_FILE")
+        if events_file:
+            return cached_call("events", (file_version(events_file),), lambda: load_events_file(events_file))
+        feeds = configured_feeds(get_nasa_api_key())
+        # Endpoints are part of the key, so pointing EONET_URL/USGS_FEED_URL elsewhere refetches
+        return cached_call("events", tuple((feed.name, feed.url) for feed in feeds),
+                           lambda: fetch_hazard_events(feeds), ttl=EVENTS_TTL)
         
     except Exception as e:
         st.error(f"Error in fetch_eonet_data: {str(e)}")
@@ -63,40 +39,10 @@ def fetch_eonet_data():
         st.error(f"Traceback: {traceback.format_exc()}")
         return []
 
-def filter_disasters_by_type(disaster_data, selected_types):
-    """Filter disasters based on selected types with optimized matching."""
-    # Replace st.write with logger.debug
-    logger.debug(f"Disaster data type: {type(disaster_data)}")
-    
-    if isinstance(disaster_data, list) and len(disaster_data) > 0:
-        logger.debug(f"First item type: {type(disaster_data[0])}")
-
-    if not disaster_data or not selected_types:
-        return []
-
-    # Pre-computed type sets for faster lookup
-    type_sets = {
-        "Wildfires": {"wildfires", "fire"},
-        "Severe Storms": {"severestorms", "severe-storms", "storms"},
-        "Volcanoes": {"volcanoes", "volcano"},
-        "Earthquakes": {"earthquakes", "earthquake"}
-    }
-
-    # Create single set of terms for faster matching
-    selected_terms = set().union(*(type_sets[t] for t in selected_types if t in type_sets))
-
-    # Use generator expression for memory efficiency
-    return [d for d in disaster_data 
-            if d['categories'][0]['id'].lower().split('-')[0] in selected_terms]
-
 # Modified database connection code
 def get_db_connection():
-    try:
-        if "DATABASE_URL" in st.secrets:
-            return create_engine(st.secrets["DATABASE_URL"])
-        else:
-            st.warning("No database configuration found")
-            return None
-    except Exception as e:
-        st.error(f"Failed to connect to database: {str(e)}")
-        return None
\ No newline at end of file
+    """Return the shared pooled database engine."""
+    engine = db.get_engine()
+    if engine is None:
+        st.warning("No database configuration found")
+    return engine
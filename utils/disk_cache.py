@@ -0,0 +1,202 @@
+"""File-backed cache shared by every app process on a host.
+
+Entries are pickles written atomically (temp file + rename) under keys
+hashed from a namespace, caller-supplied version parts and
+``FORMAT_VERSION``. The directory is kept under a size limit by evicting
+least recently used entries. A striped file lock lets one process compute
+a missing entry while the others wait and then read it. Entries are
+unpickled, so only point ``DISK_CACHE_DIR`` at a directory this app owns.
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: writes stay atomic but two processes may compute the same entry
+    fcntl = None
+
+from .cache_stats import record
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of cached values changes so older entries are ignored
+FORMAT_VERSION = 3
+
+DEFAULT_MAX_MB = 512
+
+# Lock files shared by all keys, so the lock directory never grows
+LOCK_STRIPES = 64
+
+# Temp files older than this are leftovers of crashed writers
+STALE_TEMP_SECONDS = 3600
+
+SUFFIX = ".pkl"
+
+def roster_version(alumni_df):
+    """Content hash of the roster's identity and coordinate columns."""
+    columns = [c for c in ['Name', 'Location', 'Latitude', 'Longitude', 'Has_Valid_Coords']
+               if c in alumni_df.columns]
+    data = pd.util.hash_pandas_object(alumni_df[columns], index=False).to_numpy().tobytes()
+    return hashlib.sha1(data).hexdigest()[:16]
+
+def events_version(events):
+    """Content hash of an event list; unchanged when a refresh returns the same events."""
+    data = json.dumps(events, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha1(data).hexdigest()[:16]
+
+def file_version(path):
+    """``(path, size, mtime)`` of a file, so editing it changes the cache key."""
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_size, stat.st_mtime_ns
+
+class DiskCache:
+    """Size-bounded LRU cache of pickled values in ``directory``."""
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.join(directory, "locks"), exist_ok=True)
+
+    def _key(self, namespace, parts):
+        digest = hashlib.sha1(repr((FORMAT_VERSION, namespace, parts)).encode("utf-8")).hexdigest()
+        return f"{namespace}-{digest[:24]}"
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def get(self, namespace, parts, ttl=None):
+        """Return ``(True, value)`` for an entry younger than ``ttl`` seconds, else ``(False, None)``."""
+        path = self._path(self._key(namespace, parts))
+        try:
+            with open(path, "rb") as file:
+                created, value = pickle.load(file)
+        except FileNotFoundError:
+            return False, None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cache entry {path}: {e}")
+            self._remove(path)
+            return False, None
+        if ttl is not None and time.time() - created > ttl:
+            return False, None
+        try:
+            # The modification time doubles as the LRU clock
+            os.utime(path)
+        except OSError:
+            pass
+        return True, value
+
+    def set(self, namespace, parts, value):
+        """Store ``value`` atomically, then evict down to ``max_bytes``."""
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                pickle.dump((time.time(), value), file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self._path(self._key(namespace, parts)))
+        except BaseException:
+            self._remove(temp_path)
+            raise
+        self.evict()
+
+    @contextmanager
+    def lock(self, key):
+        """Hold the cross-process lock stripe for ``key``."""
+        if fcntl is None:
+            yield
+            return
+        stripe = int(hashlib.sha1(key.encode("utf-8")).hexdigest(), 16) % LOCK_STRIPES
+        with open(os.path.join(self.directory, "locks", f"{stripe:02d}.lock"), "a+b") as file:
+            fcntl.flock(file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(file, fcntl.LOCK_UN)
+
+    def get_or_compute(self, namespace, parts, compute, ttl=None, cache_if=None):
+        """Return the cached value or ``compute()`` it once per host.
+
+        Values failing ``cache_if`` (e.g. an empty fallback result) are
+        returned but not stored. Errors writing the entry are logged, not raised.
+        """
+        record("disk_cache", "calls")
+        hit, value = self.get(namespace, parts, ttl)
+        if hit:
+            return value
+
+        with self.lock(self._key(namespace, parts)):
+            # Another process may have stored the entry while this one waited
+            hit, value = self.get(namespace, parts, ttl)
+            if hit:
+                return value
+            record("disk_cache", "misses")
+            value = compute()
+            if cache_if is None or cache_if(value):
+                try:
+                    self.set(namespace, parts, value)
+                except (OSError, pickle.PicklingError) as e:
+                    logger.warning(f"Could not write cache entry for {namespace}: {e}")
+        return value
+
+    def evict(self):
+        """Delete least recently used entries until the directory fits in ``max_bytes``."""
+        entries, total = [], 0
+        now = time.time()
+        for entry in os.scandir(self.directory):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            if entry.name.endswith(".tmp") and now - stat.st_mtime > STALE_TEMP_SECONDS:
+                self._remove(entry.path)
+            elif entry.name.endswith(SUFFIX):
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def clear(self, namespace=None):
+        """Delete every entry, or only those of ``namespace``."""
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(SUFFIX) and (namespace is None or entry.name.startswith(f"{namespace}-")):
+                self._remove(entry.path)
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_disk_cache():
+    """Return the shared cache in ``DISK_CACHE_DIR`` (bounded by ``DISK_CACHE_MAX_MB``), or None if unset."""
+    global _cache
+    directory = os.environ.get("DISK_CACHE_DIR")
+    if not directory:
+        return None
+    with _cache_lock:
+        if _cache is None or _cache.directory != directory:
+            max_mb = float(os.environ.get("DISK_CACHE_MAX_MB", DEFAULT_MAX_MB))
+            _cache = DiskCache(directory, int(max_mb * 1024 * 1024))
+    return _cache
+
+def cached_call(namespace, parts, compute, ttl=None, cache_if=None):
+    """``compute()`` through the shared disk cache, or directly when it is disabled."""
+    cache = get_disk_cache()
+    if cache is None:
+        return compute()
+    return cache.get_or_compute(namespace, parts, compute, ttl=ttl, cache_if=cache_if)
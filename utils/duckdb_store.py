@@ -0,0 +1,237 @@
+"""Embedded DuckDB backend for roster loads, event filters, proximity joins and rollups.
+
+Optional: needs ``pip install duckdb``. The file defaults to ``DUCKDB_PATH``
+or ``data/alumni.duckdb``.
+"""
+import json
+import logging
+import math
+import os
+
+import pandas as pd
+
+from .events import DISASTER_TYPES, TYPE_SETS
+from .rollups import categorize
+from .roster_reader import detect_encoding, has_banner_row
+from .spatial import EARTH_RADIUS_KM
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = "data/alumni.duckdb"
+
+ALERT_COLUMNS = ['alumni_name', 'location', 'disaster_type', 'disaster_description', 'distance']
+
+# Unit vectors and buckets are derived in SQL so joins never redo trigonometry
+_UNIT_VECTOR_SQL = """
+    cos(radians(latitude)) * cos(radians(longitude)) AS ux,
+    cos(radians(latitude)) * sin(radians(longitude)) AS uy,
+    sin(radians(latitude)) AS uz
+"""
+
+def get_path():
+    """Return the DuckDB file path from ``DUCKDB_PATH`` or the default."""
+    return os.environ.get("DUCKDB_PATH", DEFAULT_PATH)
+
+def connect(path=None, read_only=False):
+    """Open the DuckDB file; raises ImportError with install advice if DuckDB is missing."""
+    try:
+        import duckdb
+    except ImportError as e:
+        raise ImportError("The DuckDB backend needs the 'duckdb' package (pip install duckdb)") from e
+
+    path = path or get_path()
+    if not read_only and os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    return duckdb.connect(path, read_only=read_only)
+
+def _create_alumni(conn, select_sql, params):
+    conn.execute(f"""
+        CREATE OR REPLACE TABLE alumni AS
+        SELECT *, {_UNIT_VECTOR_SQL}
+        FROM ({select_sql})
+    """, params)
+
+def ingest_roster_csv(csv_path, path=None):
+    """Load a roster CSV into the ``alumni`` table, replacing its contents.
+
+    UTF-8 ``combo.csv`` files are parsed by DuckDB's own CSV reader; other
+    encodings and layouts go through the shared chunked reader. Returns the row count.
+    """
+    from .roster import _clean_csv_chunk
+    from .roster_reader import read_roster_chunks
+
+    encoding = detect_encoding(csv_path)
+    with connect(path) as conn:
+        header = pd.read_csv(csv_path, encoding=encoding, nrows=0,
+                             skiprows=1 if has_banner_row(csv_path, encoding) else 0).columns
+        if encoding.lower().replace("-", "") == "utf8" and {"lat", "lon"}.issubset(header):
+            _create_alumni(conn, """
+                SELECT
+                    "original_ID" AS source_id,
+                    trim(coalesce("original_First Name", '') || ' ' || coalesce("original_Prim_Last", '')) AS name,
+                    concat_ws(' ', "original_City", "original_State", "original_Country") AS location,
+                    upper(coalesce(country_code, "original_Country")) AS country,
+                    coalesce(state, "original_State") AS state,
+                    coalesce(city, "original_City") AS city,
+                    "original_Pref Class Yr" AS class_year,
+                    coalesce(TRY_CAST(lat AS DOUBLE), 0.0) AS latitude,
+                    coalesce(TRY_CAST(lon AS DOUBLE), 0.0) AS longitude,
+                    coalesce(TRY_CAST(lat AS DOUBLE), 0.0) != 0
+                        AND coalesce(TRY_CAST(lon AS DOUBLE), 0.0) != 0 AS has_valid_coords
+                FROM read_csv(?, header = true, all_varchar = true, skip = ?)
+            """, [csv_path, 1 if has_banner_row(csv_path, encoding) else 0])
+        else:
+            frames = [_clean_csv_chunk(chunk) for chunk in read_roster_chunks(csv_path, encoding=encoding)]
+            roster = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+                columns=['Name', 'Location', 'Latitude', 'Longitude', 'Has_Valid_Coords'])
+            for column in ("ID", "Country", "State", "City", "Class_Year"):
+                if column not in roster.columns:
+                    roster[column] = None
+            conn.register("roster_frame", roster)
+            _create_alumni(conn, """
+                SELECT
+                    CAST("ID" AS VARCHAR) AS source_id,
+                    CAST("Name" AS VARCHAR) AS name,
+                    CAST("Location" AS VARCHAR) AS location,
+                    nullif(CAST("Country" AS VARCHAR), '') AS country,
+                    nullif(CAST("State" AS VARCHAR), '') AS state,
+                    nullif(CAST("City" AS VARCHAR), '') AS city,
+                    nullif(CAST("Class_Year" AS VARCHAR), '') AS class_year,
+                    coalesce(TRY_CAST("Latitude" AS DOUBLE), 0.0) AS latitude,
+                    coalesce(TRY_CAST("Longitude" AS DOUBLE), 0.0) AS longitude,
+                    coalesce(CAST("Has_Valid_Coords" AS BOOLEAN), false) AS has_valid_coords
+                FROM roster_frame
+            """, [])
+            conn.unregister("roster_frame")
+        count = conn.execute("SELECT count(*) FROM alumni").fetchone()[0]
+    logger.info(f"Ingested {count} alumni from {csv_path} into DuckDB")
+    return count
+
+def save_events(events, path=None):
+    """Upsert EONET events (first geometry point) into the ``events`` table."""
+    rows = []
+    for event in events:
+        try:
+            geometry = event["geometry"][0]
+            rows.append({
+                "eonet_id": str(event["id"]),
+                "title": str(event["title"]),
+                "category_id": str(event["categories"][0]["id"]),
+                "disaster_type": str(event["categories"][0]["title"]),
+                "latitude": float(geometry["coordinates"][1]),
+                "longitude": float(geometry["coordinates"][0]),
+                "start_date": geometry.get("date"),
+                "end_date": event.get("closed"),
+                "raw": json.dumps(event),
+            })
+        except (KeyError, IndexError, ValueError, TypeError):
+            continue
+    if not rows:
+        return 0
+
+    with connect(path) as conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS events (
+                eonet_id VARCHAR PRIMARY KEY, title VARCHAR, category_id VARCHAR,
+                disaster_type VARCHAR, latitude DOUBLE, longitude DOUBLE,
+                start_date TIMESTAMPTZ, end_date TIMESTAMPTZ, raw VARCHAR,
+                ux DOUBLE, uy DOUBLE, uz DOUBLE
+            )
+        """)
+        conn.register("event_frame", pd.DataFrame(rows))
+        conn.execute(f"""
+            INSERT OR REPLACE INTO events
+            SELECT eonet_id, title, category_id, disaster_type, latitude, longitude,
+                   TRY_CAST(start_date AS TIMESTAMPTZ), TRY_CAST(end_date AS TIMESTAMPTZ), raw,
+                   {_UNIT_VECTOR_SQL}
+            FROM event_frame
+        """)
+        conn.unregister("event_frame")
+    return len(rows)
+
+def load_roster_duckdb(path=None):
+    """Load the roster in the app's frame layout; returns ``(df, metadata)`` or ``(None, None)``."""
+    try:
+        with connect(path, read_only=True) as conn:
+            df = conn.execute("""
+                SELECT source_id AS "ID", name AS "Name", location AS "Location",
+                       latitude AS "Latitude", longitude AS "Longitude",
+                       has_valid_coords AS "Has_Valid_Coords",
+                       country AS "Country", state AS "State", city AS "City", class_year AS "Class_Year",
+                       CAST(ux AS FLOAT) AS "UX", CAST(uy AS FLOAT) AS "UY", CAST(uz AS FLOAT) AS "UZ"
+                FROM alumni
+                ORDER BY rowid
+            """).df()
+    except Exception as e:
+        logger.error(f"DuckDB loading error: {e}")
+        return None, None
+
+    if df.empty:
+        logger.warning("No records found in DuckDB")
+        return None, None
+    df = categorize(df)
+    invalid_coords = int((~df["Has_Valid_Coords"]).sum())
+    logger.info(f"Loaded {len(df)} records from DuckDB")
+    return df, {"total_records": len(df), "invalid_coords": invalid_coords, "source": "duckdb"}
+
+def _event_filters(types, start, end, alias="e"):
+    """Build the WHERE clause and parameters for type and time filters."""
+    clauses, params = [], []
+    if types is not None:
+        terms = sorted(set().union(*(TYPE_SETS[t] for t in types if t in TYPE_SETS)))
+        if not terms:
+            return "false", []
+        clauses.append(f"lower(split_part({alias}.category_id, '-', 1)) IN "
+                       f"({', '.join('?' for _ in terms)})")
+        params.extend(terms)
+    if start is not None:
+        clauses.append(f"{alias}.start_date >= ?")
+        params.append(pd.Timestamp(start, tz="UTC").to_pydatetime())
+    if end is not None:
+        clauses.append(f"{alias}.start_date <= ?")
+        params.append(pd.Timestamp(end, tz="UTC").to_pydatetime())
+    return " AND ".join(clauses) or "true", params
+
+def query_events(types=None, start=None, end=None, path=None):
+    """Return stored EONET events matching the type and time filters, oldest first."""
+    where, params = _event_filters(types, start, end)
+    with connect(path, read_only=True) as conn:
+        rows = conn.execute(f"SELECT raw FROM events e WHERE {where} ORDER BY start_date", params).fetchall()
+    return [json.loads(raw) for (raw,) in rows]
+
+def proximity_alerts(threshold_km, types=None, start=None, end=None, path=None):
+    """Join alumni to stored events within ``threshold_km`` as one vectorized SQL query.
+
+    Pairs are prefiltered on the unit-vector dot product and measured as
+    great-circle kilometres. Returns a DataFrame with ``ALERT_COLUMNS``, nearest first.
+    """
+    where, params = _event_filters(types or DISASTER_TYPES, start, end)
+    cos_limit = math.cos(min(float(threshold_km) / EARTH_RADIUS_KM, math.pi))
+    with connect(path, read_only=True) as conn:
+        return conn.execute(f"""
+            SELECT a.name AS alumni_name, a.location AS location,
+                   e.disaster_type AS disaster_type, e.title AS disaster_description,
+                   round({EARTH_RADIUS_KM} * acos(least(1.0, a.ux * e.ux + a.uy * e.uy + a.uz * e.uz)), 1)
+                       AS distance
+            FROM alumni a JOIN events e
+              ON a.ux * e.ux + a.uy * e.uy + a.uz * e.uz >= ?
+            WHERE a.has_valid_coords AND {where}
+            ORDER BY distance, a.rowid
+        """, [cos_limit] + params).df()
+
+def regional_rollup(threshold_km, types=None, start=None, end=None, path=None):
+    """Count alerts and distinct affected alumni per country and disaster type."""
+    where, params = _event_filters(types or DISASTER_TYPES, start, end)
+    cos_limit = math.cos(min(float(threshold_km) / EARTH_RADIUS_KM, math.pi))
+    with connect(path, read_only=True) as conn:
+        return conn.execute(f"""
+            SELECT coalesce(a.country, 'Unknown') AS country, e.disaster_type,
+                   count(*) AS alerts, count(DISTINCT a.rowid) AS affected_alumni,
+                   count(DISTINCT e.eonet_id) AS events
+            FROM alumni a JOIN events e
+              ON a.ux * e.ux + a.uy * e.uy + a.uz * e.uz >= ?
+            WHERE a.has_valid_coords AND {where}
+            GROUP BY ALL
+            ORDER BY alerts DESC
+        """, [cos_limit] + params).df()
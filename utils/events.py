@@ -0,0 +1,81 @@
+"""EONET event fetching, replay and type filtering without Streamlit."""
+import json
+import logging
+
+import requests
+
+from . import metrics
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+EONET_URL = "https://eonet.gsfc.nasa.gov/api/v3/events"
+
+# Seconds to wait for the EONET API
+REQUEST_TIMEOUT = 30
+
+# Disaster types offered in the UI and accepted by the batch job
+DISASTER_TYPES = ["Wildfires", "Severe Storms", "Volcanoes", "Earthquakes"]
+
+# Pre-computed type sets for faster lookup
+TYPE_SETS = {
+    "Wildfires": {"wildfires", "fire"},
+    "Severe Storms": {"severestorms", "severe-storms", "storms"},
+    "Volcanoes": {"volcanoes", "volcano"},
+    "Earthquakes": {"earthquakes", "earthquake"}
+}
+
+def fetch_eonet_events(api_key=None, status="open", days=3, limit=25, url=EONET_URL, **extra_params):
+    """Fetch events from NASA's EONET API (or a mirror at ``url``); raises on HTTP or network errors.
+
+    Parameters set to ``None`` are left out of the request.
+    """
+    params = {
+        "status": status,
+        "days": days,
+        "limit": limit,
+        "api_key": api_key,
+        **extra_params
+    }
+    with metrics.span("eonet_fetch", source="eonet"):
+        response = requests.get(url, params=params, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        data = response.json()
+
+    # Access events (ensure it's a list)
+    events = data.get("events", []) if isinstance(data, dict) else []
+    metrics.increment("events_fetched", len(events), source="eonet")
+    return events
+
+def load_events_file(path):
+    """Replay events previously saved with ``save_events_file``."""
+    with metrics.span("eonet_fetch", source="replay"), open(path, encoding="utf-8") as file:
+        data = json.load(file)
+    events = data.get("events", []) if isinstance(data, dict) else data
+    metrics.increment("events_fetched", len(events), source="replay")
+    return events
+
+def save_events_file(events, path):
+    """Record fetched events as an EONET-shaped JSON document."""
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"events": events}, file)
+    return path
+
+def filter_disasters_by_type(disaster_data, selected_types):
+    """Filter disasters based on selected types with optimized matching."""
+    # Replace st.write with logger.debug
+    logger.debug(f"Disaster data type: {type(disaster_data)}")
+
+    if isinstance(disaster_data, list) and len(disaster_data) > 0:
+        logger.debug(f"First item type: {type(disaster_data[0])}")
+
+    if not disaster_data or not selected_types:
+        return []
+
+    # Create single set of terms for faster matching
+    selected_terms = set().union(*(TYPE_SETS[t] for t in selected_types if t in TYPE_SETS))
+
+    # Use generator expression for memory efficiency
+    with metrics.span("type_filter"):
+        return [d for d in disaster_data
+                if d['categories'][0]['id'].lower().split('-')[0] in selected_terms]
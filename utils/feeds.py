@@ -0,0 +1,253 @@
+"""Hazard feeds normalized to EONET-shaped events and merged across feeds.
+
+Every adapter returns events with the fields the rest of the app reads:
+``id``, ``title``, ``closed``, ``categories[0]`` (``id``/``title``),
+``geometry[0]`` (``date``, ``type``, ``coordinates`` as ``[lon, lat]``) and
+``sources``. ``fetch_hazard_events`` fetches the configured feeds in
+parallel and merges reports of the same physical event, so a second feed
+adds coverage without adding proximity work for events already known.
+"""
+import logging
+import math
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import requests
+
+from . import metrics
+from .events import EONET_URL, REQUEST_TIMEOUT, TYPE_SETS, fetch_eonet_events
+from .spatial import KM_PER_DEGREE, _haversine_km
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# USGS summary feed of magnitude 2.5+ earthquakes over the past day
+USGS_URL = "https://earthquake.usgs.gov/earthquakes/feed/v1.0/summary/2.5_day.geojson"
+
+# Feeds used when ``HAZARD_FEEDS`` is unset
+DEFAULT_FEEDS = "eonet"
+
+# Reports of one category within this distance and time of each other are one event
+DEDUP_KM = 50
+DEDUP_HOURS = 6
+# Grid cell of the dedup index; at least DEDUP_KM tall so neighbouring cells cover a match
+DEDUP_CELL_DEGREES = 0.5
+
+class EonetFeed:
+    """NASA EONET events (already in the app's schema)."""
+
+    name = "eonet"
+
+    def __init__(self, api_key=None, url=EONET_URL, **params):
+        self.api_key = api_key
+        self.url = url
+        self.params = params
+
+    def fetch(self):
+        return fetch_eonet_events(api_key=self.api_key, url=self.url, **self.params)
+
+class GeoJsonFeed:
+    """Point features of a GeoJSON hazard feed (e.g. USGS summaries) as events of one category.
+
+    ``title_fields`` are tried in order for the event title; ``time_field``
+    holds epoch milliseconds (as in USGS feeds) or an ISO 8601 string.
+    """
+
+    def __init__(self, name, url, category_id, category_title, title_fields=("title", "place"),
+                 time_field="time"):
+        self.name = name
+        self.url = url
+        self.category = {"id": category_id, "title": category_title}
+        self.title_fields = title_fields
+        self.time_field = time_field
+
+    def _date(self, value):
+        if isinstance(value, (int, float)):
+            return datetime.fromtimestamp(value / 1000, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        return str(value) if value else None
+
+    def normalize(self, feature):
+        """Return the event for one feature, or None if it is not a usable point."""
+        try:
+            geometry = feature["geometry"]
+            if geometry["type"] != "Point":
+                return None
+            lon, lat = float(geometry["coordinates"][0]), float(geometry["coordinates"][1])
+        except (KeyError, IndexError, TypeError, ValueError):
+            return None
+        properties = feature.get("properties") or {}
+        feature_id = feature.get("id") or properties.get("code")
+        if feature_id is None or not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            return None
+        title = next((str(properties[field]) for field in self.title_fields if properties.get(field)), None)
+        return {
+            "id": f"{self.name}:{feature_id}",
+            "title": title or f"{self.category['title']} {feature_id}",
+            "closed": None,
+            "categories": [dict(self.category)],
+            "geometry": [{"date": self._date(properties.get(self.time_field)), "type": "Point",
+                          "coordinates": [lon, lat]}],
+            "sources": [{"id": self.name, "url": properties.get("url") or self.url}],
+        }
+
+    def fetch(self):
+        """Fetch and normalize the feed; raises on HTTP or network errors."""
+        with metrics.span("eonet_fetch", source=self.name):
+            response = requests.get(self.url, timeout=REQUEST_TIMEOUT)
+            response.raise_for_status()
+            data = response.json()
+        features = data.get("features", []) if isinstance(data, dict) else []
+        events = [event for event in map(self.normalize, features) if event is not None]
+        metrics.increment("events_fetched", len(events), source=self.name)
+        return events
+
+def usgs_feed(url=USGS_URL):
+    """USGS earthquake summary feed adapter."""
+    return GeoJsonFeed("usgs", url, "earthquakes", "Earthquakes")
+
+def configured_feeds(api_key=None):
+    """Feeds named in ``HAZARD_FEEDS`` (comma-separated, default "eonet").
+
+    A blank value counts as unset. ``EONET_URL`` and ``USGS_FEED_URL``
+    override the endpoints, e.g. to point the adapters at a local fixture server.
+    """
+    names = os.environ.get("HAZARD_FEEDS", "")
+    if not names.replace(",", "").strip():
+        if names:
+            logger.warning(f"HAZARD_FEEDS names no feeds, using '{DEFAULT_FEEDS}'")
+        names = DEFAULT_FEEDS
+    feeds = []
+    for name in names.split(","):
+        name = name.strip().lower()
+        if name == "eonet":
+            feeds.append(EonetFeed(api_key=api_key, url=os.environ.get("EONET_URL", EONET_URL)))
+        elif name == "usgs":
+            feeds.append(usgs_feed(os.environ.get("USGS_FEED_URL", USGS_URL)))
+        elif name:
+            raise ValueError(f"Unknown hazard feed '{name}', expected eonet or usgs")
+    return feeds
+
+def _category(event):
+    """The ``DISASTER_TYPES`` name an event filters as, else its raw category term."""
+    term = event['categories'][0]['id'].lower().split('-')[0]
+    return next((name for name, terms in TYPE_SETS.items() if term in terms), term)
+
+def _timestamp(date):
+    try:
+        return datetime.fromisoformat(str(date).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+class DedupIndex:
+    """Hash index of kept events by (category, lat cell, lon cell, time cell).
+
+    A new report is looked up in its own and the neighbouring cells and
+    matches a kept event of the same category from another feed within
+    ``max_km`` and ``window_hours``; reports within one feed are taken to be
+    distinct. Events without a usable point or date are never merged.
+    """
+
+    def __init__(self, max_km=DEDUP_KM, window_hours=DEDUP_HOURS, cell_degrees=DEDUP_CELL_DEGREES):
+        self.max_km = max_km
+        self.window = window_hours * 3600
+        self.cell_degrees = cell_degrees
+        self.lon_cells = int(round(360 / cell_degrees))
+        self._cells = defaultdict(list)
+
+    def _point(self, event):
+        try:
+            geometry = event['geometry'][0]
+            lat, lon = float(geometry['coordinates'][1]), float(geometry['coordinates'][0])
+            category = _category(event)
+        except (KeyError, IndexError, TypeError, ValueError):
+            return None
+        when = _timestamp(geometry.get('date'))
+        return None if when is None else (category, lat, lon, when)
+
+    def _cell(self, lat, lon, when):
+        return (math.floor((lat + 90) / self.cell_degrees),
+                math.floor((lon + 180) / self.cell_degrees) % self.lon_cells,
+                math.floor(when / self.window))
+
+    def _neighbours(self, category, lat, lon, when):
+        lat_cell, lon_cell, time_cell = self._cell(lat, lon, when)
+        # Longitude cells narrow towards the poles, so more of them can hold a match
+        cell_km = self.cell_degrees * KM_PER_DEGREE * max(math.cos(math.radians(lat)), 1e-3)
+        reach = min(math.ceil(self.max_km / cell_km), self.lon_cells // 2)
+        for dlat in (-1, 0, 1):
+            for dlon in range(-reach, reach + 1):
+                for dtime in (-1, 0, 1):
+                    yield category, lat_cell + dlat, (lon_cell + dlon) % self.lon_cells, time_cell + dtime
+
+    def match(self, event, feed):
+        """Return the position of the kept event that ``event`` from ``feed`` duplicates, or None."""
+        point = self._point(event)
+        if point is None:
+            return None
+        category, lat, lon, when = point
+        for key in self._neighbours(category, lat, lon, when):
+            for position, other_feed, (other_lat, other_lon, other_when) in self._cells.get(key, ()):
+                if other_feed != feed and abs(when - other_when) <= self.window and \
+                        _haversine_km(lat, lon, other_lat, other_lon) <= self.max_km:
+                    return position
+        return None
+
+    def add(self, event, feed, position):
+        """Index ``event`` from ``feed`` as the kept event at ``position``."""
+        point = self._point(event)
+        if point is not None:
+            category, lat, lon, when = point
+            self._cells[(category, *self._cell(lat, lon, when))].append((position, feed, (lat, lon, when)))
+
+def merge_events(event_lists, index=None):
+    """Concatenate per-feed event lists, dropping reports of events another feed already gave.
+
+    Earlier lists win; a dropped report's ``sources`` are appended to the
+    kept event (a copy, so cached inputs are left untouched).
+    """
+    index = index or DedupIndex()
+    merged = []
+    duplicates = 0
+    for feed, events in enumerate(event_lists):
+        for event in events:
+            position = index.match(event, feed)
+            if position is None:
+                index.add(event, feed, len(merged))
+                merged.append(event)
+                continue
+            duplicates += 1
+            kept = merged[position]
+            merged[position] = {**kept, "sources": list(kept.get("sources") or []) + list(event.get("sources") or [])}
+    if duplicates:
+        metrics.increment("events_deduplicated", duplicates)
+    return merged
+
+def _fetch(feed):
+    try:
+        return feed.fetch(), None
+    except Exception as e:
+        return [], e
+
+def fetch_hazard_events(feeds=None, api_key=None):
+    """Fetch ``feeds`` (default ``configured_feeds``) concurrently and merge their events.
+
+    A failing feed is logged and skipped; raises only when every feed fails.
+    """
+    feeds = feeds if feeds is not None else configured_feeds(api_key)
+    if not feeds:
+        raise ValueError("No hazard feeds to fetch")
+    if len(feeds) == 1:
+        # Nothing to merge; errors propagate as from fetch_eonet_events
+        return feeds[0].fetch()
+
+    with ThreadPoolExecutor(max_workers=len(feeds)) as pool:
+        results = list(pool.map(_fetch, feeds))
+    errors = [(feed, error) for feed, (_, error) in zip(feeds, results) if error is not None]
+    for feed, error in errors:
+        logger.warning(f"Hazard feed {feed.name} failed: {error}")
+        metrics.increment("feed_errors", source=feed.name)
+    if len(errors) == len(feeds):
+        raise errors[-1][1]
+    return merge_events(events for events, _ in results)
@@ -1,32 +1,22 @@
 """Helper functions for the Alumni Disaster Monitor app."""
 import os
+import sys
 import streamlit as st
-from sqlalchemy import create_engine, text
 import time
 
+# SQLAlchemy and pandas are imported on first use so the safe-mode page paints fast
+
 def get_db_url():
-    """Get database URL from environment or secrets."""
-    # Try environment variables first (for Hugging Face)
-    url = os.environ.get("POSTGRES_URL")
-    
-    # If not found, try Streamlit secrets (for local development)
-    if not url and hasattr(st, "secrets") and "postgres" in st.secrets:
-        try:
-            url = st.secrets.postgres.url
-        except:
-            pass
-        
-    return url
+    """Get database URL from secrets or environment."""
+    from utils.database import get_connection_string
+    return get_connection_string()
 
-def create_db_engine(url, timeout=5):
-    """Create a database engine with proper settings."""
+def create_db_engine(url):
+    """Return the shared pooled engine for a database URL."""
     if not url:
         return None
-    return create_engine(
-        url,
-        pool_pre_ping=True,
-        connect_args={"connect_timeout": timeout}
-    )
+    from utils.database import get_engine
+    return get_engine(url)
 
 def mask_url(url):
     """Mask sensitive parts of a URL."""
@@ -38,7 +28,8 @@ def init_session_state():
     """Initialize all session state variables with defaults."""
     defaults = {
         "app_loaded": False,
-        "show_debugging": True
+        "show_debugging": True,
+        "profile_requested": False
     }
     for key, value in defaults.items():
         if key not in st.session_state:
@@ -69,9 +60,23 @@ def show_debug_info():
                 "Streamlit Secrets": has_secrets,
                 "Postgres Section": has_postgres
             },
-            "Environment Variables": list(env_vars.keys())
+            "Environment Variables": list(env_vars.keys()),
+            # Only report pools once something has loaded the database layer
+            "Connection Pools": (sys.modules["utils.database"].pool_stats()
+                                 if "utils.database" in sys.modules else "not initialized")
         })
 
+        # Startup cost, measured in a separate interpreter on demand
+        if st.button("Measure import times", key="import_report"):
+            from utils.startup import import_time_report
+            st.json(import_time_report())
+
+        # One-shot cProfile/tracemalloc capture of the next full-application rerun
+        st.session_state.profile_requested = st.checkbox(
+            "Profile the full application load", value=st.session_state.profile_requested,
+            key="profile_toggle"
+        )
+
 def run_database_diagnosis():
     """Run comprehensive database diagnosis."""
     from utils.data_loader import load_alumni_data
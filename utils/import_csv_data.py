@@ -1,20 +1,20 @@
 import pandas as pd
-from sqlalchemy import create_engine
-from .database import Base, engine
-import chardet
+from .roster_sync import sync_alumni
+from .roster_reader import read_roster_chunks
 
-def import_from_csv(csv_path):
-    # Detect file encoding
-    with open(csv_path, 'rb') as file:
-        raw_data = file.read()
-        result = chardet.detect(raw_data)
-        encoding = result['encoding']
+# Source columns needed to build alumni rows
+IMPORT_COLUMNS = [
+    'original_ID', 'original_First Name', 'original_Prim_Last',
+    'original_City', 'original_State', 'original_Country', 'original_Pref Class Yr', 'lat', 'lon',
+    # Geocoder-normalized region fields, preferred over the originals when present
+    'country_code', 'state', 'city'
+]
 
-    # Read CSV file, skip the first row if it contains 'combo'
-    df = pd.read_csv(csv_path, encoding=encoding, skiprows=1)
-    
-    # Map columns to match our database schema
+def clean_chunk(df):
+    """Map one chunk of combo-format rows onto the alumni schema."""
     alumni_data = pd.DataFrame({
+        # Blank IDs stay blank; sync_alumni keys those rows on their content
+        'source_id': df['original_ID'].fillna('').astype(str).str.strip(),
         'name': df['original_First Name'].fillna('') + ' ' + df['original_Prim_Last'].fillna(''),
         'location': df.apply(
             lambda row: f"{row['original_City'] or ''}, {row['original_State'] or ''}, {row['original_Country'] or ''}".strip(' ,'),
@@ -22,21 +22,31 @@ def import_from_csv(csv_path):
         ),
         'latitude': df['lat'],
         'longitude': df['lon'],
-        'last_updated': pd.Timestamp.now()
+        # Columns the file lacks are all-NaN floats after reindex, so cast before .str
+        'country': df['country_code'].astype("string").str.upper().fillna(df['original_Country']),
+        'state': df['state'].fillna(df['original_State']),
+        'city': df['city'].fillna(df['original_City']),
+        'class_year': df['original_Pref Class Yr']
     })
-    
+
     # Remove rows with missing required data
     alumni_data = alumni_data.dropna(subset=['name', 'latitude', 'longitude'])
-    
+
     # Fill any remaining NaN values
-    alumni_data = alumni_data.fillna('')
-    
-    # Create tables if they don't exist
-    Base.metadata.create_all(bind=engine)
-    
-    # Import data
-    alumni_data.to_sql('alumni', engine, if_exists='append', index=False)
-    print(f"Successfully imported {len(alumni_data)} records")
+    return alumni_data.fillna('')
+
+def import_from_csv(csv_path):
+    # Parse and clean the file chunk by chunk, keeping only the slim columns
+    chunks = [clean_chunk(chunk.reindex(columns=IMPORT_COLUMNS))
+              for chunk in read_roster_chunks(csv_path, usecols=lambda column: column in IMPORT_COLUMNS)]
+    if not chunks:
+        print("No records found")
+        return
+    alumni_data = pd.concat(chunks, ignore_index=True)
+
+    # Only touch rows whose content changed since the last import
+    result = sync_alumni(alumni_data)
+    print(f"Successfully imported records: {result}")
 
 if __name__ == "__main__":
-    import_from_csv('assets/combo.csv')  # Updated path to your actual CSV file 
\ No newline at end of file
+    import_from_csv('assets/combo.csv')  # Updated path to your actual CSV file
@@ -1,7 +1,4 @@
-from .database import Base, engine
-
-def init_database():
-    Base.metadata.create_all(bind=engine)
+from .database import init_database
 
 if __name__ == "__main__":
     init_database() 
\ No newline at end of file
@@ -1,27 +1,22 @@
-from sqlalchemy import create_engine
-from .database import Base, Alumni, engine
-from datetime import datetime
+from .roster_sync import sync_alumni
 import pandas as pd
 
 def load_sample_alumni():
-    # Create tables
-    Base.metadata.create_all(bind=engine)
-    
     # Sample alumni data
     sample_data = [
         {
+            "source_id": "sample-1",
             "name": "John Doe",
             "location": "Tokyo, Japan",
             "latitude": 35.6762,
-            "longitude": 139.6503,
-            "last_updated": datetime.now()
+            "longitude": 139.6503
         },
         {
+            "source_id": "sample-2",
             "name": "Jane Smith",
             "location": "Osaka, Japan",
             "latitude": 34.6937,
-            "longitude": 135.5023,
-            "last_updated": datetime.now()
+            "longitude": 135.5023
         },
         # Add more sample data as needed
     ]
@@ -29,8 +24,8 @@ def load_sample_alumni():
     # Convert to DataFrame
     df = pd.DataFrame(sample_data)
     
-    # Insert into database
-    df.to_sql('alumni', engine, if_exists='append', index=False)
+    # Upsert by source_id so re-running does not duplicate rows or drop the stored roster
+    sync_alumni(df, delete_missing=False)
     
 if __name__ == "__main__":
     load_sample_alumni() 
\ No newline at end of file
@@ -1,10 +1,13 @@
-import folium
-from geopy.distance import geodesic
-import numpy as np
 import streamlit as st
+from .disk_cache import cached_call, events_version, get_disk_cache
+from .proximity import AlertResult, compute_proximity_alerts, disaster_points
+
+# folium is imported inside create_map to keep module import cheap
 
 def create_map(alumni_df, disasters):
     """Create an interactive map with alumni and disaster locations."""
+    import folium
+
     # Calculate center of the map
     center_lat = alumni_df['Latitude'].mean()
     center_lon = alumni_df['Longitude'].mean()
@@ -69,57 +72,28 @@ def create_map(alumni_df, disasters):
 
     return m
 
-def calculate_proximity_alerts(alumni_df, disasters, threshold_km):
-    """Calculate proximity alerts between alumni and disasters."""
-    alerts = []
+def calculate_proximity_alerts(alumni_df, disasters, threshold_km, roster_key=None):
+    """Calculate proximity alerts between alumni and disasters.
 
+    With the disk cache enabled and a ``roster_key`` identifying the loaded
+    roster, alert arrays are shared with the other processes on the host.
+    """
     # Ensure threshold is a float
     try:
         threshold_km = float(threshold_km)
     except (ValueError, TypeError):
         st.error("Invalid threshold value")
-        return []
-
-    for _, alumni in alumni_df.iterrows():
-        try:
-            # Ensure coordinates are floats
-            alumni_lat = float(alumni['Latitude'])
-            alumni_lon = float(alumni['Longitude'])
-            alumni_coords = (alumni_lat, alumni_lon)
-            
-            # Skip processing for alumni with default coordinates
-            if not alumni.get('Has_Valid_Coords', True):
-                continue
-
-            for disaster in disasters:
-                try:
-                    disaster_lat = float(disaster['geometry'][0]['coordinates'][1])
-                    disaster_lon = float(disaster['geometry'][0]['coordinates'][0])
-                    disaster_coords = (disaster_lat, disaster_lon)
-
-                    distance = geodesic(alumni_coords, disaster_coords).km
-
-                    if distance <= threshold_km:
-                        # Convert all values to appropriate types to avoid type errors
-                        alert = {
-                            'alumni_name': str(alumni['Name']),
-                            'location': str(alumni['Location']),
-                            'disaster_type': str(disaster['categories'][0]['title']),
-                            'disaster_description': str(disaster['title']),
-                            'distance': float(round(distance, 1))
-                        }
-                        alerts.append(alert)
-
-                except (KeyError, IndexError, ValueError, TypeError):
-                    continue
-        except (ValueError, TypeError):
-            # Skip alumni with invalid coordinates
-            continue
+        return AlertResult(alumni_df, disaster_points(disasters))
 
-    # Sort alerts by distance
-    alerts = sorted(alerts, key=lambda x: x['distance'])
+    if roster_key is not None and get_disk_cache() is not None:
+        # Only the arrays are cached; the roster is reattached on the way out
+        arrays = cached_call("alerts", (roster_key, events_version(disasters), threshold_km),
+                             lambda: compute_proximity_alerts(alumni_df, disasters, threshold_km).arrays())
+        alerts = AlertResult(alumni_df, disaster_points(disasters), *arrays)
+    else:
+        alerts = compute_proximity_alerts(alumni_df, disasters, threshold_km)
 
     if alerts:
         st.warning(f"🚨 Found {len(alerts)} proximity alerts")
 
-    return alerts
\ No newline at end of file
+    return alerts
@@ -0,0 +1,148 @@
+"""In-process stage timings, counters and gauges with a Prometheus text exporter."""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from .cache_stats import cache_stats
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+PREFIX = "alumni_monitor"
+
+_lock = threading.Lock()
+# (name, labels) -> {"count", "sum", "max", "last"}
+_spans = {}
+# (name, labels) -> value
+_counters = {}
+_gauges = {}
+_server = None
+
+def _key(name, labels):
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def observe(name, seconds, **labels):
+    """Record one duration for the stage ``name``."""
+    with _lock:
+        stats = _spans.setdefault(_key(name, labels), {"count": 0, "sum": 0.0, "max": 0.0, "last": 0.0})
+        stats["count"] += 1
+        stats["sum"] += seconds
+        stats["max"] = max(stats["max"], seconds)
+        stats["last"] = seconds
+
+@contextmanager
+def span(name, **labels):
+    """Time the enclosed block as one observation of the stage ``name``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start, **labels)
+
+def increment(name, value=1, **labels):
+    """Add ``value`` to the counter ``name``."""
+    with _lock:
+        key = _key(name, labels)
+        _counters[key] = _counters.get(key, 0) + value
+
+def set_gauge(name, value, **labels):
+    """Set the gauge ``name`` to ``value``."""
+    with _lock:
+        _gauges[_key(name, labels)] = value
+
+def snapshot():
+    """Return copies of the spans, counters and gauges plus the cache counters."""
+    with _lock:
+        return {
+            "spans": {key: dict(stats) for key, stats in _spans.items()},
+            "counters": dict(_counters),
+            "gauges": dict(_gauges),
+            "caches": cache_stats(),
+        }
+
+def reset_metrics():
+    """Clear all recorded metrics (cache counters are kept)."""
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+        _gauges.clear()
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+def render_prometheus():
+    """Render all metrics in the Prometheus text exposition format."""
+    data = snapshot()
+    lines = []
+
+    lines.append(f"# HELP {PREFIX}_stage_seconds Wall time per pipeline stage.")
+    lines.append(f"# TYPE {PREFIX}_stage_seconds summary")
+    for (name, labels), stats in sorted(data["spans"].items()):
+        label_text = _format_labels((("stage", name),) + labels)
+        lines.append(f"{PREFIX}_stage_seconds_count{label_text} {stats['count']}")
+        lines.append(f"{PREFIX}_stage_seconds_sum{label_text} {stats['sum']:.6f}")
+
+    # HELP/TYPE once per metric family, followed by all of its label sets
+    for kind, suffix, samples in (("counter", "_total", data["counters"]), ("gauge", "", data["gauges"])):
+        family = None
+        for (name, labels), value in sorted(samples.items()):
+            metric = f"{PREFIX}_{name}{suffix}"
+            if metric != family:
+                family = metric
+                lines.append(f"# HELP {metric} {name.replace('_', ' ').capitalize()}.")
+                lines.append(f"# TYPE {metric} {kind}")
+            lines.append(f"{metric}{_format_labels(labels)} {value}")
+
+    for field in ("hits", "misses"):
+        metric = f"{PREFIX}_cache_{field}_total"
+        lines.append(f"# HELP {metric} Cache {field} per cached loader.")
+        lines.append(f"# TYPE {metric} counter")
+        for cache, stats in sorted(data["caches"].items()):
+            lines.append(f'{metric}{{cache="{cache}"}} {stats[field]}')
+
+    return "\n".join(lines) + "\n"
+
+def exporting():
+    """Check whether the Prometheus endpoint is being served in this process."""
+    return bool(_server)
+
+def start_metrics_server(port, host="0.0.0.0"):
+    """Serve ``/metrics`` on ``port`` from a daemon thread; later calls are no-ops."""
+    global _server
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    with _lock:
+        if _server is not None:
+            # False marks an earlier failed start; don't retry on every rerun
+            return _server or None
+        try:
+            _server = ThreadingHTTPServer((host, int(port)), MetricsHandler)
+        except OSError as e:
+            # Another process (or an earlier app reload) already holds the port
+            logger.warning(f"Metrics server not started on port {port}: {e}")
+            _server = False
+            return None
+        threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+        logger.info(f"Serving Prometheus metrics on port {port}")
+        return _server
@@ -0,0 +1,281 @@
+"""Independently re-running page fragments for the full application view."""
+import tempfile
+
+import pandas as pd
+import streamlit as st
+
+from utils import metrics
+from utils.alert_view import (ALERT_COLUMNS, DISTANCE_LABELS, alert_events, alert_types, alerts_for_event,
+                              filter_alerts, paginate, sort_alerts, summarize_alerts)
+from utils.contact_export import EXPORT_FORMATS, MIME_TYPES, export_chunks, export_filename, format_available
+from utils.disk_cache import events_version
+from utils.map_handler import create_map, calculate_proximity_alerts
+from utils.proximity import disaster_points, nearest_alumni
+from utils.rollups import RollupIndex
+
+# Rows per page offered by the alert table
+PAGE_SIZES = [25, 50, 100]
+
+# Seconds between refreshes of the sidebar metrics breakdown
+METRICS_REFRESH = 5
+
+# Degrees between a map click and an event marker centre to count as that event
+CLICK_TOLERANCE = 1e-4
+
+def has_map_data(alumni_df, disasters):
+    """Check that both the roster and the filtered events are non-empty."""
+    return alumni_df is not None and not alumni_df.empty and bool(disasters)
+
+def clicked_event(disasters, clicked):
+    """Return the ``(lat, lon, type, title)`` of the event marker at a map click, if any."""
+    if not clicked:
+        return None
+    for point in disaster_points(disasters):
+        if abs(point[0] - clicked["lat"]) < CLICK_TOLERANCE and abs(point[1] - clicked["lng"]) < CLICK_TOLERANCE:
+            return point
+    return None
+
+def map_object(alumni_df, disasters, roster_key):
+    """Return this session's folium map, rebuilt only when the roster or the events change."""
+    key = (roster_key, len(alumni_df), events_version(disasters))
+    cached = st.session_state.get("disaster_map_obj")
+    if roster_key is None or cached is None or cached[0] != key:
+        with metrics.span("map_build"):
+            cached = (key, create_map(alumni_df, disasters))
+        st.session_state.disaster_map_obj = cached
+    return cached[1]
+
+@st.fragment
+def map_panel(alumni_df, disasters, roster_key=None):
+    """Render the disaster map; clicking an event lists its nearest alumni.
+
+    Reruns only when its own inputs change or a marker is clicked; the
+    built map is reused across those reruns for the same ``roster_key``
+    and events.
+    """
+    st.subheader("🗺️ Disaster Monitoring Map")
+
+    if not has_map_data(alumni_df, disasters):
+        st.warning("Insufficient data to display map")
+        return
+
+    from streamlit_folium import st_folium
+    map_obj = map_object(alumni_df, disasters, roster_key)
+    # Only clicks are returned, so panning and zooming do not trigger reruns
+    with metrics.span("map_serialize"):
+        map_state = st_folium(map_obj, width=800, height=600, key="disaster_map",
+                              returned_objects=["last_object_clicked"])
+    if metrics.exporting():
+        # Sizing the payload renders the document again, so only pay for it when it is scraped
+        metrics.set_gauge("map_payload_bytes", len(map_obj.get_root().render()))
+
+    event = clicked_event(disasters, (map_state or {}).get("last_object_clicked"))
+    if event is None:
+        st.caption("Click a disaster marker to list the closest alumni.")
+        return
+    nearest_panel(alumni_df, event)
+
+@st.fragment
+def nearest_panel(alumni_df, event):
+    """List the alumni closest to a clicked event; changing K reruns only this list."""
+    event_lat, event_lon, event_type, title = event
+    k = st.number_input("Closest alumni", min_value=1, max_value=500, value=20, step=5, key="nearest_k")
+    with metrics.span("nearest_alumni"):
+        nearest = nearest_alumni(alumni_df, event_lat, event_lon, int(k))
+    st.markdown(f"**{len(nearest)} closest alumni to {title}** ({event_type})")
+    st.dataframe(nearest, hide_index=True, use_container_width=True)
+
+def rollup_index(alumni_df, roster_key):
+    """Return this session's RollupIndex, rebuilt only when the roster changes."""
+    cached = st.session_state.get("rollup_index")
+    if roster_key is None or cached is None or cached[0] != roster_key or cached[1].size != len(alumni_df):
+        cached = (roster_key, RollupIndex(alumni_df))
+        st.session_state.rollup_index = cached
+    return cached[1]
+
+def session_alerts(alumni_df, disasters, threshold, roster_key):
+    """Return this session's alerts, recomputed only when the roster, events or threshold change.
+
+    Paging, sorting, searching and view changes rerun the alert fragment;
+    they reuse the stored arrays instead of redoing the proximity pass.
+    """
+    key = (roster_key, len(alumni_df), events_version(disasters), threshold)
+    cached = st.session_state.get("alert_result")
+    if roster_key is None or cached is None or cached[0] != key:
+        cached = (key, calculate_proximity_alerts(alumni_df, disasters, threshold, roster_key))
+        st.session_state.alert_result = cached
+    return cached[1]
+
+def prepare_rollup_index(alumni_df, metadata):
+    """``load_page_data`` roster hook: build the session's RollupIndex while events load."""
+    return rollup_index(alumni_df, (metadata or {}).get("loaded_at"))
+
+def rollup_view(alumni_df, alerts, roster_key, index=None):
+    """Render alert counts by region or cohort with a CSV export."""
+    index = index if index is not None and index.size == len(alumni_df) else rollup_index(alumni_df, roster_key)
+    if not index.dimensions:
+        st.info("This roster has no region or cohort columns")
+        return
+
+    with metrics.span("rollup_update"):
+        index.update(alerts.rows)
+    label = st.selectbox("Group by", index.dimensions, key="rollup_dimension")
+    table = index.rollup(label)
+    st.dataframe(table, hide_index=True, use_container_width=True)
+    if not table.empty:
+        st.bar_chart(table.head(15).set_index(label)["Affected Alumni"])
+    st.download_button("Download rollup (CSV)", table.to_csv(index=False),
+                       file_name=f"alert-rollup-{label.split()[0].lower()}.csv",
+                       mime="text/csv", key="rollup_download")
+
+def contact_export_view(alerts):
+    """Offer the contact list of alumni near one event, or all of them, as CSV or XLSX."""
+    event = st.selectbox("Event", ["All events"] + alert_events(alerts), key="export_event")
+    formats = [fmt for fmt in EXPORT_FORMATS if format_available(fmt)]
+    fmt = st.radio("Format", formats, format_func=str.upper, horizontal=True, key="export_format")
+    title = None if event == "All events" else event
+    selected = alerts if title is None else alerts_for_event(alerts, title)
+    st.caption(f"{len(selected)} rows, one per alumnus and event")
+
+    # Built only on request; the API's /export/contacts streams the same rows without buffering
+    if not st.button("Prepare contact list", key="export_prepare"):
+        return
+    with st.spinner("Joining contact details..."), tempfile.TemporaryFile() as file:
+        with metrics.span("contact_export", format=fmt):
+            for chunk in export_chunks(selected, fmt):
+                file.write(chunk)
+        file.seek(0)
+        st.download_button(f"Download {fmt.upper()}", file.read(), file_name=export_filename(fmt, title),
+                           mime=MIME_TYPES[fmt], on_click="ignore", key="export_download")
+
+@st.fragment
+def alert_panel(alumni_df, disasters, roster_key=None, rollups=None):
+    """Render proximity alerts; the threshold slider reruns only this fragment.
+
+    ``roster_key`` identifies the loaded roster, so rollups update incrementally
+    and alert lists can be shared through the disk cache. ``rollups`` is a
+    RollupIndex prepared during the page load (see ``prepare_rollup_index``).
+    """
+    st.subheader("⚠️ Proximity Alerts")
+
+    proximity_threshold = st.slider("Alert Threshold (km)", 50, 1000, 200, 50, key="proximity_threshold")
+
+    if not has_map_data(alumni_df, disasters):
+        return
+
+    alerts = session_alerts(alumni_df, disasters, proximity_threshold, roster_key)
+
+    if not alerts:
+        st.success("No alerts within the threshold")
+        return
+
+    st.warning(f"{len(alerts)} alerts within {proximity_threshold}km")
+
+    # One table widget regardless of alert count, instead of one expander per alert
+    view = st.radio("View", ["Summary", "Table", "Rollup", "Export"], horizontal=True, key="alert_view")
+    if view == "Rollup":
+        rollup_view(alumni_df, alerts, roster_key, rollups)
+        return
+    if view == "Export":
+        contact_export_view(alerts)
+        return
+    if view == "Summary":
+        summary = summarize_alerts(alerts)
+        st.dataframe(summary, hide_index=True, use_container_width=True)
+        st.bar_chart(summary.set_index("Disaster")[DISTANCE_LABELS].sum())
+        return
+
+    search = st.text_input("Search", key="alert_search")
+    types = st.multiselect("Types", alert_types(alerts), key="alert_types")
+    columns = list(ALERT_COLUMNS.values())
+    sort_column = st.selectbox("Sort by", columns, index=columns.index("Distance (km)"), key="alert_sort")
+    descending = st.toggle("Descending", key="alert_desc")
+    page_size = st.selectbox("Rows per page", PAGE_SIZES, key="alert_page_size")
+
+    # Filtering and sorting use the alert arrays; only the shown page is joined to names
+    matching = sort_alerts(filter_alerts(alerts, search, types), sort_column, ascending=not descending)
+    page_count = max(1, -(-len(matching) // page_size))
+    page = st.number_input("Page", min_value=1, max_value=page_count, value=1, key="alert_page")
+    # A page kept in session state can exceed a count that shrank since
+    page = min(max(1, int(page)), page_count)
+    page_df, _ = paginate(matching, page, page_size)
+    st.caption(f"{len(matching)} matching alerts, page {page} of {page_count}")
+
+    selection = st.dataframe(
+        page_df,
+        hide_index=True,
+        use_container_width=True,
+        on_select="rerun",
+        selection_mode="single-row",
+        key="alert_table"
+    )
+
+    # Detail drill-down only for the selected row
+    selected = selection.selection.rows
+    if selected:
+        alert = page_df.iloc[selected[0]]
+        st.markdown(f"**🚨 {alert['Alumni']} - {alert['Type']}**")
+        st.write(f"Distance: {alert['Distance (km)']} km")
+        st.write(f"Location: {alert['Location']}")
+        st.write(f"Disaster: {alert['Disaster']}")
+
+@st.fragment
+def status_panel(metadata, event_count, timings=None):
+    """Render the data source status; call inside ``with st.sidebar``."""
+    st.markdown("### System Status")
+    if metadata:
+        st.caption(f"Alumni: {metadata.get('total_records', 0)} records from {metadata.get('source')}")
+        if metadata.get("invalid_coords"):
+            st.caption(f"Approximate locations: {metadata['invalid_coords']}")
+    st.caption(f"Active events: {event_count}")
+    if timings:
+        st.caption("Load times: " + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in timings.items()))
+
+    if st.button("◀️ Simple Mode", key="simple_btn"):
+        st.session_state.app_loaded = False
+        st.rerun()
+
+@st.fragment(run_every=METRICS_REFRESH)
+def metrics_panel():
+    """Render a live per-stage timing and counter breakdown; call inside ``with st.sidebar``."""
+    data = metrics.snapshot()
+    with st.expander("Performance", expanded=False):
+        if data["spans"]:
+            st.dataframe(pd.DataFrame([
+                {
+                    "Stage": name + "".join(f" ({v})" for _, v in labels),
+                    "Last (s)": round(stats["last"], 3),
+                    "Avg (s)": round(stats["sum"] / stats["count"], 3),
+                    "Max (s)": round(stats["max"], 3),
+                    "Count": stats["count"],
+                }
+                for (name, labels), stats in sorted(data["spans"].items())
+            ]), hide_index=True, use_container_width=True)
+        for (name, labels), value in sorted(data["counters"].items()):
+            label_text = "".join(f" ({v})" for _, v in labels)
+            st.caption(f"{name}{label_text}: {value:,}")
+        for (name, labels), value in sorted(data["gauges"].items()):
+            st.caption(f"{name}: {value:,}")
+        for name, stats in data["caches"].items():
+            ratio = f"{stats['hit_ratio']:.0%}" if stats["hit_ratio"] is not None else "n/a"
+            st.caption(f"cache {name}: {stats['hits']} hits, {stats['misses']} misses ({ratio})")
+
+def profile_panel(result):
+    """Render the last profiled rerun with top functions, allocation sites and downloads."""
+    with st.expander(f"Profile of rerun ({result.seconds:.2f}s)", expanded=True):
+        st.markdown("**Top functions by cumulative time**")
+        st.dataframe(result.top_functions(), hide_index=True, use_container_width=True)
+        st.markdown("**Top allocation sites**")
+        st.dataframe(result.top_allocations(), hide_index=True, use_container_width=True)
+
+        col1, col2, col3 = st.columns(3)
+        col1.download_button("Download .pstats", result.pstats_bytes(),
+                             file_name=f"rerun-{result.created}.pstats", key="profile_pstats")
+        col2.download_button("Download memory snapshot", result.snapshot_bytes(),
+                             file_name=f"rerun-{result.created}.tracemalloc", key="profile_snapshot")
+        if col3.button("Profile next rerun", key="profile_again"):
+            st.session_state.profile_requested = True
+            st.rerun()
+        if col3.button("Clear profile", key="profile_clear"):
+            del st.session_state.last_profile
+            st.rerun()
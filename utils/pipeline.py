@@ -0,0 +1,79 @@
+"""Headless alert pipeline: roster -> events -> type filter -> proximity alerts."""
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+from .events import DISASTER_TYPES, filter_disasters_by_type, load_events_file, save_events_file
+from .feeds import fetch_hazard_events
+from .proximity import compute_proximity_alerts
+from .roster import load_roster
+from .secrets_handler import get_nasa_api_key
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+OUTPUT_FORMATS = ("csv", "json", "parquet")
+
+@contextmanager
+def _stage(timings, name):
+    """Record the wall time of one pipeline stage in ``timings``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = time.perf_counter() - start
+
+def run_alert_pipeline(threshold_km=200, types=None, roster_csv=None, events_file=None,
+                       record_events=None, workers=1, api_key=None, roster_source=None):
+    """Run the full alert pipeline without Streamlit.
+
+    Events are replayed from ``events_file`` when given, otherwise fetched
+    from the hazard feeds (and saved to ``record_events`` if set). Returns
+    ``(alerts_df, summary)`` where ``summary`` holds counts and stage timings.
+    ``roster_source`` pins the roster backend (see ``roster.load_roster``).
+    """
+    timings = {}
+
+    with _stage(timings, "roster"):
+        alumni_df, metadata = load_roster(csv_path=roster_csv, source=roster_source)
+
+    with _stage(timings, "events"):
+        if events_file:
+            events = load_events_file(events_file)
+        else:
+            events = fetch_hazard_events(api_key=api_key or get_nasa_api_key())
+            if record_events:
+                save_events_file(events, record_events)
+
+    with _stage(timings, "filter"):
+        filtered = filter_disasters_by_type(events, types or DISASTER_TYPES)
+
+    with _stage(timings, "proximity"):
+        alerts = compute_proximity_alerts(alumni_df, filtered, threshold_km, workers=workers)
+
+    alerts_df = alerts.frame()
+    summary = {
+        "roster_source": (metadata or {}).get("source"),
+        "roster_records": len(alumni_df) if alumni_df is not None else 0,
+        "events": len(events),
+        "filtered_events": len(filtered),
+        "alerts": len(alerts_df),
+        "threshold_km": float(threshold_km),
+        "timings": timings
+    }
+    logger.info(f"Alert pipeline finished: {summary}")
+    return alerts_df, summary
+
+def write_alerts(alerts_df, path, fmt=None):
+    """Write alerts as CSV, JSON (records) or Parquet, by ``fmt`` or file suffix."""
+    fmt = (fmt or os.path.splitext(path)[1].lstrip(".")).lower()
+    if fmt == "csv":
+        alerts_df.to_csv(path, index=False)
+    elif fmt == "json":
+        alerts_df.to_json(path, orient="records")
+    elif fmt == "parquet":
+        alerts_df.to_parquet(path, index=False)
+    else:
+        raise ValueError(f"Unsupported output format '{fmt}', expected one of {OUTPUT_FORMATS}")
+    return path
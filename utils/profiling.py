@@ -0,0 +1,90 @@
+"""Opt-in cProfile and tracemalloc capture of one full application rerun."""
+import cProfile
+import io
+import marshal
+import os
+import pstats
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import pandas as pd
+
+# Rows shown in the function and allocation tables
+TOP_N = 25
+# Frames kept per allocation traceback
+TRACE_FRAMES = 10
+
+class ProfileResult:
+    """cProfile stats and a tracemalloc snapshot from one profiled run."""
+
+    def __init__(self, profiler, snapshot, seconds):
+        profiler.create_stats()
+        self.raw_stats = profiler.stats
+        self.stats = pstats.Stats(profiler, stream=io.StringIO())
+        self.snapshot = snapshot
+        self.seconds = seconds
+        self.created = time.strftime("%Y%m%d-%H%M%S")
+
+    def top_functions(self, n=TOP_N):
+        """Return the ``n`` functions with the highest cumulative time."""
+        rows = []
+        for (filename, line, name), (_, calls, total, cumulative, _) in self.stats.stats.items():
+            rows.append({
+                "Function": f"{name} ({os.path.basename(filename)}:{line})",
+                "Calls": calls,
+                "Total (s)": round(total, 4),
+                "Cumulative (s)": round(cumulative, 4),
+            })
+        df = pd.DataFrame(rows, columns=["Function", "Calls", "Total (s)", "Cumulative (s)"])
+        return df.sort_values("Cumulative (s)", ascending=False).head(n).reset_index(drop=True)
+
+    def top_allocations(self, n=TOP_N):
+        """Return the ``n`` source lines that allocated the most memory still live at the end."""
+        rows = [
+            {
+                "Location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                "Size (KB)": round(stat.size / 1024, 1),
+                "Blocks": stat.count,
+            }
+            for stat in self.snapshot.statistics("lineno")[:n]
+        ]
+        return pd.DataFrame(rows, columns=["Location", "Size (KB)", "Blocks"])
+
+    def pstats_bytes(self):
+        """Stats in the ``.pstats`` format read by ``pstats``, snakeviz and friends."""
+        return marshal.dumps(self.raw_stats)
+
+    def snapshot_bytes(self):
+        """The tracemalloc snapshot, loadable with ``tracemalloc.Snapshot.load``."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "snapshot")
+            self.snapshot.dump(path)
+            with open(path, "rb") as file:
+                return file.read()
+
+@contextmanager
+def profile_run():
+    """Profile the enclosed block; yields a dict whose ``"result"`` is set on exit.
+
+    cProfile only sees the calling thread, so work in loader threads shows up
+    as time spent waiting on futures. tracemalloc is process-wide and also
+    counts allocations from other sessions running at the same time.
+    """
+    holder = {"result": None}
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start(TRACE_FRAMES)
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        yield holder
+    finally:
+        profiler.disable()
+        seconds = time.perf_counter() - start
+        snapshot = tracemalloc.take_snapshot()
+        if not already_tracing:
+            tracemalloc.stop()
+        holder["result"] = ProfileResult(profiler, snapshot, seconds)
@@ -0,0 +1,238 @@
+"""Proximity alert computation between alumni and disasters, independent of Streamlit."""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from geopy.distance import geodesic
+
+from . import metrics
+from .spatial import EARTH_RADIUS_KM, UNIT_COLUMNS, unit_vectors
+
+# Widening of the dot-product prefilter so it never drops a real alert: the
+# WGS-84 geodesic can exceed the spherical distance by up to ~0.6%, and
+# float32 dot products near 1 only resolve angles to about 2 km
+PREFILTER_SLACK_RATIO = 0.01
+PREFILTER_SLACK_KM = 5.0
+
+# Alumni rows per matrix product, bounding the candidate matrix's memory
+BLOCK_ROWS = 65_536
+
+# Nearest-neighbour candidates re-ranked by exact geodesic, as a multiple of k
+NEAREST_CANDIDATE_FACTOR = 4
+
+def disaster_points(disasters):
+    """Extract ``(lat, lon, type, title)`` for each disaster with usable coordinates."""
+    points = []
+    for disaster in disasters:
+        try:
+            points.append((
+                float(disaster['geometry'][0]['coordinates'][1]),
+                float(disaster['geometry'][0]['coordinates'][0]),
+                str(disaster['categories'][0]['title']),
+                str(disaster['title'])
+            ))
+        except (KeyError, IndexError, ValueError, TypeError):
+            continue
+    return points
+
+def roster_vectors(alumni_df, lat, lon):
+    """Use the loader's precomputed unit vectors, computing them only if absent."""
+    if all(column in alumni_df.columns for column in UNIT_COLUMNS):
+        return np.ascontiguousarray(alumni_df[UNIT_COLUMNS].to_numpy(dtype=np.float32))
+    return unit_vectors(lat, lon)
+
+def roster_coordinates(alumni_df):
+    """Return ``(lat, lon, valid)`` arrays for the roster."""
+    # Ensure coordinates are floats; unparseable ones become NaN and are skipped
+    lat = pd.to_numeric(alumni_df['Latitude'], errors='coerce').to_numpy(dtype=float)
+    lon = pd.to_numeric(alumni_df['Longitude'], errors='coerce').to_numpy(dtype=float)
+    valid = np.isfinite(lat) & np.isfinite(lon)
+    # Skip processing for alumni with default coordinates
+    if 'Has_Valid_Coords' in alumni_df.columns:
+        valid &= alumni_df['Has_Valid_Coords'].to_numpy().astype(bool)
+    return lat, lon, valid
+
+def _prefilter_cos(threshold_km):
+    """Smallest unit-vector dot product that may still be within ``threshold_km``."""
+    max_angle = (threshold_km * (1 + PREFILTER_SLACK_RATIO) + PREFILTER_SLACK_KM) / EARTH_RADIUS_KM
+    return np.float32(np.cos(min(max_angle, np.pi)))
+
+# Alert fields, in the column order of result frames and exports
+ALERT_COLUMNS = ['alumni_name', 'location', 'disaster_type', 'disaster_description', 'distance']
+
+class AlertResult:
+    """Proximity alerts as parallel arrays, nearest first.
+
+    ``rows`` are roster positions, ``events`` index ``points`` (see
+    ``disaster_points``) and ``distances`` are float32 km rounded to 0.1.
+    Names, locations and event fields are only looked up for the alerts
+    turned into a ``frame`` or ``records``, e.g. one page of a table.
+    """
+
+    def __init__(self, alumni_df, points, rows=(), events=(), distances=()):
+        self.alumni_df = alumni_df
+        self.points = points
+        self.rows = np.asarray(rows, dtype=np.int64)
+        self.events = np.asarray(events, dtype=np.int32)
+        self.distances = np.asarray(distances, dtype=np.float32)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, indexer):
+        """Alerts selected by a slice, boolean mask or index array, in that order."""
+        return AlertResult(self.alumni_df, self.points, self.rows[indexer], self.events[indexer],
+                           self.distances[indexer])
+
+    def arrays(self):
+        """``(rows, events, distances)``, e.g. for caching without the roster."""
+        return self.rows, self.events, self.distances
+
+    def event_values(self, field):
+        """One ``'disaster_type'`` or ``'disaster_description'`` per entry of ``points``."""
+        position = {'disaster_type': 2, 'disaster_description': 3}[field]
+        return np.array([point[position] for point in self.points], dtype=object)
+
+    def roster_values(self, column):
+        """The roster's ``column`` (e.g. ``'Name'``) as an array indexed by ``rows``."""
+        return self.alumni_df[column].to_numpy()
+
+    def frame(self):
+        """Join the alert fields into a DataFrame with ``ALERT_COLUMNS``."""
+        if not len(self):
+            return pd.DataFrame(columns=ALERT_COLUMNS)
+        return pd.DataFrame({
+            'alumni_name': pd.Series(self.roster_values('Name')[self.rows]).astype(str),
+            'location': pd.Series(self.roster_values('Location')[self.rows]).astype(str),
+            'disaster_type': self.event_values('disaster_type')[self.events],
+            'disaster_description': self.event_values('disaster_description')[self.events],
+            'distance': np.round(self.distances.astype(np.float64), 1),
+        }, columns=ALERT_COLUMNS)
+
+    def records(self):
+        """The alerts as a list of dicts keyed by ``ALERT_COLUMNS``."""
+        return self.frame().to_dict(orient="records")
+
+def _geodesic_km(lat, lon, other_lat, other_lon):
+    try:
+        return geodesic((lat, lon), (other_lat, other_lon)).km
+    except ValueError:
+        return np.nan
+
+def _alerts_for_chunk(alumni_df, points, threshold_km, offset=0):
+    """Compute unsorted ``(rows, events, distances)`` arrays for one slice of the roster.
+
+    A float32 matrix product of unit vectors against ``cos(angle)`` picks
+    candidate pairs; only those get the exact geodesic distance. ``rows``
+    are roster positions (``offset`` plus the row in the slice).
+    """
+    lat, lon, valid = roster_coordinates(alumni_df)
+    vectors = roster_vectors(alumni_df, lat, lon)
+    event_vectors = unit_vectors([p[0] for p in points], [p[1] for p in points])
+    cos_limit = _prefilter_cos(threshold_km)
+
+    row_parts, event_parts, distance_parts = [], [], []
+    for start in range(0, len(vectors), BLOCK_ROWS):
+        block = slice(start, start + BLOCK_ROWS)
+        candidates = (vectors[block] @ event_vectors.T >= cos_limit) & valid[block, None]
+        # Row-major order keeps the alumni-then-event order of the old nested loop
+        rows, events = np.nonzero(candidates)
+        rows += start
+        distances = np.fromiter(
+            (_geodesic_km(lat[row], lon[row], points[event][0], points[event][1])
+             for row, event in zip(rows, events)),
+            dtype=np.float64, count=len(rows)
+        )
+        # NaN (invalid coordinates) never compares as within the threshold
+        within = distances <= threshold_km
+        row_parts.append(rows[within] + offset)
+        event_parts.append(events[within])
+        distance_parts.append(np.round(distances[within], 1).astype(np.float32))
+
+    if not row_parts:
+        return np.zeros(0, np.int64), np.zeros(0, np.int32), np.zeros(0, np.float32)
+    return np.concatenate(row_parts), np.concatenate(event_parts), np.concatenate(distance_parts)
+
+def compute_proximity_alerts(alumni_df, disasters, threshold_km, workers=1):
+    """Return an ``AlertResult`` of alumni within ``threshold_km`` of a disaster, nearest first.
+
+    ``workers`` > 1 splits the roster across processes. Raises ValueError if
+    the threshold is not numeric.
+    """
+    threshold_km = float(threshold_km)
+    points = disaster_points(disasters)
+    if not points or alumni_df is None or alumni_df.empty:
+        return AlertResult(alumni_df, points)
+
+    with metrics.span("proximity"):
+        if workers > 1 and len(alumni_df) > workers:
+            chunks = np.array_split(alumni_df, workers)
+            offsets = np.cumsum([0] + [len(chunk) for chunk in chunks[:-1]])
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parts = list(pool.map(_alerts_for_chunk, chunks, [points] * workers, [threshold_km] * workers,
+                                      [int(offset) for offset in offsets]))
+        else:
+            parts = [_alerts_for_chunk(alumni_df, points, threshold_km)]
+
+        rows, events, distances = (np.concatenate(arrays) for arrays in zip(*parts))
+        # Stable, so equal distances keep the roster-then-event order
+        order = np.argsort(distances, kind="stable")
+        alerts = AlertResult(alumni_df, points, rows[order], events[order], distances[order])
+    metrics.increment("alerts_produced", len(alerts))
+    return alerts
+
+def nearest_alumni(alumni_df, lat, lon, k=20):
+    """Return the ``k`` alumni closest to ``(lat, lon)``, nearest first, regardless of distance.
+
+    Ranks by unit-vector dot product with ``np.argpartition`` (no full sort),
+    then re-ranks the best ``NEAREST_CANDIDATE_FACTOR * k`` by exact geodesic.
+    Returns a DataFrame with Name, Location, Latitude, Longitude and Distance_km.
+    """
+    columns = ['Name', 'Location', 'Latitude', 'Longitude', 'Distance_km']
+    if alumni_df is None or alumni_df.empty or k < 1:
+        return pd.DataFrame(columns=columns)
+
+    alumni_lat, alumni_lon, valid = roster_coordinates(alumni_df)
+    dots = roster_vectors(alumni_df, alumni_lat, alumni_lon) @ unit_vectors([lat], [lon])[0]
+    dots[~valid] = -np.inf
+
+    pool = min(int(valid.sum()), k * NEAREST_CANDIDATE_FACTOR)
+    if pool == 0:
+        return pd.DataFrame(columns=columns)
+    candidates = np.argpartition(dots, -pool)[-pool:]
+
+    distances = np.array([geodesic((alumni_lat[i], alumni_lon[i]), (lat, lon)).km for i in candidates])
+    order = np.argsort(distances, kind="stable")[:k]
+    rows = candidates[order]
+
+    result = alumni_df.iloc[rows][['Name', 'Location']].reset_index(drop=True)
+    result['Latitude'] = alumni_lat[rows]
+    result['Longitude'] = alumni_lon[rows]
+    result['Distance_km'] = np.round(distances[order], 1)
+    return result
+
+def alumni_within(alumni_df, lat, lon, radius_km):
+    """Return every alumnus within ``radius_km`` of ``(lat, lon)``, nearest first.
+
+    Same prefilter as the alerts, then exact geodesic for the candidates.
+    Returns the columns of ``nearest_alumni``; ties keep roster order.
+    """
+    columns = ['Name', 'Location', 'Latitude', 'Longitude', 'Distance_km']
+    radius_km = float(radius_km)
+    if alumni_df is None or alumni_df.empty:
+        return pd.DataFrame(columns=columns)
+
+    alumni_lat, alumni_lon, valid = roster_coordinates(alumni_df)
+    dots = roster_vectors(alumni_df, alumni_lat, alumni_lon) @ unit_vectors([lat], [lon])[0]
+    candidates = np.nonzero((dots >= _prefilter_cos(radius_km)) & valid)[0]
+
+    distances = np.array([geodesic((alumni_lat[i], alumni_lon[i]), (lat, lon)).km for i in candidates])
+    keep = distances <= radius_km if len(candidates) else np.zeros(0, dtype=bool)
+    order = np.argsort(distances[keep], kind="stable")
+    rows = candidates[keep][order]
+
+    result = alumni_df.iloc[rows][['Name', 'Location']].reset_index(drop=True)
+    result['Latitude'] = alumni_lat[rows]
+    result['Longitude'] = alumni_lon[rows]
+    result['Distance_km'] = np.round(distances[keep][order], 1)
+    return result
@@ -0,0 +1,89 @@
+"""Regional and cohort rollups of alerts over categorical roster columns."""
+import numpy as np
+import pandas as pd
+
+# Rollup label -> roster column (kept as pandas categoricals by the loaders)
+ROLLUP_DIMENSIONS = {
+    "Country": "Country",
+    "State / Prefecture": "State",
+    "City": "City",
+    "Class Year": "Class_Year",
+}
+
+UNKNOWN = "Unknown"
+
+ROLLUP_COLUMNS = ["Alumni", "Alerts", "Affected Alumni", "Affected Share"]
+
+def categorize(df):
+    """Convert the rollup columns present in ``df`` to categoricals, blanks as 'Unknown'."""
+    columns = {}
+    for column in ROLLUP_DIMENSIONS.values():
+        if column in df.columns:
+            values = df[column].astype("string").str.strip().replace("", pd.NA)
+            columns[column] = values.fillna(UNKNOWN).astype("category")
+    return df.assign(**columns)
+
+def available_dimensions(df):
+    """Rollup labels whose column exists in ``df``."""
+    return [label for label, column in ROLLUP_DIMENSIONS.items() if column in df.columns]
+
+class RollupIndex:
+    """Per-group alumni, alert and affected-alumni counts kept in step with the alert set.
+
+    Group membership is the categorical codes of each rollup column, taken
+    once from the roster. ``update`` only touches alumni whose alert count
+    changed, so moving the threshold costs O(changed alumni) per dimension.
+    """
+
+    def __init__(self, alumni_df):
+        self.size = len(alumni_df)
+        self.codes = {}
+        self.labels = {}
+        self.members = {}
+        self.alerts = {}
+        self.affected = {}
+        for label in available_dimensions(alumni_df):
+            column = alumni_df[ROLLUP_DIMENSIONS[label]]
+            if not isinstance(column.dtype, pd.CategoricalDtype) or column.isna().any():
+                column = categorize(alumni_df[[column.name]])[column.name]
+            self.codes[label] = column.cat.codes.to_numpy()
+            self.labels[label] = column.cat.categories
+            groups = len(self.labels[label])
+            self.members[label] = np.bincount(self.codes[label], minlength=groups)
+            self.alerts[label] = np.zeros(groups, dtype=np.int64)
+            self.affected[label] = np.zeros(groups, dtype=np.int64)
+        self.hits = np.zeros(self.size, dtype=np.int64)
+
+    @property
+    def dimensions(self):
+        return list(self.codes)
+
+    def update(self, alert_rows):
+        """Move the rollups to a new alert set given the roster row of each alert."""
+        hits = np.bincount(np.asarray(alert_rows, dtype=np.int64), minlength=self.size)
+        changed = np.nonzero(hits != self.hits)[0]
+        if len(changed):
+            alert_delta = hits[changed] - self.hits[changed]
+            affected_delta = (hits[changed] > 0).astype(np.int64) - (self.hits[changed] > 0)
+            for label, codes in self.codes.items():
+                groups = len(self.labels[label])
+                changed_codes = codes[changed]
+                self.alerts[label] += np.bincount(changed_codes, weights=alert_delta,
+                                                  minlength=groups).astype(np.int64)
+                self.affected[label] += np.bincount(changed_codes, weights=affected_delta,
+                                                    minlength=groups).astype(np.int64)
+            self.hits = hits
+        return len(changed)
+
+    def rollup(self, label, include_empty=False):
+        """Return one row per group of ``label``, most affected alumni first."""
+        members = self.members[label]
+        df = pd.DataFrame({
+            "Alumni": members,
+            "Alerts": self.alerts[label],
+            "Affected Alumni": self.affected[label],
+            "Affected Share": np.round(self.affected[label] / np.maximum(members, 1), 3),
+        }, index=pd.Index(self.labels[label], name=label), columns=ROLLUP_COLUMNS)
+        if not include_empty:
+            df = df[df["Alerts"] > 0]
+        return df.sort_values(["Affected Alumni", "Alerts"], ascending=False).reset_index()
@@ -0,0 +1,253 @@
+"""Alumni roster loading from the database or CSV files, independent of Streamlit."""
+import os
+import logging
+import time
+import pandas as pd
+from sqlalchemy import inspect, select
+from . import metrics
+from .database import ATTRIBUTE_COLUMNS, Alumni, get_db_session, upgrade_alumni_table
+from .roster_reader import read_roster_chunks
+from .rollups import categorize
+from .spatial import add_unit_vectors
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# CSV fallbacks in priority order
+CSV_PATHS = [
+    'assets/combo.csv',
+    'attached_assets/combo3.csv'
+]
+
+# Roster sources selectable through ``load_roster(source=...)`` or ``ROSTER_SOURCE``
+ROSTER_SOURCES = ("auto", "database", "csv", "duckdb")
+
+# Alumni table column -> roster frame column for region and cohort rollups
+ROSTER_ATTRIBUTES = {"country": "Country", "state": "State", "city": "City", "class_year": "Class_Year"}
+
+def load_roster(csv_path=None, source=None):
+    """Load alumni data with database and CSV fallbacks.
+
+    An explicit ``csv_path`` skips the database and reads that file.
+    ``source`` (default ``ROSTER_SOURCE`` or "auto") pins one backend:
+    "database", "csv" or "duckdb" (the embedded file, see ``duckdb_store``).
+    """
+    if csv_path:
+        return _record_load(load_from_csv, [csv_path])
+
+    source = source or os.environ.get("ROSTER_SOURCE", "auto")
+    if source == "csv":
+        return _record_load(load_from_csv)
+    if source == "duckdb":
+        from .duckdb_store import load_roster_duckdb
+        df, metadata = _record_load(load_roster_duckdb)
+        if df is not None:
+            return df, metadata
+        logger.info("DuckDB loading failed, using CSV fallback")
+        return _record_load(load_from_csv)
+
+    # Try database first
+    df, metadata = _record_load(load_from_database)
+    if df is not None or source == "database":
+        return df, metadata
+        
+    # Fallback to CSV
+    logger.info("Database loading failed, using CSV fallback")
+    return _record_load(load_from_csv)
+
+def _record_load(loader, *args):
+    """Run one roster loader and record its timing and counts by source."""
+    start = time.perf_counter()
+    df, metadata = loader(*args)
+    source = (metadata or {}).get("source", "none")
+    if metadata is not None:
+        # Identifies this load, e.g. for per-session indexes over the roster
+        metadata["loaded_at"] = time.time()
+    metrics.observe("roster_load", time.perf_counter() - start, source=source)
+    if df is not None:
+        metrics.increment("roster_records", len(df), source=source)
+        metrics.increment("invalid_coordinates", int(metadata.get("invalid_coords", 0)), source=source)
+    return df, metadata
+
+def load_from_database(engine=None):
+    """Load alumni data from ``engine`` (default: the configured database) with error handling."""
+    try:
+        with get_db_session(engine) as session:
+            if session is None:
+                return None, None
+                
+            # Older tables gain the newer columns; without DDL rights they load without them
+            table = Alumni.__table__
+            try:
+                upgrade_alumni_table(session.get_bind())
+            except Exception as e:
+                logger.warning(f"Could not upgrade the {table.name} table: {e}")
+            existing = {column["name"] for column in inspect(session.get_bind()).get_columns(table.name)}
+            attributes = [name for name in ATTRIBUTE_COLUMNS if name in existing]
+            has_id = "source_id" in existing
+            columns = [table.c.name, table.c.location, table.c.latitude, table.c.longitude]
+            records = session.execute(
+                select(*columns, *([table.c.source_id] if has_id else []),
+                       *(table.c[name] for name in attributes)).order_by(table.c.id)
+            ).all()
+            
+            if not records:
+                logger.warning("No records found in database")
+                return None, None
+                
+            # Process records
+            data = []
+            invalid_coords = 0
+            
+            for record in records:
+                # Ensure coordinates are floats
+                try:
+                    lat = float(record.latitude)
+                    lon = float(record.longitude)
+                    valid_coords = lat != 0 or lon != 0
+                except (ValueError, TypeError):
+                    lat = 0.0
+                    lon = 0.0
+                    valid_coords = False
+                    
+                if not valid_coords:
+                    invalid_coords += 1
+                    
+                data.append({
+                    # Source ID, the key for contact lookups (see contact_export)
+                    'ID': record.source_id if has_id else None,
+                    'Name': record.name,
+                    'Location': record.location,
+                    'Latitude': lat,  # Store as float
+                    'Longitude': lon,  # Store as float
+                    'Has_Valid_Coords': valid_coords,
+                    **{ROSTER_ATTRIBUTES[name]: getattr(record, name) for name in attributes}
+                })
+                
+            # Unit vectors let proximity checks run as one matrix product
+            df = add_unit_vectors(categorize(pd.DataFrame(data)))
+            metadata = {
+                "total_records": len(records),
+                "invalid_coords": invalid_coords,
+                "source": "database"
+            }
+            
+            logger.info(f"Loaded {len(records)} records from database")
+            return df, metadata
+            
+    except Exception as e:
+        logger.error(f"Database loading error: {e}")
+        return None, None
+
+def _clean_csv_chunk(df):
+    """Normalize one chunk of a roster CSV into the app's alumni columns."""
+    # Process different CSV formats
+    if 'lat' in df.columns and 'lon' in df.columns:
+        # Process combo3.csv format
+        try:
+            # Convert coordinates to numeric first
+            df['lat'] = pd.to_numeric(df['lat'], errors='coerce')
+            df['lon'] = pd.to_numeric(df['lon'], errors='coerce')
+            
+            alumni_data = pd.DataFrame({
+                'ID': df.get('original_ID'),
+                'Name': df['original_First Name'].fillna('') + ' ' + df['original_Prim_Last'].fillna(''),
+                'Location': df.apply(
+                    lambda row: f"{row.get('original_City', '')} {row.get('original_State', '')} {row.get('original_Country', '')}".strip(),
+                    axis=1
+                ),
+                'Latitude': df['lat'].astype(float),
+                'Longitude': df['lon'].astype(float),
+                'Has_Valid_Coords': (~df['lat'].isna() & ~df['lon'].isna() & 
+                                   (df['lat'] != 0) & (df['lon'] != 0)),
+                # Region and cohort attributes for rollups (made categorical after concat)
+                'Country': df['country_code'].str.upper() if 'country_code' in df else df.get('original_Country'),
+                'State': df['state'] if 'state' in df else df.get('original_State'),
+                'City': df['city'] if 'city' in df else df.get('original_City'),
+                'Class_Year': df.get('original_Pref Class Yr')
+            })
+        except Exception as e:
+            logger.error(f"Error processing CSV data: {e}")
+            # Create an empty dataframe with the right structure
+            alumni_data = pd.DataFrame(columns=['Name', 'Location', 'Latitude', 'Longitude', 'Has_Valid_Coords'])
+    else:
+        # Handle standard format
+        alumni_data = df.copy()
+        
+        # Convert latitude and longitude to numeric
+        if 'Latitude' in alumni_data.columns:
+            alumni_data['Latitude'] = pd.to_numeric(alumni_data['Latitude'], errors='coerce').fillna(0.0)
+        if 'Longitude' in alumni_data.columns:
+            alumni_data['Longitude'] = pd.to_numeric(alumni_data['Longitude'], errors='coerce').fillna(0.0)
+            
+        if 'Has_Valid_Coords' not in alumni_data:
+            alumni_data['Has_Valid_Coords'] = (alumni_data['Latitude'] != 0) & (alumni_data['Longitude'] != 0)
+    return alumni_data
+
+def load_from_csv(csv_paths=None):
+    """Load data from CSV files with error handling."""
+    try:
+        # Check for CSV files in priority order
+        csv_paths = csv_paths or CSV_PATHS
+        
+        for path in csv_paths:
+            if not os.path.exists(path):
+                continue
+                
+            # Found a CSV file
+            logger.info(f"Loading data from {path}")
+            
+            # Clean each chunk as it is parsed so only the slim columns are held
+            chunks = [_clean_csv_chunk(chunk) for chunk in read_roster_chunks(path)]
+            alumni_data = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(
+                columns=['Name', 'Location', 'Latitude', 'Longitude', 'Has_Valid_Coords']
+            )
+                    
+            # Clean up data
+            alumni_data = alumni_data.fillna('')
+            
+            # Make sure coordinates are numeric
+            alumni_data['Latitude'] = pd.to_numeric(alumni_data['Latitude'], errors='coerce').fillna(0.0)
+            alumni_data['Longitude'] = pd.to_numeric(alumni_data['Longitude'], errors='coerce').fillna(0.0)
+            alumni_data = add_unit_vectors(categorize(alumni_data))
+            
+            # Count invalid coordinates
+            invalid_coords = len(alumni_data) - alumni_data['Has_Valid_Coords'].sum()
+            
+            logger.info(f"Loaded {len(alumni_data)} records from CSV with {invalid_coords} invalid coordinates")
+            return alumni_data, {
+                "total_records": len(alumni_data),
+                "invalid_coords": invalid_coords,
+                "source": "csv"
+            }
+            
+        # No CSV files found - return a default minimal DataFrame
+        logger.error("No CSV files found")
+        empty_df = pd.DataFrame({
+            'Name': ['Sample User'],
+            'Location': ['Default Location'],
+            'Latitude': [0.0],  # Explicit float
+            'Longitude': [0.0],  # Explicit float
+            'Has_Valid_Coords': [False]
+        })
+        return empty_df, {
+            "total_records": 0, 
+            "invalid_coords": 0, 
+            "source": "default"
+        }
+        
+    except Exception as e:
+        logger.error(f"CSV loading error: {e}")
+        # Return an empty DataFrame with the required columns
+        empty_df = pd.DataFrame({
+            'Name': ['Sample User'],
+            'Location': ['Error Location'],
+            'Latitude': [0.0],  # Explicit float
+            'Longitude': [0.0],  # Explicit float
+            'Has_Valid_Coords': [False]
+        })
+        return empty_df, {
+            "total_records": 0, 
+            "invalid_coords": 0, 
+            "source": "error"
+        }
\ No newline at end of file
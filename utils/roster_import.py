@@ -0,0 +1,271 @@
+"""Background imports of uploaded roster CSVs into the alumni table."""
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from .roster_reader import read_roster_chunks
+from .roster_sync import sync_alumni
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Address components of the registry export, also used to detect moves
+ADDRESS_FIELDS = ['Address 1', 'Address 2', 'City', 'State', 'Postal', 'Country']
+
+# Layout -> columns that identify it
+LAYOUTS = {
+    # Geocoded combo file (same as assets/combo.csv)
+    "combo": {'original_ID', 'original_First Name', 'original_Prim_Last', 'lat', 'lon'},
+    # Raw registry export; coordinates are optional and geocoded when missing
+    "export": {'First Name', 'Prim_Last'},
+}
+
+# Validation messages kept per import
+MAX_ISSUES = 20
+
+# Bytes per copy when spooling an upload to disk
+COPY_BUFFER = 1024 * 1024
+
+def detect_layout(columns):
+    """Return the layout name for a header; raises ValueError if none matches."""
+    for layout, required in LAYOUTS.items():
+        if required <= set(columns):
+            return layout
+    expected = "; ".join(f"{layout}: {sorted(required)}" for layout, required in LAYOUTS.items())
+    raise ValueError(f"Unrecognized roster columns, expected one of {expected}")
+
+def _text(chunk, column):
+    if column not in chunk.columns:
+        return pd.Series("", index=chunk.index, dtype=object)
+    return chunk[column].fillna('').astype(str).str.strip()
+
+def _join(parts):
+    """Join text columns row-wise with ', ', skipping blanks."""
+    joined = parts[0]
+    for part in parts[1:]:
+        joined = joined + np.where((joined != '') & (part != ''), ', ', '') + part
+    return joined
+
+def _prefer(first, fallback):
+    """``first`` where it is non-blank, else ``fallback``."""
+    return first.where(first != '', fallback)
+
+def _coordinates(chunk, lat_column, lon_column):
+    """Numeric coordinates with missing, out-of-range and (0, 0) values as NaN."""
+    lat = pd.to_numeric(chunk[lat_column], errors='coerce') if lat_column in chunk.columns else np.nan
+    lon = pd.to_numeric(chunk[lon_column], errors='coerce') if lon_column in chunk.columns else np.nan
+    coords = pd.DataFrame({'latitude': lat, 'longitude': lon}, index=chunk.index)
+    invalid = ~(coords['latitude'].between(-90, 90) & coords['longitude'].between(-180, 180))
+    invalid |= (coords['latitude'] == 0) & (coords['longitude'] == 0)
+    return coords.mask(invalid)
+
+def normalize_chunk(chunk, layout):
+    """Map one parsed chunk onto the alumni schema.
+
+    Returns ``(frame, skipped)`` where ``frame`` has ``source_id``, ``name``,
+    ``location``, ``latitude``/``longitude`` (NaN when unknown), the
+    region/cohort columns and, for exports, the address fields; ``skipped``
+    counts rows without a name.
+    """
+    if layout == "combo":
+        name = (_text(chunk, 'original_First Name') + ' ' + _text(chunk, 'original_Prim_Last')).str.strip()
+        frame = pd.DataFrame({
+            'source_id': _text(chunk, 'original_ID'),
+            'name': name,
+            'location': _join([_text(chunk, c) for c in ('original_City', 'original_State', 'original_Country')]),
+            # Geocoder-normalized region fields win over the originals, as in the CSV loader
+            'country': _prefer(_text(chunk, 'country_code').str.upper(), _text(chunk, 'original_Country')),
+            'state': _prefer(_text(chunk, 'state'), _text(chunk, 'original_State')),
+            'city': _prefer(_text(chunk, 'city'), _text(chunk, 'original_City')),
+            'class_year': _text(chunk, 'original_Pref Class Yr'),
+        })
+        frame = frame.join(_coordinates(chunk, 'lat', 'lon'))
+    else:
+        address = pd.DataFrame({field: _text(chunk, field) for field in ADDRESS_FIELDS})
+        name = (_text(chunk, 'First Name') + ' ' + _text(chunk, 'Prim_Last')).str.strip()
+        frame = pd.DataFrame({
+            'source_id': _text(chunk, 'ID'),
+            'name': name,
+            'location': _join([address[field] for field in ADDRESS_FIELDS]),
+            'country': address['Country'],
+            'state': address['State'],
+            'city': address['City'],
+            'class_year': _text(chunk, 'Pref Class Yr'),
+        }).join(address)
+        frame = frame.join(_coordinates(chunk, 'Latitude', 'Longitude'))
+
+    named = frame['name'] != ''
+    return frame[named], int((~named).sum())
+
+def nominatim_geocoder(user_agent="alumni_monitor"):
+    """Return ``geocode(row) -> (lat, lon) or None`` using Nominatim at one request per second."""
+    from geopy.extra.rate_limiter import RateLimiter
+    from geopy.geocoders import Nominatim
+
+    geocode = RateLimiter(Nominatim(user_agent=user_agent).geocode, min_delay_seconds=1,
+                          max_retries=2, swallow_exceptions=True)
+
+    def lookup(row):
+        queries = [row['location'], ', '.join(v for v in (row.get('City'), row.get('State'), row.get('Country')) if v)]
+        for query in dict.fromkeys(q for q in queries if q):
+            location = geocode(query, timeout=30)
+            if location:
+                return location.latitude, location.longitude
+        return None
+    return lookup
+
+def save_upload(uploaded_file, directory=None):
+    """Spool an uploaded file to a temporary CSV and return its path."""
+    uploaded_file.seek(0)
+    with tempfile.NamedTemporaryFile("wb", suffix=".csv", dir=directory, delete=False) as file:
+        shutil.copyfileobj(uploaded_file, file, COPY_BUFFER)
+    return file.name
+
+class ImportJob:
+    """One roster file parsed, geocoded and committed on a background thread.
+
+    The commit goes through ``sync_alumni`` (one transaction, or a staged
+    table swap on the first load), so readers see the old roster until it
+    lands. ``on_commit`` runs after a successful commit, e.g. to clear caches.
+    """
+
+    def __init__(self, path, geocoder=None, on_commit=None, engine=None, remove_file=True):
+        self.id = uuid.uuid4().hex[:8]
+        self.path = path
+        self.geocoder = geocoder
+        self.on_commit = on_commit
+        self.engine = engine
+        self.remove_file = remove_file
+        self.phase = "queued"
+        self.done = 0
+        self.total = None
+        self.layout = None
+        self.rows = 0
+        self.issues = []
+        self.result = None
+        self.error = None
+        self.started = time.time()
+        self.phase_started = self.started
+        self.finished = None
+        self._thread = threading.Thread(target=self._run, name=f"roster-import-{self.id}", daemon=True)
+
+    @property
+    def running(self):
+        return self.finished is None
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _progress(self, phase, done, total):
+        if phase != self.phase:
+            self.phase, self.phase_started = phase, time.time()
+        self.done, self.total = done, total
+
+    def _issue(self, message):
+        if len(self.issues) < MAX_ISSUES:
+            self.issues.append(message)
+
+    def fraction(self):
+        """Share of the current phase done, or None when its size is unknown."""
+        if not self.total:
+            return None
+        return min(1.0, self.done / self.total)
+
+    def eta(self):
+        """Estimated seconds left in the current phase, from its rate so far."""
+        if not self.total or not self.done:
+            return None
+        elapsed = time.time() - self.phase_started
+        return elapsed / self.done * (self.total - self.done)
+
+    def _geocode(self, row):
+        """File coordinates when valid, else the geocoder, else (0, 0) (skipped by alerts)."""
+        if pd.notna(row['latitude']) and pd.notna(row['longitude']):
+            return row['latitude'], row['longitude']
+        return self.geocoder(row) or (0.0, 0.0)
+
+    def _parse(self):
+        frames = []
+        skipped = 0
+        for chunk in read_roster_chunks(self.path):
+            if self.layout is None:
+                self.layout = detect_layout(chunk.columns)
+            frame, chunk_skipped = normalize_chunk(chunk, self.layout)
+            frames.append(frame)
+            skipped += chunk_skipped
+            self.rows += len(frame)
+            self._progress("parsing", self.rows, None)
+        if not frames:
+            raise ValueError("The file has no roster rows")
+
+        roster = pd.concat(frames, ignore_index=True)
+        if skipped:
+            self._issue(f"Skipped {skipped} rows without a name")
+        blank = roster['source_id'] == ''
+        if blank.any():
+            self._issue(f"{int(blank.sum())} rows have no ID and are matched on their content")
+        duplicates = int(roster.loc[~blank, 'source_id'].duplicated().sum())
+        if duplicates:
+            self._issue(f"{duplicates} rows repeat an earlier ID; the last one wins")
+        missing = int(roster['latitude'].isna().sum())
+        if missing:
+            action = "geocoded" if self.geocoder is not None else "stored without coordinates"
+            self._issue(f"{missing} rows have no usable coordinates and will be {action}")
+        return roster
+
+    def _run(self):
+        try:
+            roster = self._parse()
+            # Combo coordinates are part of the address, so a changed position counts as a move
+            address_columns = ADDRESS_FIELDS if self.layout == "export" else ("location", "latitude", "longitude")
+            geocode = self._geocode
+            if self.geocoder is None:
+                # Nothing to look up: keep the file's coordinates as they are
+                roster[['latitude', 'longitude']] = roster[['latitude', 'longitude']].fillna(0.0)
+                geocode = None
+            self.result = sync_alumni(roster, geocode=geocode, address_columns=address_columns,
+                                      engine=self.engine, progress=self._progress)
+            if self.on_commit is not None:
+                self.on_commit()
+            self._progress("done", 1, 1)
+            logger.info(f"Roster import {self.id} committed: {self.result}")
+        except Exception as e:
+            logger.exception(f"Roster import {self.id} failed")
+            self.error = str(e)
+            self._progress("failed", 0, None)
+        finally:
+            self.finished = time.time()
+            if self.remove_file:
+                try:
+                    os.remove(self.path)
+                except OSError:
+                    pass
+
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+def start_import(path, **options):
+    """Start an ``ImportJob`` unless one is already running in this process."""
+    with _jobs_lock:
+        running = [job for job in _jobs.values() if job.running]
+        if running:
+            raise RuntimeError(f"Import {running[0].id} is still running")
+        job = ImportJob(path, **options)
+        _jobs[job.id] = job
+    return job.start()
+
+def get_job(job_id):
+    """Return the job with ``job_id`` (None if unknown)."""
+    return _jobs.get(job_id)
+
+def running_job():
+    """Return the import running in this process, if any."""
+    return next((job for job in _jobs.values() if job.running), None)
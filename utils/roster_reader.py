@@ -0,0 +1,94 @@
+"""Shared roster CSV reader with sample-based encoding detection and chunked parsing."""
+import hashlib
+import logging
+import os
+
+import pandas as pd
+from chardet.universaldetector import UniversalDetector
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Bytes fed to the encoding detector at most
+SAMPLE_SIZE = 256 * 1024
+DETECT_BLOCK_SIZE = 16 * 1024
+
+# Rows per chunk yielded to the cleaning and loading stages
+CHUNK_SIZE = 50_000
+
+# Identifier-like roster columns kept as text so leading zeros survive
+ROSTER_DTYPES = {
+    'ID': str,
+    'Postal': str,
+    'Phone': str,
+    'original_ID': str,
+    'original_Pref Class Yr': str,
+    'original_Postal': str,
+    'original_Phone': str,
+    'postcode': str,
+    'state_code': str,
+    'country_code': str,
+}
+
+# Encoding detection results keyed by file fingerprint
+_encoding_cache = {}
+
+def _fingerprint(path, sample):
+    """Hash the file size and leading sample as a cheap content key."""
+    digest = hashlib.sha1(sample)
+    digest.update(str(os.path.getsize(path)).encode())
+    return digest.hexdigest()
+
+def detect_encoding(path, sample_size=SAMPLE_SIZE):
+    """Detect a file's encoding from a bounded sample, cached per file hash."""
+    with open(path, 'rb') as file:
+        sample = file.read(sample_size)
+
+    key = _fingerprint(path, sample)
+    if key in _encoding_cache:
+        return _encoding_cache[key]
+
+    detector = UniversalDetector()
+    for start in range(0, len(sample), DETECT_BLOCK_SIZE):
+        detector.feed(sample[start:start + DETECT_BLOCK_SIZE])
+        if detector.done:
+            break
+    detector.close()
+
+    encoding = detector.result.get('encoding') or 'utf-8'
+    # A pure-ASCII sample says nothing about later bytes; UTF-8 is a superset
+    if encoding.lower() == 'ascii':
+        encoding = 'utf-8'
+
+    logger.info(f"Detected encoding {encoding} for {path} "
+                f"(confidence {detector.result.get('confidence', 0):.2f})")
+    _encoding_cache[key] = encoding
+    return encoding
+
+def has_banner_row(path, encoding):
+    """Check for the single-word banner line (e.g. 'combo') above the header."""
+    with open(path, encoding=encoding, errors='replace') as file:
+        first_line = file.readline().strip()
+    return bool(first_line) and ',' not in first_line
+
+def read_roster_chunks(path, chunksize=CHUNK_SIZE, usecols=None, encoding=None):
+    """Yield a roster CSV as typed DataFrame chunks."""
+    encoding = encoding or detect_encoding(path)
+    reader = pd.read_csv(
+        path,
+        encoding=encoding,
+        skiprows=1 if has_banner_row(path, encoding) else 0,
+        dtype=ROSTER_DTYPES,
+        usecols=usecols,
+        chunksize=chunksize
+    )
+    with reader:
+        for chunk in reader:
+            yield chunk
+
+def read_roster(path, usecols=None, encoding=None):
+    """Read a whole roster CSV through the chunked reader."""
+    chunks = list(read_roster_chunks(path, usecols=usecols, encoding=encoding))
+    if not chunks:
+        return pd.DataFrame()
+    return pd.concat(chunks, ignore_index=True)
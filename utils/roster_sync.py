@@ -0,0 +1,211 @@
+"""Diff-based roster imports keyed on the source ID and a per-row content hash."""
+import hashlib
+import logging
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy import bindparam, inspect, select
+
+from .bulk_loader import BATCH_SIZE, bulk_load_alumni
+from .database import Alumni, get_engine, upgrade_alumni_table
+from .spatial import add_spatial_keys
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Columns maintained by the importer rather than supplied by the source file
+DERIVED_COLUMNS = {"source_id", "row_hash", "address_hash", "last_updated", "lat_bucket", "lon_bucket"}
+
+# Prefix of the content-derived keys given to rows without a source ID
+CONTENT_KEY_PREFIX = "row:"
+
+def hash_rows(df, columns):
+    """Return a stable SHA-1 hex digest per row over ``columns``."""
+    values = df[list(columns)].astype(object).where(df[list(columns)].notna(), "")
+    return pd.Series(
+        [
+            hashlib.sha1("\x1f".join(str(v) for v in row).encode("utf-8")).hexdigest()
+            for row in values.itertuples(index=False, name=None)
+        ],
+        index=df.index,
+        dtype=object
+    )
+
+def add_hashes(incoming, address_columns):
+    """Attach ``row_hash`` and ``address_hash`` columns to an incoming roster.
+
+    Rows with a blank or missing ``source_id`` are keyed on their row hash,
+    so they stay distinct from each other and stable across imports
+    (editing such a row replaces it rather than updating it).
+    """
+    content_columns = sorted(c for c in incoming.columns if c not in DERIVED_COLUMNS)
+    incoming = incoming.copy()
+    incoming["row_hash"] = hash_rows(incoming, content_columns)
+    incoming["address_hash"] = hash_rows(incoming, address_columns)
+    source_ids = incoming["source_id"].fillna("").astype(str).str.strip()
+    missing = source_ids == ""
+    if missing.any():
+        logger.warning(f"{int(missing.sum())} rows have no source ID; keying them on their content")
+    incoming["source_id"] = source_ids.where(~missing, CONTENT_KEY_PREFIX + incoming["row_hash"])
+    return incoming
+
+def diff_roster(incoming, stored):
+    """Split an incoming roster into inserts, updates and deletes against stored hashes.
+
+    Both frames are keyed on ``source_id``; ``stored`` needs ``row_hash`` and
+    ``address_hash``. Updates carry an ``address_changed`` flag.
+    """
+    stored_keys = stored[["source_id", "row_hash", "address_hash", "latitude", "longitude"]].rename(
+        columns=lambda c: c if c == "source_id" else f"{c}_stored"
+    )
+    merged = incoming.merge(stored_keys, on="source_id", how="left", indicator=True)
+    inserts = merged[merged["_merge"] == "left_only"]
+    existing = merged[merged["_merge"] == "both"]
+    updates = existing[existing["row_hash"] != existing["row_hash_stored"]].copy()
+    updates["address_changed"] = updates["address_hash"] != updates["address_hash_stored"]
+    deletes = stored.loc[~stored["source_id"].isin(incoming["source_id"]), "source_id"]
+    return inserts, updates, deletes
+
+def _geocode_rows(frame, geocode, progress=None, offset=0, total=None):
+    """Fill ``latitude``/``longitude`` for every row in ``frame`` using ``geocode``.
+
+    ``progress`` counts rows from ``offset`` out of ``total`` (default: this frame).
+    """
+    coords = []
+    for _, row in frame.iterrows():
+        coords.append(geocode(row))
+        if progress is not None:
+            progress("geocoding", offset + len(coords), total or len(frame))
+    frame = frame.copy()
+    frame["latitude"] = [c[0] for c in coords]
+    frame["longitude"] = [c[1] for c in coords]
+    return frame
+
+def _table_columns():
+    return [column.name for column in Alumni.__table__.columns if column.name != "id"]
+
+def _records(frame):
+    columns = [c for c in _table_columns() if c in frame.columns]
+    frame = frame[columns]
+    return frame.astype(object).where(frame.notna(), None).to_dict("records")
+
+def _load_stored(conn):
+    """Read the keys and hashes of the stored roster."""
+    table = Alumni.__table__
+    rows = conn.execute(
+        select(table.c.source_id, table.c.row_hash, table.c.address_hash,
+               table.c.latitude, table.c.longitude)
+    ).all()
+    return pd.DataFrame(rows, columns=["source_id", "row_hash", "address_hash", "latitude", "longitude"])
+
+def _supports_diff(engine):
+    """Check whether the live alumni table has the diff columns, filled for every row.
+
+    Tables upgraded in place (see ``upgrade_alumni_table``) keep rows without
+    hashes until one full load has written them.
+    """
+    insp = inspect(engine)
+    if not insp.has_table(Alumni.__tablename__):
+        return False
+    columns = {column["name"] for column in insp.get_columns(Alumni.__tablename__)}
+    if not {"source_id", "row_hash", "address_hash"} <= columns:
+        return False
+    table = Alumni.__table__
+    with engine.connect() as conn:
+        unhashed = conn.execute(select(table.c.id).where(table.c.row_hash.is_(None)).limit(1)).first()
+    return unhashed is None
+
+def sync_alumni(incoming, geocode=None, address_columns=("location",), engine=None, progress=None,
+                delete_missing=True):
+    """Apply only the inserts, updates and deletes needed to match ``incoming``.
+
+    ``incoming`` must carry a ``source_id`` column plus the roster fields.
+    With ``delete_missing=False`` stored rows absent from ``incoming`` are
+    kept, so a partial roster is upserted rather than mirrored.
+    ``geocode`` is called with a row for new rows and rows whose address
+    fields changed; unchanged addresses keep their stored coordinates.
+    ``progress(phase, done, total)`` is called as rows are geocoded and
+    around the database write. Returns a dict of change counts, including
+    the ``duplicates`` dropped because a later row had the same source ID.
+    """
+    engine = engine or get_engine()
+    if engine is None:
+        raise RuntimeError("No database engine available for roster sync")
+
+    incoming = add_hashes(incoming, address_columns)
+    duplicates = int(incoming["source_id"].duplicated(keep="last").sum())
+    if duplicates:
+        logger.warning(f"Dropped {duplicates} rows that repeat a later row's source ID")
+        incoming = incoming.drop_duplicates(subset="source_id", keep="last")
+    now = datetime.now()
+
+    if not _supports_diff(engine):
+        if not delete_missing and inspect(engine).has_table(Alumni.__tablename__):
+            # The full load below replaces the table, which would drop the stored rows
+            raise RuntimeError("The alumni table predates roster sync; run a full import before upserting")
+        # First import (or a table that predates the hash columns): full load
+        logger.info("Alumni table has no stored hashes, running a full bulk load")
+        if geocode is not None:
+            incoming = _geocode_rows(incoming, geocode, progress)
+        incoming["last_updated"] = now
+        if progress is not None:
+            progress("writing", 0, 1)
+        count = bulk_load_alumni(incoming, engine=engine)
+        return {"inserted": count, "updated": 0, "deleted": 0, "geocoded": count if geocode else 0,
+                "duplicates": duplicates}
+
+    # Older tables gain the newer columns; the changed row hashes then refill them
+    upgrade_alumni_table(engine)
+    with engine.connect() as conn:
+        stored = _load_stored(conn)
+    inserts, updates, deletes = diff_roster(incoming, stored)
+    if not delete_missing:
+        deletes = deletes.iloc[:0]
+
+    geocoded = 0
+    if geocode is not None:
+        moved = updates[updates["address_changed"]]
+        # One progress range across new and moved rows
+        total = len(inserts) + len(moved)
+        inserts = _geocode_rows(inserts, geocode, progress, 0, total)
+        moved = _geocode_rows(moved, geocode, progress, len(inserts), total)
+        kept = updates[~updates["address_changed"]].copy()
+        kept["latitude"] = kept["latitude_stored"]
+        kept["longitude"] = kept["longitude_stored"]
+        updates = pd.concat([moved, kept])
+        geocoded = len(inserts) + len(moved)
+
+    inserts = add_spatial_keys(inserts.assign(last_updated=now))
+    updates = add_spatial_keys(updates.assign(last_updated=now))
+
+    table = Alumni.__table__
+    update_stmt = table.update().where(table.c.source_id == bindparam("b_source_id"))
+    delete_stmt = table.delete().where(table.c.source_id == bindparam("b_source_id"))
+
+    if progress is not None:
+        progress("writing", 0, 1)
+    with engine.begin() as conn:
+        delete_keys = [{"b_source_id": key} for key in deletes]
+        for start in range(0, len(delete_keys), BATCH_SIZE):
+            conn.execute(delete_stmt, delete_keys[start:start + BATCH_SIZE])
+
+        update_records = [
+            {**{k: v for k, v in record.items() if k != "source_id"}, "b_source_id": record["source_id"]}
+            for record in _records(updates)
+        ]
+        for start in range(0, len(update_records), BATCH_SIZE):
+            conn.execute(update_stmt, update_records[start:start + BATCH_SIZE])
+
+        insert_records = _records(inserts)
+        for start in range(0, len(insert_records), BATCH_SIZE):
+            conn.execute(table.insert(), insert_records[start:start + BATCH_SIZE])
+
+    result = {
+        "inserted": len(inserts),
+        "updated": len(updates),
+        "deleted": len(deletes),
+        "geocoded": geocoded,
+        "duplicates": duplicates
+    }
+    logger.info(f"Roster sync complete: {result}")
+    return result
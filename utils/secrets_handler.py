@@ -1,20 +1,53 @@
 import os
-import streamlit as st
+import sys
+
+# Secrets file read directly when Streamlit is not loaded (headless jobs)
+SECRETS_FILE = os.path.join(".streamlit", "secrets.toml")
+
+def _file_secrets():
+    """Parse the local secrets.toml without importing Streamlit."""
+    try:
+        import tomllib
+    except ImportError:
+        return {}
+    try:
+        with open(SECRETS_FILE, "rb") as file:
+            return tomllib.load(file)
+    except (OSError, ValueError):
+        return {}
+
+def read_secret(*keys):
+    """Look up a (possibly nested) secret, or None if it is not configured.
+
+    Uses st.secrets when Streamlit is already loaded and otherwise reads
+    .streamlit/secrets.toml, so scripts never import Streamlit just for this.
+    """
+    st = sys.modules.get("streamlit")
+    if st is not None:
+        try:
+            if not st.secrets.load_if_toml_exists():
+                return None
+            value = st.secrets
+        except Exception:
+            return None
+    else:
+        value = _file_secrets()
+
+    for key in keys:
+        try:
+            value = value[key]
+        except (KeyError, TypeError):
+            return None
+    return value
 
 def get_db_url():
     """Get database URL from Streamlit secrets or environment variables"""
-    # Try Streamlit secrets first (works locally and on Streamlit Cloud)
-    try:
-        return st.secrets["postgres"]["url"]
-    except Exception:
-        # Try environment variables (works on Hugging Face)
-        return os.environ.get("POSTGRES_URL")
+    # Same lookup order as the shared engine registry
+    from utils.database import get_connection_string
+    return get_connection_string()
         
 def get_nasa_api_key():
     """Get NASA API key from Streamlit secrets or environment variables"""
-    # Try Streamlit secrets
-    try:
-        return st.secrets["nasa"]["api_key"]
-    except Exception:
-        # Try environment variables
-        return os.environ.get("NASA_API_KEY")
\ No newline at end of file
+    # Nested [nasa] api_key first, then a flat NASA_API_KEY secret or env var
+    return (read_secret("nasa", "api_key") or read_secret("NASA_API_KEY")
+            or os.environ.get("NASA_API_KEY"))
@@ -0,0 +1,252 @@
+"""Spatial index keys and in-database proximity queries for alumni and events."""
+import logging
+import math
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import and_, func, literal, not_, or_, select, text
+
+from .database import Alumni, DisasterEvent, get_engine
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Mean Earth radius used by the great-circle formula
+EARTH_RADIUS_KM = 6371.0088
+
+# Size of one grid cell of the lat/lon bucket index
+BUCKET_DEGREES = 1.0
+
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180.0
+
+# Roster columns holding each alumni's 3-D unit vector on the sphere
+UNIT_COLUMNS = ["UX", "UY", "UZ"]
+
+def spatial_keys(latitude, longitude):
+    """Return integer lat/lon bucket arrays for coordinate arrays."""
+    lat = np.asarray(latitude, dtype=float)
+    lon = np.asarray(longitude, dtype=float)
+    return np.floor(lat / BUCKET_DEGREES), np.floor(lon / BUCKET_DEGREES)
+
+def add_spatial_keys(df, lat_col="latitude", lon_col="longitude"):
+    """Return a copy of ``df`` with ``lat_bucket``/``lon_bucket`` columns."""
+    lat_bucket, lon_bucket = spatial_keys(
+        pd.to_numeric(df[lat_col], errors="coerce"),
+        pd.to_numeric(df[lon_col], errors="coerce")
+    )
+    return df.assign(
+        lat_bucket=pd.array(lat_bucket, dtype="Int64"),
+        lon_bucket=pd.array(lon_bucket, dtype="Int64")
+    )
+
+def unit_vectors(latitude, longitude, dtype=np.float32):
+    """Return a C-contiguous ``(n, 3)`` array of unit vectors for coordinate arrays.
+
+    The dot product of two vectors is the cosine of their central angle, so
+    proximity tests become a matrix product instead of per-pair trigonometry.
+    """
+    lat = np.radians(np.asarray(latitude, dtype=float))
+    lon = np.radians(np.asarray(longitude, dtype=float))
+    cos_lat = np.cos(lat)
+    vectors = np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+    return np.ascontiguousarray(vectors, dtype=dtype)
+
+def add_unit_vectors(df, lat_col="Latitude", lon_col="Longitude"):
+    """Return a copy of ``df`` with float32 ``UX``/``UY``/``UZ`` columns."""
+    vectors = unit_vectors(
+        pd.to_numeric(df[lat_col], errors="coerce"),
+        pd.to_numeric(df[lon_col], errors="coerce")
+    )
+    return df.assign(**{column: vectors[:, i] for i, column in enumerate(UNIT_COLUMNS)})
+
+def bounding_box(lat, lon, radius_km):
+    """Return ``(lat_min, lat_max, lon_ranges)`` enclosing a search circle.
+
+    ``lon_ranges`` is split in two when the box crosses the antimeridian and
+    covers every longitude when the circle reaches a pole.
+    """
+    lat_delta = radius_km / KM_PER_DEGREE
+    lat_min, lat_max = lat - lat_delta, lat + lat_delta
+    if lat_min <= -90 or lat_max >= 90:
+        return max(lat_min, -90.0), min(lat_max, 90.0), [(-180.0, 180.0)]
+
+    lon_delta = math.degrees(math.asin(min(1.0, math.sin(radius_km / EARTH_RADIUS_KM) /
+                                                  math.cos(math.radians(lat)))))
+    lon_min, lon_max = lon - lon_delta, lon + lon_delta
+    if lon_min < -180:
+        return lat_min, lat_max, [(lon_min + 360, 180.0), (-180.0, lon_max)]
+    if lon_max > 180:
+        return lat_min, lat_max, [(lon_min, 180.0), (-180.0, lon_max - 360)]
+    return lat_min, lat_max, [(lon_min, lon_max)]
+
+def _haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km, registered as an SQLite function."""
+    if None in (lat1, lon1, lat2, lon2):
+        return None
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lon2 - lon1)
+    h = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
+
+def _has_postgis(conn):
+    if conn.dialect.name != "postgresql":
+        return False
+    return bool(conn.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'postgis'")).scalar())
+
+def _point_geography(lat_col, lon_col):
+    return func.geography(func.ST_SetSRID(func.ST_MakePoint(lon_col, lat_col), 4326))
+
+def _distance_expr(conn, table, lat, lon, postgis):
+    """Build a SQL expression for the distance in km from ``(lat, lon)``."""
+    if postgis:
+        return func.ST_Distance(
+            _point_geography(table.c.latitude, table.c.longitude),
+            _point_geography(literal(lat), literal(lon))
+        ) / 1000.0
+
+    if conn.dialect.name == "sqlite":
+        conn.connection.driver_connection.create_function(
+            "haversine_km", 4, _haversine_km, deterministic=True
+        )
+        return func.haversine_km(table.c.latitude, table.c.longitude, lat, lon)
+
+    # Portable haversine for servers without PostGIS
+    phi1 = func.radians(table.c.latitude)
+    phi2 = math.radians(lat)
+    h = (func.power(func.sin((phi2 - phi1) / 2), 2) +
+         func.cos(phi1) * math.cos(phi2) *
+         func.power(func.sin((math.radians(lon) - func.radians(table.c.longitude)) / 2), 2))
+    return 2 * EARTH_RADIUS_KM * func.asin(func.least(1.0, func.sqrt(h)))
+
+def _valid_coords(table):
+    """Rows with usable coordinates; (0, 0) is the loaders' placeholder for unknown locations."""
+    return and_(
+        not_(and_(table.c.latitude == 0, table.c.longitude == 0)),
+        table.c.latitude.between(-90, 90),
+        table.c.longitude.between(-180, 180)
+    )
+
+def _within_filter(conn, table, lat, lon, radius_km, distance, postgis):
+    """Combine the bucket/box prefilter with the exact distance test."""
+    lat_min, lat_max, lon_ranges = bounding_box(lat, lon, radius_km)
+    lat_buckets = spatial_keys([lat_min, lat_max], [0, 0])[0]
+    box = [
+        table.c.lat_bucket.between(int(lat_buckets[0]), int(lat_buckets[1])),
+        table.c.latitude.between(lat_min, lat_max),
+        or_(*[
+            and_(
+                table.c.lon_bucket.between(*(int(b) for b in spatial_keys([0, 0], [lo, hi])[1])),
+                table.c.longitude.between(lo, hi)
+            )
+            for lo, hi in lon_ranges
+        ])
+    ]
+    if postgis:
+        # Lets the planner use the GiST index from ensure_spatial_index
+        exact = func.ST_DWithin(
+            _point_geography(table.c.latitude, table.c.longitude),
+            _point_geography(literal(lat), literal(lon)),
+            radius_km * 1000.0
+        )
+        return and_(exact, *box)
+    return and_(distance <= radius_km, *box)
+
+def ensure_spatial_index(engine=None):
+    """Create a PostGIS geography GiST index on alumni when PostGIS is installed."""
+    engine = engine or get_engine()
+    if engine is None:
+        return False
+    with engine.begin() as conn:
+        if not _has_postgis(conn):
+            return False
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_alumni_geography ON alumni USING GIST "
+            "((geography(ST_SetSRID(ST_MakePoint(longitude, latitude), 4326))))"
+        ))
+    logger.info("PostGIS geography index ensured on alumni")
+    return True
+
+def alumni_within_radius(lat, lon, radius_km, engine=None):
+    """Return alumni within ``radius_km`` of a point, nearest first.
+
+    The bucket columns narrow the scan to the surrounding grid cells and the
+    great-circle distance is evaluated in SQL, so only hits leave the database.
+    """
+    engine = engine or get_engine()
+    if engine is None:
+        return None
+
+    table = Alumni.__table__
+    with engine.connect() as conn:
+        postgis = _has_postgis(conn)
+        distance = _distance_expr(conn, table, lat, lon, postgis).label("distance_km")
+        query = (
+            select(table.c.id, table.c.name, table.c.location,
+                   table.c.latitude, table.c.longitude, distance)
+            .where(_valid_coords(table), _within_filter(conn, table, lat, lon, radius_km, distance, postgis))
+            .order_by(distance)
+        )
+        rows = conn.execute(query).all()
+
+    return pd.DataFrame(rows, columns=["id", "Name", "Location", "Latitude", "Longitude", "Distance_km"])
+
+def alumni_near_event(eonet_id, radius_km, engine=None):
+    """Return alumni within ``radius_km`` of a stored disaster event."""
+    engine = engine or get_engine()
+    if engine is None:
+        return None
+
+    with engine.connect() as conn:
+        event = conn.execute(
+            select(DisasterEvent.latitude, DisasterEvent.longitude)
+            .where(DisasterEvent.eonet_id == eonet_id)
+        ).first()
+    if event is None:
+        logger.warning(f"Disaster event {eonet_id} not found")
+        return None
+    return alumni_within_radius(event.latitude, event.longitude, radius_km, engine=engine)
+
+def _parse_date(value):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+def save_disaster_events(events, engine=None):
+    """Persist EONET events (first geometry point) with their spatial keys."""
+    engine = engine or get_engine()
+    if engine is None:
+        return 0
+
+    rows = []
+    for event in events:
+        try:
+            geometry = event["geometry"][0]
+            lon, lat = float(geometry["coordinates"][0]), float(geometry["coordinates"][1])
+        except (KeyError, IndexError, ValueError, TypeError):
+            continue
+        lat_bucket, lon_bucket = spatial_keys([lat], [lon])
+        rows.append({
+            "eonet_id": event["id"],
+            "title": event["title"],
+            "disaster_type": event["categories"][0]["title"],
+            "latitude": lat,
+            "longitude": lon,
+            "start_date": _parse_date(geometry.get("date")),
+            "end_date": _parse_date(event.get("closed")),
+            "lat_bucket": int(lat_bucket[0]),
+            "lon_bucket": int(lon_bucket[0])
+        })
+    if not rows:
+        return 0
+
+    table = DisasterEvent.__table__
+    table.create(engine, checkfirst=True)
+    with engine.begin() as conn:
+        conn.execute(table.delete().where(table.c.eonet_id.in_([row["eonet_id"] for row in rows])))
+        conn.execute(table.insert(), rows)
+    return len(rows)
@@ -0,0 +1,98 @@
+"""Import-time measurement for keeping the app's cold start small."""
+import subprocess
+import sys
+
+# Modules loaded before the safe-mode page can paint
+SAFE_MODE_MODULES = ["streamlit", "utils.helpers"]
+
+# Heavy dependencies that only the full application needs
+FULL_MODE_MODULES = [
+    "pandas",
+    "sqlalchemy",
+    "utils.data_loader",
+    "utils.disaster_monitor",
+    "utils.map_handler",
+    "folium",
+    "geopy.distance",
+    "streamlit_folium",
+]
+
+def parse_importtime(output):
+    """Parse ``python -X importtime`` output into per-module timings.
+
+    Returns a list of dicts with ``module``, ``self_ms``, ``cumulative_ms``
+    and ``depth`` (0 for modules imported directly by the measured code).
+    """
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us = int(parts[0].strip())
+            cumulative_us = int(parts[1].strip())
+        except ValueError:
+            continue  # header line
+        name = parts[2].rstrip()
+        stripped = name.lstrip()
+        rows.append({
+            "module": stripped,
+            "self_ms": self_us / 1000,
+            "cumulative_ms": cumulative_us / 1000,
+            "depth": (len(name) - len(stripped) - 1) // 2
+        })
+    return rows
+
+def measure_import_times(modules, python=sys.executable, cwd=None):
+    """Import ``modules`` in order in a fresh interpreter and time each one.
+
+    Each module's cost is what it adds on top of the ones before it, which
+    matches how the app pays for them at startup.
+    """
+    code = "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=cwd
+    )
+    timings = parse_importtime(result.stderr)
+    top_level = {t["module"]: t for t in timings if t["depth"] == 0}
+
+    report = []
+    for module in modules:
+        root = module
+        # A submodule's parent package can absorb the cost (e.g. geopy for geopy.distance)
+        while root not in top_level and "." in root:
+            root = root.rsplit(".", 1)[0]
+        entry = top_level.get(root)
+        report.append({
+            "module": module,
+            "cumulative_ms": round(entry["cumulative_ms"], 1) if entry else 0.0,
+            "self_ms": round(entry["self_ms"], 1) if entry else 0.0
+        })
+    return report
+
+def import_time_report(python=sys.executable, cwd=None):
+    """Return import costs for the safe-mode and full-mode module sets."""
+    safe = measure_import_times(SAFE_MODE_MODULES, python=python, cwd=cwd)
+    full = measure_import_times(SAFE_MODE_MODULES + FULL_MODE_MODULES, python=python, cwd=cwd)
+    return {
+        "safe_mode": safe,
+        "safe_mode_total_ms": round(sum(r["cumulative_ms"] for r in safe), 1),
+        "full_mode": full[len(SAFE_MODE_MODULES):],
+        "full_mode_extra_ms": round(sum(r["cumulative_ms"] for r in full[len(SAFE_MODE_MODULES):]), 1)
+    }
+
+if __name__ == "__main__":
+    report = import_time_report()
+    print("Safe mode imports:")
+    for row in report["safe_mode"]:
+        print(f"  {row['module']:<28} {row['cumulative_ms']:>9.1f} ms")
+    print(f"  {'total':<28} {report['safe_mode_total_ms']:>9.1f} ms")
+    print("\nFull mode adds:")
+    for row in report["full_mode"]:
+        print(f"  {row['module']:<28} {row['cumulative_ms']:>9.1f} ms")
+    print(f"  {'total':<28} {report['full_mode_extra_ms']:>9.1f} ms")
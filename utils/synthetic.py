@@ -0,0 +1,156 @@
+"""Parametric synthetic rosters and EONET-shaped events for load and benchmark runs."""
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+# Population centres with relative weights; most alumni cluster in a few regions
+CITY_WEIGHTS = [
+    # (city, state, state_code, country, country_code, lat, lon, weight)
+    ("Tokyo", "Tokyo", "13", "Japan", "jp", 35.6762, 139.6503, 30),
+    ("Osaka", "Osaka", "27", "Japan", "jp", 34.6937, 135.5023, 10),
+    ("San Francisco", "California", "CA", "United States", "us", 37.7749, -122.4194, 12),
+    ("Los Angeles", "California", "CA", "United States", "us", 34.0522, -118.2437, 10),
+    ("New York", "New York", "NY", "United States", "us", 40.7128, -74.0060, 12),
+    ("Seattle", "Washington", "WA", "United States", "us", 47.6062, -122.3321, 5),
+    ("Honolulu", "Hawaii", "HI", "United States", "us", 21.3069, -157.8583, 3),
+    ("London", "England", "ENG", "United Kingdom", "gb", 51.5074, -0.1278, 5),
+    ("Sydney", "New South Wales", "NSW", "Australia", "au", -33.8688, 151.2093, 4),
+    ("Sao Paulo", "Sao Paulo", "SP", "Brazil", "br", -23.5505, -46.6333, 3),
+    ("Singapore", "Singapore", "SG", "Singapore", "sg", 1.3521, 103.8198, 3),
+    ("Jakarta", "Jakarta", "JK", "Indonesia", "id", -6.2088, 106.8456, 3),
+]
+
+# EONET categories as (id, title)
+EVENT_CATEGORIES = [
+    ("wildfires", "Wildfires"),
+    ("severeStorms", "Severe Storms"),
+    ("volcanoes", "Volcanoes"),
+    ("earthquakes", "Earthquakes"),
+]
+
+COMBO_COLUMNS = [
+    "original_ID", "original_Pref Class Yr", "original_First Name", "original_Prim_Last",
+    "original_Pref_First", "original_Pref_Last", "original_Address 1", "original_Address 2",
+    "original_City", "original_State", "original_Postal", "original_Country",
+    "original_Phone", "original_Email", "lat", "lon", "postcode", "city", "county",
+    "state", "state_code", "country", "country_code",
+]
+
+FIRST_NAMES = np.array(["Aiko", "Ben", "Chen", "Diana", "Emi", "Felix", "Grace", "Hiro",
+                        "Isla", "Jun", "Kenji", "Lena", "Mai", "Noah", "Olivia", "Ren"])
+LAST_NAMES = np.array(["Abe", "Brown", "Chan", "Davis", "Endo", "Fujita", "Garcia", "Hayashi",
+                       "Ito", "Jones", "Kato", "Lee", "Mori", "Nakamura", "Ono", "Smith"])
+
+def generate_alumni(n, invalid_share=0.02, seed=0, start_id=100001):
+    """Return ``n`` alumni rows in ``combo.csv`` format.
+
+    Locations are drawn from weighted population centres with a heavy-tailed
+    spread, and ``invalid_share`` of rows get missing or zero coordinates.
+    """
+    rng = np.random.default_rng(seed)
+    weights = np.array([c[-1] for c in CITY_WEIGHTS], dtype=float)
+    city_idx = rng.choice(len(CITY_WEIGHTS), size=n, p=weights / weights.sum())
+    cities = [CITY_WEIGHTS[i] for i in city_idx]
+
+    centre_lat = np.array([c[5] for c in cities])
+    centre_lon = np.array([c[6] for c in cities])
+    # Student-t spread: most alumni near the centre, some far out in the region
+    lat = np.clip(centre_lat + 0.5 * rng.standard_t(3, size=n), -89.9, 89.9)
+    lon = (centre_lon + 0.5 * rng.standard_t(3, size=n) + 180.0) % 360.0 - 180.0
+
+    invalid = rng.random(n) < invalid_share
+    zero = invalid & (rng.random(n) < 0.5)
+    lat = np.where(invalid, np.nan, lat)
+    lon = np.where(invalid, np.nan, lon)
+    lat[zero] = 0.0
+    lon[zero] = 0.0
+
+    ids = np.arange(start_id, start_id + n)
+    first = FIRST_NAMES[rng.integers(len(FIRST_NAMES), size=n)]
+    last = LAST_NAMES[rng.integers(len(LAST_NAMES), size=n)]
+    postal = rng.integers(10000, 99999, size=n).astype(str)
+
+    return pd.DataFrame({
+        "original_ID": ids.astype(str),
+        "original_Pref Class Yr": rng.integers(1970, 2025, size=n).astype(str),
+        "original_First Name": first,
+        "original_Prim_Last": last,
+        "original_Pref_First": first,
+        "original_Pref_Last": last,
+        "original_Address 1": [f"{i % 999 + 1} Main St" for i in range(n)],
+        "original_Address 2": "",
+        "original_City": [c[0] for c in cities],
+        "original_State": [c[2] for c in cities],
+        "original_Postal": postal,
+        "original_Country": [c[3] for c in cities],
+        "original_Phone": [f"555-{i % 10000:04d}" for i in range(n)],
+        "original_Email": [f"alumni{i}@example.com" for i in ids],
+        "lat": lat,
+        "lon": lon,
+        "postcode": postal,
+        "city": [c[0] for c in cities],
+        "county": "",
+        "state": [c[1] for c in cities],
+        "state_code": [c[2] for c in cities],
+        "country": [c[3] for c in cities],
+        "country_code": [c[4] for c in cities],
+    }, columns=COMBO_COLUMNS)
+
+def generate_events(m, seed=0, max_points=5, start=None):
+    """Return ``m`` EONET-shaped events, each with a 1..``max_points`` point track.
+
+    Events are placed near the roster's population centres so proximity
+    alerts actually fire.
+    """
+    rng = np.random.default_rng(seed)
+    start = start or datetime(2024, 1, 1)
+    events = []
+    for i in range(m):
+        city = CITY_WEIGHTS[rng.integers(len(CITY_WEIGHTS))]
+        category_id, category_title = EVENT_CATEGORIES[rng.integers(len(EVENT_CATEGORIES))]
+        lat = float(np.clip(city[5] + rng.normal(0, 3), -89.9, 89.9))
+        lon = float((city[6] + rng.normal(0, 3) + 180.0) % 360.0 - 180.0)
+        when = start + timedelta(hours=int(rng.integers(0, 24 * 365)))
+
+        geometry = []
+        for _ in range(int(rng.integers(1, max_points + 1))):
+            geometry.append({
+                "date": when.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "type": "Point",
+                "coordinates": [round(lon, 4), round(lat, 4)]
+            })
+            # Tracks drift a little between observations
+            lat = float(np.clip(lat + rng.normal(0, 0.3), -89.9, 89.9))
+            lon = float((lon + rng.normal(0, 0.3) + 180.0) % 360.0 - 180.0)
+            when += timedelta(hours=int(rng.integers(3, 24)))
+
+        events.append({
+            "id": f"SYN_{i:06d}",
+            "title": f"Synthetic {category_title} {i}",
+            "closed": None,
+            "categories": [{"id": category_id, "title": category_title}],
+            "geometry": geometry
+        })
+    return events
+
+def write_combo_csv(df, path):
+    """Write a roster with the single-word 'combo' banner row above the header."""
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        file.write("combo\n")
+        df.to_csv(file, index=False)
+    return path
+
+def alumni_rows(df):
+    """Map combo-format rows onto the ``Alumni`` table columns."""
+    return pd.DataFrame({
+        "source_id": df["original_ID"],
+        "name": df["original_First Name"] + " " + df["original_Prim_Last"],
+        "location": df["original_City"] + ", " + df["original_State"] + ", " + df["original_Country"],
+        "latitude": df["lat"].fillna(0.0),
+        "longitude": df["lon"].fillna(0.0),
+        "country": df["country_code"].str.upper(),
+        "state": df["state"],
+        "city": df["city"],
+        "class_year": df["original_Pref Class Yr"],
+    })